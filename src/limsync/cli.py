@@ -5,6 +5,7 @@ import threading
 import time
 from pathlib import Path, PurePosixPath
 
+import click
 import typer
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
@@ -101,6 +102,7 @@ def _run_scan(
     state_db: Path | None,
     open_review: bool,
     apply_ssh_compression: bool,
+    apply_compression: str,
 ) -> None:
     try:
         source_endpoint = parse_endpoint(source)
@@ -266,7 +268,10 @@ def _run_scan(
             source_endpoint=source_endpoint,
             destination_endpoint=destination_endpoint,
             hide_identical=resolved_hide_identical,
-            apply_settings=ApplySettings(ssh_compression=apply_ssh_compression),
+            apply_settings=ApplySettings(
+                ssh_compression=apply_ssh_compression,
+                compression=apply_compression,
+            ),
         )
     else:
         console.print("Run `limsync review --state-db <db_path>` to inspect changes.")
@@ -296,6 +301,11 @@ def _default_command(
         "--apply-ssh-compression/--no-apply-ssh-compression",
         help="Enable SSH transport compression during apply operations in the review UI.",
     ),
+    apply_compression: str = typer.Option(
+        "off",
+        click_type=click.Choice(["off", "ssh", "zstd"]),
+        help="Apply compression: off, ssh (zlib transport) or zstd (compress uploads, needs zstandard locally and zstd remotely).",
+    ),
 ) -> None:
     """Run scan when no subcommand is provided."""
     if ctx.invoked_subcommand is not None:
@@ -306,7 +316,14 @@ def _default_command(
         )
         console.print(ctx.get_help())
         raise typer.Exit(2)
-    _run_scan(source, destination, state_db, open_review, apply_ssh_compression)
+    _run_scan(
+        source,
+        destination,
+        state_db,
+        open_review,
+        apply_ssh_compression,
+        apply_compression,
+    )
 
 
 @app.command()
@@ -332,6 +349,11 @@ def review(
         "--apply-ssh-compression/--no-apply-ssh-compression",
         help="Enable SSH transport compression during apply operations.",
     ),
+    apply_compression: str = typer.Option(
+        "off",
+        click_type=click.Choice(["off", "ssh", "zstd"]),
+        help="Apply compression: off, ssh (zlib transport) or zstd (compress uploads, needs zstandard locally and zstd remotely).",
+    ),
 ) -> None:
     """Open interactive tree review UI for the current saved scan state."""
     if state_db is not None:
@@ -377,7 +399,10 @@ def review(
         source_endpoint=source_endpoint,
         destination_endpoint=destination_endpoint,
         hide_identical=resolved_hide_identical,
-        apply_settings=ApplySettings(ssh_compression=apply_ssh_compression),
+        apply_settings=ApplySettings(
+            ssh_compression=apply_ssh_compression,
+            compression=apply_compression,
+        ),
     )
 
 
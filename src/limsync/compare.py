@@ -42,6 +42,15 @@ def _preferred_metadata_source(
     return None
 
 
+def _stat_snapshot(left: FileRecord, right: FileRecord) -> dict[str, int]:
+    return {
+        "left_mode": left.mode,
+        "right_mode": right.mode,
+        "left_mtime_ns": left.mtime_ns,
+        "right_mtime_ns": right.mtime_ns,
+    }
+
+
 def compare_records(
     left_records: dict[str, FileRecord],
     right_records: dict[str, FileRecord],
@@ -65,6 +74,8 @@ def compare_records(
                     metadata_source=None,
                     left_size=left.size,
                     right_size=None,
+                    left_mode=left.mode,
+                    left_mtime_ns=left.mtime_ns,
                 )
             )
             continue
@@ -80,6 +91,8 @@ def compare_records(
                     metadata_source=None,
                     left_size=None,
                     right_size=right.size,
+                    right_mode=right.mode,
+                    right_mtime_ns=right.mtime_ns,
                 )
             )
             continue
@@ -99,6 +112,7 @@ def compare_records(
                     metadata_source=None,
                     left_size=left.size,
                     right_size=right.size,
+                    **_stat_snapshot(left, right),
                 )
             )
             continue
@@ -126,6 +140,7 @@ def compare_records(
                     metadata_source=None,
                     left_size=left.size,
                     right_size=right.size,
+                    **_stat_snapshot(left, right),
                 )
             )
             continue
@@ -143,6 +158,7 @@ def compare_records(
                     metadata_source=metadata_source,
                     left_size=left.size,
                     right_size=right.size,
+                    **_stat_snapshot(left, right),
                 )
             )
             continue
@@ -171,6 +187,7 @@ def compare_records(
                 metadata_source=metadata_source,
                 left_size=left.size,
                 right_size=right.size,
+                **_stat_snapshot(left, right),
             )
         )
 
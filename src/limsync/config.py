@@ -2,9 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-CACHE_FOLDERS = {"__pycache__", ".pytest_cache", ".cache", ".ruff_cache"}
-EXCLUDED_FOLDERS = {"node_modules", ".tox", ".venv", ".limsync"} | CACHE_FOLDERS
-EXCLUDED_FILE_NAMES = {".DS_Store", "Icon\r"}
+CACHE_FOLDERS = frozenset({"__pycache__", ".pytest_cache", ".cache", ".ruff_cache"})
+EXCLUDED_FOLDERS = (
+    frozenset({"node_modules", ".tox", ".venv", ".limsync"}) | CACHE_FOLDERS
+)
+EXCLUDED_FILE_NAMES = frozenset({".DS_Store", "Icon\r"})
 
 DEFAULT_REMOTE_PORT = 22
 DEFAULT_STATE_SUBPATH = ".limsync/state.sqlite3"
@@ -1,17 +1,133 @@
 import fnmatch
 import os
+import re
 from pathlib import PurePosixPath
 
+MATCH_CACHE_SIZE = 20_000
+_EXTENSION_GLOB_RE = re.compile(r"\*\.[A-Za-z0-9_]+")
+
 
 def _to_posix(path: PurePosixPath) -> str:
     return "." if str(path) == "." else path.as_posix()
 
 
+def _compile_union(patterns: list[str]) -> re.Pattern[str] | None:
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{fnmatch.translate(p)})" for p in patterns))
+
+
+class _CompiledScope:
+    """Patterns of one `.dropboxignore`, translated to regexes once."""
+
+    def __init__(self, patterns: list[str]) -> None:
+        # (negate, anchored, has_slash, regex) in file order, for negations.
+        self.ordered = []
+        anchored: list[str] = []
+        bare: list[str] = []
+        slashed: list[str] = []
+        exts: set[str] = set()
+        literals: set[str] = set()
+        for raw in patterns:
+            negate = raw.startswith("!")
+            pattern = raw[1:] if negate else raw
+            if not pattern:
+                continue
+            if pattern.endswith("/"):
+                pattern = pattern.rstrip("/")
+            is_anchored = pattern.startswith("/")
+            if is_anchored:
+                pattern = pattern.lstrip("/")
+            has_slash = "/" in pattern
+            self.ordered.append(
+                (negate, is_anchored, has_slash, re.compile(fnmatch.translate(pattern)))
+            )
+            if is_anchored:
+                anchored.append(pattern)
+            elif has_slash:
+                slashed.append(pattern)
+            elif _EXTENSION_GLOB_RE.fullmatch(pattern):
+                exts.add(pattern[2:])
+            elif not any(ch in pattern for ch in "*?["):
+                literals.add(pattern)
+            else:
+                bare.append(pattern)
+        self.has_negation = any(negate for negate, _, _, _ in self.ordered)
+        # Without negations only "does any pattern match" matters, so each
+        # kind of pattern collapses into a single alternation.
+        # Bare `*.ext` globs and literal names are the common case; they only
+        # need a set lookup per path component instead of a regex.
+        self.anchored = _compile_union(anchored)
+        self.bare_exts = frozenset(exts)
+        self.bare_literals = frozenset(literals)
+        self.bare = _compile_union(bare)
+        self.has_bare = bool(exts or literals or bare)
+        self.slashed = _compile_union(slashed)
+        # Every file below a directory re-tests that directory's name against
+        # the bare patterns; remember those per-component answers.
+        self._bare_part_cache: dict[str, bool] = {}
+        # Files of one directory arrive back to back, so the verdict for the
+        # directory components is remembered for the last directory seen.
+        self._last_dir: str | None = None
+        self._last_dir_matched = False
+
+    def bare_dir_matches(self, dir_part: str) -> bool:
+        if dir_part != self._last_dir:
+            self._last_dir_matched = self.bare_part_matches(
+                [p for p in dir_part.split("/") if p]
+            )
+            self._last_dir = dir_part
+        return self._last_dir_matched
+
+    def bare_part_matches(self, parts: list[str]) -> bool:
+        exts = self.bare_exts
+        literals = self.bare_literals
+        cache = self._bare_part_cache
+        for part in parts:
+            if part in literals:
+                return True
+            if exts:
+                _, dot, ext = part.rpartition(".")
+                if dot and ext in exts:
+                    return True
+            if self.bare is None:
+                continue
+            matched = cache.get(part)
+            if matched is None:
+                matched = self.bare.match(part) is not None
+                if len(cache) >= MATCH_CACHE_SIZE:
+                    del cache[next(iter(cache))]
+                cache[part] = matched
+            if matched:
+                return True
+        return False
+
+
+def _regex_matches(
+    regex: re.Pattern[str],
+    target: str,
+    parts: list[str],
+    anchored: bool,
+    has_slash: bool,
+) -> bool:
+    if regex.match(target):
+        return True
+    if anchored:
+        return False
+    if not has_slash:
+        return any(regex.match(part) for part in parts)
+    return any(regex.match("/".join(parts[idx:])) for idx in range(1, len(parts)))
+
+
 class IgnoreRules:
     """Evaluates nested `.dropboxignore` files with gitignore-like patterns."""
 
     def __init__(self) -> None:
         self._patterns: dict[str, list[str]] = {}
+        self._compiled: dict[str, _CompiledScope] = {}
+        # Same scopes keyed by the prefix they strip off a target: "" for the
+        # root, "a/b/" for a/b/.dropboxignore.
+        self._scope_by_prefix: dict[str, _CompiledScope] = {}
 
     def add_spec(self, base_relpath: PurePosixPath, lines: list[str]) -> None:
         patterns = []
@@ -21,7 +137,11 @@ class IgnoreRules:
                 continue
             patterns.append(line)
         if patterns:
-            self._patterns[_to_posix(base_relpath)] = patterns
+            key = _to_posix(base_relpath)
+            self._patterns[key] = patterns
+            scope = _CompiledScope(patterns)
+            self._compiled[key] = scope
+            self._scope_by_prefix["" if key == "." else f"{key}/"] = scope
 
     def load_if_exists(self, root: str, dir_relpath: PurePosixPath) -> None:
         rel = "" if str(dir_relpath) == "." else dir_relpath.as_posix()
@@ -35,75 +155,107 @@ class IgnoreRules:
             return
         self.add_spec(dir_relpath, lines)
 
-    def _pattern_matches(self, local_target: str, pattern: str, anchored: bool) -> bool:
+    def _match_patterns(
+        self, local_target: str, is_dir: bool, scope: _CompiledScope
+    ) -> bool | None:
         target = local_target.rstrip("/")
-        if anchored:
-            return fnmatch.fnmatch(target, pattern)
-
-        if "/" not in pattern:
-            if fnmatch.fnmatch(target, pattern):
+        if not scope.has_negation:
+            if scope.anchored is not None and scope.anchored.match(target):
+                return True
+            # A whole-target match only adds something for wildcard patterns
+            # whose `*` spans a slash; extensions and literals are per-part.
+            if scope.has_bare:
+                if scope.bare is not None and scope.bare.match(target):
+                    return True
+                dir_part, _, name = target.rpartition("/")
+                if dir_part and scope.bare_dir_matches(dir_part):
+                    return True
+                if name and scope.bare_part_matches([name]):
+                    return True
+            if scope.slashed is not None and _regex_matches(
+                scope.slashed, target, [p for p in target.split("/") if p], False, True
+            ):
                 return True
-            parts = [p for p in target.split("/") if p]
-            return any(fnmatch.fnmatch(part, pattern) for part in parts)
+            return None
 
-        if fnmatch.fnmatch(target, pattern):
-            return True
         parts = [p for p in target.split("/") if p]
-        for idx in range(1, len(parts)):
-            suffix = "/".join(parts[idx:])
-            if fnmatch.fnmatch(suffix, pattern):
-                return True
-        return False
 
-    def _match_patterns(
-        self, local_target: str, is_dir: bool, patterns: list[str]
-    ) -> bool | None:
         result: bool | None = None
-        for raw in patterns:
-            negate = raw.startswith("!")
-            pattern = raw[1:] if negate else raw
-            if not pattern:
-                continue
-
-            dir_only = pattern.endswith("/")
-            if dir_only:
-                pattern = pattern.rstrip("/")
-
-            anchored = pattern.startswith("/")
-            if anchored:
-                pattern = pattern.lstrip("/")
-
-            if self._pattern_matches(local_target, pattern, anchored):
+        for negate, anchored, has_slash, regex in scope.ordered:
+            if _regex_matches(regex, target, parts, anchored, has_slash):
                 result = not negate
         return result
 
+    @property
+    def has_rules(self) -> bool:
+        return bool(self._compiled)
+
     def is_ignored(self, relpath: PurePosixPath, is_dir: bool) -> bool:
-        target = relpath.as_posix()
-        if is_dir and not target.endswith("/"):
-            target = f"{target}/"
+        if not self._compiled:
+            return False
+        return self.is_ignored_str(relpath.as_posix(), is_dir)
 
-        ancestors = [PurePosixPath(".")]
-        parts = relpath.parts
-        for idx in range(len(parts) - 1):
-            ancestors.append(PurePosixPath(*parts[: idx + 1]))
+    def filter_children(
+        self, dir_relpath: str, names: list[str], is_dir: bool
+    ) -> list[bool]:
+        """`is_ignored_str` for every child name of one directory.
 
-        ignored = False
-        for ancestor in ancestors:
-            anc_key = _to_posix(ancestor)
-            patterns = self._patterns.get(anc_key)
-            if not patterns:
-                continue
+        The scopes that apply are the same for all children, so they are
+        looked up once per directory instead of once per child.
+        """
+        if not self._compiled or not names:
+            return [False] * len(names)
+        child_prefix = "" if dir_relpath == "." else f"{dir_relpath}/"
+        scopes = self._scope_by_prefix
+        applicable: list[tuple[int, _CompiledScope]] = []
+        if "" in scopes:
+            applicable.append((0, scopes[""]))
+        idx = child_prefix.find("/")
+        while idx != -1:
+            scope = scopes.get(child_prefix[: idx + 1])
+            if scope is not None:
+                applicable.append((idx + 1, scope))
+            idx = child_prefix.find("/", idx + 1)
 
-            if anc_key == ".":
-                local_target = target
-            else:
-                prefix = f"{anc_key}/"
-                if not target.startswith(prefix):
-                    continue
-                local_target = target[len(prefix) :]
+        suffix = "/" if is_dir else ""
+        verdicts: list[bool] = []
+        for name in names:
+            target = f"{child_prefix}{name}{suffix}"
+            ignored = False
+            for cut, scope in applicable:
+                matched = self._match_patterns(target[cut:], is_dir, scope)
+                if matched is not None:
+                    ignored = matched
+            verdicts.append(ignored)
+        return verdicts
+
+    def is_ignored_str(self, relpath: str, is_dir: bool) -> bool:
+        """Like `is_ignored`, for a posix relpath string ("." for the root)."""
+        if not self._compiled:
+            return False
+        target = f"{relpath}/" if is_dir and not relpath.endswith("/") else relpath
 
-            matched = self._match_patterns(local_target, is_dir, patterns)
+        if len(self._compiled) == 1:
+            root_scope = self._compiled.get(".")
+            if root_scope is not None:
+                return bool(self._match_patterns(target, is_dir, root_scope))
+
+        scopes = self._scope_by_prefix
+        ignored = False
+        root_scope = scopes.get("")
+        if root_scope is not None:
+            matched = self._match_patterns(target, is_dir, root_scope)
             if matched is not None:
                 ignored = matched
 
+        # Every "/" in the relpath closes a proper ancestor directory.
+        idx = relpath.find("/")
+        while idx != -1:
+            scope = scopes.get(relpath[: idx + 1])
+            if scope is not None:
+                matched = self._match_patterns(target[idx + 1 :], is_dir, scope)
+                if matched is not None:
+                    ignored = matched
+            idx = relpath.find("/", idx + 1)
+
         return ignored
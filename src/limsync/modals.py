@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import asyncio
 import threading
-import time
 from collections.abc import Callable
 from pathlib import PurePosixPath
 
@@ -194,24 +193,8 @@ class ApplyRunModal(ModalScreen[ExecuteResult | None]):
         self.run_worker(self._run_apply(), exclusive=True)
 
     async def _run_apply(self) -> None:
-        last_emit = 0.0
-        pending_ops = 0
-
         def progress_cb(done: int, total: int, op, ok: bool, error: str | None) -> None:
-            nonlocal last_emit, pending_ops
-            pending_ops += 1
-            now = time.monotonic()
-            emit = (
-                done == total
-                or not ok
-                or pending_ops >= self.apply_settings.progress_emit_every_ops
-                or (now - last_emit) * 1000.0
-                >= self.apply_settings.progress_emit_every_ms
-            )
-            if not emit:
-                return
-            pending_ops = 0
-            last_emit = now
+            # execute_plan already throttles callbacks per ApplySettings.
             self.app.call_from_thread(self._on_progress, done, total, op, ok, error)
 
         try:
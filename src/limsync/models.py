@@ -47,3 +47,7 @@ class DiffRecord:
     metadata_source: str | None = None
     left_size: int | None = None
     right_size: int | None = None
+    left_mode: int | None = None
+    right_mode: int | None = None
+    left_mtime_ns: int | None = None
+    right_mtime_ns: int | None = None
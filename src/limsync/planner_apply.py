@@ -10,19 +10,29 @@ import tempfile
 import threading
 import time
 import uuid
-from collections.abc import Callable
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import ExitStack
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime
+from itertools import chain
 from pathlib import Path
+from typing import Literal, NamedTuple
 
 import paramiko
+from paramiko.sftp import CMD_SETSTAT
+
+try:
+    import zstandard
+except ImportError:  # optional, only needed for compression="zstd"
+    zstandard = None
 
 from .config import DEFAULT_REMOTE_PORT
 from .deletion_intent import DELETED_ON_LEFT, DELETED_ON_RIGHT
 from .endpoints import EndpointSpec, parse_endpoint, parse_legacy_remote_address
 from .models import ContentState, DiffRecord, MetadataState
-from .ssh_pool import pooled_ssh_client
+from .ssh_pool import open_sftp, pooled_ssh_client
 from .symlink_utils import map_symlink_target_for_destination
 
 ACTION_LEFT_WINS = "left_wins"
@@ -30,17 +40,83 @@ ACTION_RIGHT_WINS = "right_wins"
 ACTION_IGNORE = "ignore"
 ACTION_SUGGESTED = "suggested"
 
+OPERATION_KINDS = (
+    "copy_right",
+    "copy_left",
+    "delete_right",
+    "delete_left",
+    "metadata_update_left",
+    "metadata_update_right",
+)
+
 type StatLike = os.stat_result | paramiko.SFTPAttributes
+type CompressionMode = Literal["off", "ssh", "zstd"]
+
+SFTP_RETRY_ATTEMPTS = 3
+SFTP_RETRY_BACKOFF_SECONDS = 0.1
+TRANSIENT_SFTP_ERRORS = (
+    paramiko.SSHException,
+    EOFError,
+    TimeoutError,
+    ConnectionError,
+)
+
+# Keep each batched `mkdir -p` command well below typical ARG_MAX limits.
+REMOTE_MKDIR_BATCH_CHARS = 64 * 1024
+
+# OpenSSH's default MaxSessions. Each apply worker holds one SFTP channel on
+# top of the shared one the run keeps open.
+SSHD_MAX_SESSIONS = 10
+MAX_APPLY_WORKERS = SSHD_MAX_SESSIONS - 1
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
+ZSTD_MIN_UPLOAD_BYTES = 16 * 1024
+COMPRESSED_SUFFIXES = frozenset(
+    {
+        ".7z",
+        ".avi",
+        ".bz2",
+        ".docx",
+        ".gif",
+        ".gz",
+        ".heic",
+        ".jar",
+        ".jpeg",
+        ".jpg",
+        ".m4a",
+        ".mkv",
+        ".mov",
+        ".mp3",
+        ".mp4",
+        ".odt",
+        ".pdf",
+        ".png",
+        ".pptx",
+        ".rar",
+        ".tgz",
+        ".webm",
+        ".webp",
+        ".whl",
+        ".xlsx",
+        ".xz",
+        ".zip",
+        ".zst",
+    }
+)
 
 
-@dataclass(frozen=True)
-class PlanOperation:
+class PlanOperation(NamedTuple):
     kind: str
     relpath: str
     metadata_fields: tuple[str, ...] = ()
+    # Scan-time mode/mtime of the metadata source side, so apply can skip
+    # re-reading it. None means unknown and falls back to a live stat.
+    source_mode: int | None = None
+    source_mtime_ns: int | None = None
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PlanSummary:
     delete_left: int = 0
     delete_right: int = 0
@@ -61,7 +137,7 @@ class PlanSummary:
         )
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ExecuteResult:
     completed_paths: set[str]
     errors: list[str]
@@ -75,12 +151,18 @@ class ExecuteResult:
     cancelled: bool = False
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ApplySettings:
     ssh_compression: bool = False
     sftp_put_confirm: bool = False
     progress_emit_every_ops: int = 100
     progress_emit_every_ms: int = 200
+    compression: CompressionMode = "off"
+    concurrency: int = 4
+
+    @property
+    def transport_compression(self) -> bool:
+        return self.ssh_compression or self.compression == "ssh"
 
 
 @dataclass
@@ -92,6 +174,11 @@ class _RemoteRuntime:
     user: str
     host: str
     port: int
+    zstd_available: bool = True
+    # Uncompressed transport for already-compressed payloads, only opened
+    # when the main transport compresses.
+    plain_client: paramiko.SSHClient | None = None
+    plain_sftp: paramiko.SFTPClient | None = None
 
 
 @dataclass
@@ -100,57 +187,67 @@ class _SideRuntime:
     local_root: Path | None
     local_home: Path
     remote: _RemoteRuntime | None
+    # Roots for symlink target comparison, set once by _side_runtime; the
+    # per-worker and per-transport copies made with replace() keep them.
+    root_path: Path
+    home_path: Path
+    paths: dict[str, Path | str] = field(default_factory=dict)
+    # Local directories already created (or found) during this run.
+    known_local_dirs: set[Path] = field(default_factory=set)
 
     @property
     def is_local(self) -> bool:
         return self.endpoint.is_local
 
-    @property
-    def root_text(self) -> str:
-        if self.is_local:
-            assert self.local_root is not None
-            return str(self.local_root)
-        assert self.remote is not None
-        return self.remote.root
-
-    @property
-    def home_text(self) -> str:
-        if self.is_local:
-            return str(self.local_home)
-        assert self.remote is not None
-        return self.remote.home
-
 
 def parse_remote_address(remote_address: str) -> tuple[str, str, str]:
     parsed = parse_legacy_remote_address(remote_address)
     return parsed.user, parsed.host, parsed.root
 
 
-def _infer_metadata_source_from_details(diff: DiffRecord) -> str | None:
-    mode_re = re.compile(r"mode:\s+left=0x([0-7]{3})\s+right=0x([0-7]{3})")
-    mtime_re = re.compile(r"mtime:\s+left=(.*?)\s+right=(.*?)$")
+_MODE_DETAIL_RE = re.compile(r"mode:\s+left=0x([0-7]{3})\s+right=0x([0-7]{3})")
+_MTIME_DETAIL_RE = re.compile(r"mtime:\s+left=(.*?)\s+right=(.*?)$")
 
+
+def _parse_detail_mtime(text: str) -> datetime:
+    # fromisoformat is a C fast path; strptime re-interprets its format on
+    # every call and is only kept for strings fromisoformat rejects.
+    try:
+        return datetime.fromisoformat(text.removesuffix(" UTC"))
+    except ValueError:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S.%f UTC")
+
+
+def _infer_metadata_source_from_details(diff: DiffRecord) -> str | None:
+    if diff.left_mode is not None and diff.right_mode is not None:
+        if diff.left_mode != diff.right_mode:
+            return "left" if diff.left_mode < diff.right_mode else "right"
+        if diff.left_mtime_ns is not None and diff.right_mtime_ns is not None:
+            if diff.left_mtime_ns != diff.right_mtime_ns:
+                return "left" if diff.left_mtime_ns < diff.right_mtime_ns else "right"
+            return None
+
+    # Rows saved before the stat columns existed only have the text details.
+    # A mode difference wins over an mtime one, wherever it appears.
+    mtime_source: str | None = None
     for detail in diff.metadata_details:
-        mode_match = mode_re.match(detail)
+        mode_match = _MODE_DETAIL_RE.match(detail)
         if mode_match:
             left_mode = int(mode_match.group(1), 8)
             right_mode = int(mode_match.group(2), 8)
             if left_mode != right_mode:
                 return "left" if left_mode < right_mode else "right"
-
-    for detail in diff.metadata_details:
-        mtime_match = mtime_re.match(detail)
+            continue
+        if mtime_source is not None:
+            continue
+        mtime_match = _MTIME_DETAIL_RE.match(detail)
         if mtime_match:
-            left_mtime = datetime.strptime(
-                mtime_match.group(1), "%Y-%m-%d %H:%M:%S.%f UTC"
-            )
-            right_mtime = datetime.strptime(
-                mtime_match.group(2), "%Y-%m-%d %H:%M:%S.%f UTC"
-            )
+            left_mtime = _parse_detail_mtime(mtime_match.group(1))
+            right_mtime = _parse_detail_mtime(mtime_match.group(2))
             if left_mtime != right_mtime:
-                return "left" if left_mtime < right_mtime else "right"
+                mtime_source = "left" if left_mtime < right_mtime else "right"
 
-    return None
+    return mtime_source
 
 
 def _suggested_metadata_op(relpath: str, diff: DiffRecord) -> list[PlanOperation]:
@@ -167,89 +264,100 @@ def _metadata_ops(relpath: str, action: str, diff: DiffRecord) -> list[PlanOpera
         return []
     fields = tuple(field for field in diff.metadata_diff if field in {"mode", "mtime"})
     if action == ACTION_LEFT_WINS:
-        return [PlanOperation("metadata_update_right", relpath, fields)]
-    if action == ACTION_RIGHT_WINS:
-        return [PlanOperation("metadata_update_left", relpath, fields)]
-    if action == ACTION_SUGGESTED:
-        return [
-            PlanOperation(op.kind, op.relpath, fields)
-            for op in _suggested_metadata_op(relpath, diff)
-        ]
-    return []
+        kinds = ["metadata_update_right"]
+    elif action == ACTION_RIGHT_WINS:
+        kinds = ["metadata_update_left"]
+    elif action == ACTION_SUGGESTED:
+        kinds = [op.kind for op in _suggested_metadata_op(relpath, diff)]
+    else:
+        return []
+    return [_metadata_op_with_snapshot(kind, relpath, fields, diff) for kind in kinds]
 
 
-def build_plan_operations(
-    diffs: list[DiffRecord],
+def _metadata_op_with_snapshot(
+    kind: str, relpath: str, fields: tuple[str, ...], diff: DiffRecord
+) -> PlanOperation:
+    if kind == "metadata_update_right":
+        return PlanOperation(kind, relpath, fields, diff.left_mode, diff.left_mtime_ns)
+    return PlanOperation(kind, relpath, fields, diff.right_mode, diff.right_mtime_ns)
+
+
+def iter_plan_operations(
+    diffs: Iterable[DiffRecord],
     action_overrides: dict[str, str],
-) -> list[PlanOperation]:
-    ops: list[PlanOperation] = []
+) -> Iterator[PlanOperation]:
+    seen: set[tuple[str, str]] = set()
+
+    def fresh(kind: str, relpath: str) -> bool:
+        key = (kind, relpath)
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
     for diff in diffs:
-        action = action_overrides.get(diff.relpath, ACTION_IGNORE)
+        relpath = diff.relpath
+        action = action_overrides.get(relpath, ACTION_IGNORE)
         if action == ACTION_IGNORE:
             continue
 
-        if diff.content_state == ContentState.ONLY_LEFT:
-            if action in {ACTION_LEFT_WINS, ACTION_SUGGESTED}:
-                if (
-                    action == ACTION_SUGGESTED
-                    and diff.metadata_source == DELETED_ON_RIGHT
-                ):
-                    ops.append(PlanOperation("delete_left", diff.relpath))
-                else:
-                    ops.append(PlanOperation("copy_right", diff.relpath))
+        # Content decides a single copy/delete; metadata ops only apply when
+        # no content op does and the file exists on both sides.
+        content_state = diff.content_state
+        kind: str | None = None
+        if content_state == ContentState.ONLY_LEFT:
+            if action == ACTION_RIGHT_WINS or (
+                action == ACTION_SUGGESTED and diff.metadata_source == DELETED_ON_RIGHT
+            ):
+                kind = "delete_left"
+            elif action in {ACTION_LEFT_WINS, ACTION_SUGGESTED}:
+                kind = "copy_right"
+        elif content_state == ContentState.ONLY_RIGHT:
+            if action == ACTION_LEFT_WINS or (
+                action == ACTION_SUGGESTED and diff.metadata_source == DELETED_ON_LEFT
+            ):
+                kind = "delete_right"
+            elif action in {ACTION_RIGHT_WINS, ACTION_SUGGESTED}:
+                kind = "copy_left"
+        elif content_state in {ContentState.DIFFERENT, ContentState.UNKNOWN}:
+            if action == ACTION_LEFT_WINS:
+                kind = "copy_right"
             elif action == ACTION_RIGHT_WINS:
-                ops.append(PlanOperation("delete_left", diff.relpath))
-            continue
+                kind = "copy_left"
+            elif content_state == ContentState.DIFFERENT and action == ACTION_SUGGESTED:
+                continue
 
-        if diff.content_state == ContentState.ONLY_RIGHT:
-            if action in {ACTION_RIGHT_WINS, ACTION_SUGGESTED}:
-                if (
-                    action == ACTION_SUGGESTED
-                    and diff.metadata_source == DELETED_ON_LEFT
-                ):
-                    ops.append(PlanOperation("delete_right", diff.relpath))
-                else:
-                    ops.append(PlanOperation("copy_left", diff.relpath))
-            elif action == ACTION_LEFT_WINS:
-                ops.append(PlanOperation("delete_right", diff.relpath))
+        if kind is not None:
+            if fresh(kind, relpath):
+                yield PlanOperation(kind, relpath)
+            continue
+        if content_state in {ContentState.ONLY_LEFT, ContentState.ONLY_RIGHT}:
             continue
 
-        if diff.content_state in {ContentState.DIFFERENT, ContentState.UNKNOWN}:
-            if action == ACTION_LEFT_WINS:
-                ops.append(PlanOperation("copy_right", diff.relpath))
-                continue
-            elif action == ACTION_RIGHT_WINS:
-                ops.append(PlanOperation("copy_left", diff.relpath))
-                continue
-            if (
-                diff.content_state == ContentState.DIFFERENT
-                and action == ACTION_SUGGESTED
-            ):
-                continue
+        for op in _metadata_ops(relpath, action, diff):
+            if fresh(op.kind, op.relpath):
+                yield op
 
-        ops.extend(_metadata_ops(diff.relpath, action, diff))
 
-    dedup = {(op.kind, op.relpath): op for op in ops}
-    return list(dedup.values())
+def build_plan_operations(
+    diffs: Iterable[DiffRecord],
+    action_overrides: dict[str, str],
+) -> list[PlanOperation]:
+    return list(iter_plan_operations(diffs, action_overrides))
 
 
 def summarize_operations(ops: list[PlanOperation]) -> PlanSummary:
-    counts = {
-        "delete_left": 0,
-        "delete_right": 0,
-        "copy_left": 0,
-        "copy_right": 0,
-        "metadata_update_left": 0,
-        "metadata_update_right": 0,
-    }
-    for op in ops:
-        if op.kind in counts:
-            counts[op.kind] += 1
-    return PlanSummary(**counts)
+    counts = Counter(op.kind for op in ops)
+    return PlanSummary(**{kind: counts[kind] for kind in OPERATION_KINDS})
 
 
-def _ensure_local_parent(path: Path) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
+def _ensure_local_parent(path: Path, known_dirs: set[Path] | None = None) -> None:
+    parent = path.parent
+    if known_dirs is not None and parent in known_dirs:
+        return
+    parent.mkdir(parents=True, exist_ok=True)
+    if known_dirs is not None:
+        known_dirs.add(parent)
 
 
 def _ensure_remote_parent(sftp: paramiko.SFTPClient, remote_path: str) -> None:
@@ -274,11 +382,61 @@ def _ensure_remote_parent_cached(
         try:
             sftp.stat(segment)
         except OSError:
-            sftp.mkdir(segment)
+            try:
+                sftp.mkdir(segment)
+            except OSError:
+                # Another apply worker may have created it in the meantime.
+                sftp.stat(segment)
         if known_dirs is not None:
             known_dirs.add(segment)
 
 
+def _retry_transient[T](call: Callable[..., T], *args: object, **kwargs: object) -> T:
+    # Retry flaky-link failures on the already-open SFTP channel instead of
+    # failing the operation; real filesystem errors still fail immediately.
+    for attempt in range(SFTP_RETRY_ATTEMPTS - 1):
+        try:
+            return call(*args, **kwargs)
+        except TRANSIENT_SFTP_ERRORS:
+            time.sleep(SFTP_RETRY_BACKOFF_SECONDS * 2**attempt)
+    return call(*args, **kwargs)
+
+
+def _prepare_remote_parents(
+    remote: _RemoteRuntime,
+    remote_paths: Iterable[str],
+    known_dirs: set[str],
+) -> None:
+    parents = sorted(
+        {parent for path in remote_paths if (parent := os.path.dirname(path))}
+        - known_dirs
+    )
+    batch: list[str] = []
+    batch_chars = 0
+    for index, parent in enumerate(parents):
+        quoted = shlex.quote(parent)
+        batch.append(quoted)
+        batch_chars += len(quoted) + 1
+        if batch_chars < REMOTE_MKDIR_BATCH_CHARS and index < len(parents) - 1:
+            continue
+        try:
+            _stdin, stdout, _stderr = remote.client.exec_command(
+                "mkdir -p -- " + " ".join(batch)
+            )
+            if stdout.channel.recv_exit_status() != 0:
+                return
+        except Exception:  # noqa: BLE001
+            # Best effort: copies still create their parents one by one.
+            return
+        batch.clear()
+        batch_chars = 0
+
+    for parent in parents:
+        while parent and parent != "/" and parent not in known_dirs:
+            known_dirs.add(parent)
+            parent = os.path.dirname(parent)
+
+
 def _join_remote(root: str, relpath: str) -> str:
     return f"{root.rstrip('/')}/{relpath}"
 
@@ -291,19 +449,34 @@ def _remote_atime_ns(st: StatLike) -> int:
     return int(float(getattr(st, "st_atime", 0)) * 1_000_000_000)
 
 
+def _sftp_setstat(
+    sftp: paramiko.SFTPClient,
+    remote_path: str,
+    mode: int,
+    atime: int,
+    mtime: int,
+) -> None:
+    # chmod() and utime() each send their own SETSTAT; one request carrying
+    # both attributes halves the round trips.
+    attrs = paramiko.SFTPAttributes()
+    attrs.st_mode = mode
+    attrs.st_atime = atime
+    attrs.st_mtime = mtime
+    sftp._request(CMD_SETSTAT, sftp._adjust_cwd(remote_path), attrs)
+
+
 def _apply_remote_metadata_from_local(
     sftp: paramiko.SFTPClient,
     remote_path: str,
     local_stat: os.stat_result,
 ) -> None:
-    mode = stat.S_IMODE(local_stat.st_mode)
-    sftp.chmod(remote_path, mode)
-    sftp.utime(
+    _retry_transient(
+        _sftp_setstat,
+        sftp,
         remote_path,
-        (
-            int(local_stat.st_atime_ns / 1_000_000_000),
-            int(local_stat.st_mtime_ns / 1_000_000_000),
-        ),
+        stat.S_IMODE(local_stat.st_mode),
+        int(local_stat.st_atime_ns / 1_000_000_000),
+        int(local_stat.st_mtime_ns / 1_000_000_000),
     )
 
 
@@ -312,14 +485,13 @@ def _apply_remote_metadata_from_remote(
     remote_path: str,
     remote_stat: StatLike,
 ) -> None:
-    mode = stat.S_IMODE(getattr(remote_stat, "st_mode", 0))
-    sftp.chmod(remote_path, mode)
-    sftp.utime(
+    _retry_transient(
+        _sftp_setstat,
+        sftp,
         remote_path,
-        (
-            int(float(getattr(remote_stat, "st_atime", 0))),
-            int(float(getattr(remote_stat, "st_mtime", 0))),
-        ),
+        stat.S_IMODE(getattr(remote_stat, "st_mode", 0)),
+        int(float(getattr(remote_stat, "st_atime", 0))),
+        int(float(getattr(remote_stat, "st_mtime", 0))),
     )
 
 
@@ -344,39 +516,96 @@ def _apply_local_metadata_from_local(
     os.utime(local_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
 
 
-def _remote_expand_root(client: paramiko.SSHClient, root: str) -> str:
-    quoted = root.replace("'", "'\\''")
-    command = f"python3 -c \"import os; print(os.path.expanduser('{quoted}'))\""
+_TILDE_USER_RE = re.compile(r"~([A-Za-z0-9._-]+)(/.*)?")
+
+
+def _remote_expand_paths(
+    client: paramiko.SSHClient, root: str
+) -> tuple[str, str | None]:
+    # One plain shell exec reports $HOME (and expands ~user when needed)
+    # instead of starting a remote python3 once for the root and once more
+    # for the home directory.
+    command = "printf '%s\\n' \"$HOME\""
+    user_match = _TILDE_USER_RE.fullmatch(root)
+    if user_match:
+        rest = (user_match.group(2) or "/").lstrip("/")
+        command += f" ~{user_match.group(1)}/{shlex.quote(rest) if rest else ''}"
     _stdin, stdout, stderr = client.exec_command(command)
-    out = stdout.read().decode("utf-8", errors="replace").strip()
+    lines = stdout.read().decode("utf-8", errors="replace").splitlines()
     err = stderr.read().decode("utf-8", errors="replace").strip()
-    if out:
-        return out
+    home = lines[0].strip() if lines and lines[0].strip() else None
+
+    if user_match:
+        expanded = lines[1].strip() if len(lines) > 1 else ""
+        if expanded and not expanded.startswith("~"):
+            return expanded.rstrip("/") or "/", home
+    elif root == "~" or root.startswith("~/"):
+        if home:
+            return home + root[1:], home
+    else:
+        return root, home
     raise RuntimeError(f"Failed to resolve remote root {root!r}: {err}")
 
 
-def _remote_expand_home(client: paramiko.SSHClient) -> str:
-    command = "python3 -c \"import os; print(os.path.expanduser('~'))\""
-    _stdin, stdout, stderr = client.exec_command(command)
-    out = stdout.read().decode("utf-8", errors="replace").strip()
-    err = stderr.read().decode("utf-8", errors="replace").strip()
-    if out:
-        return out
-    raise RuntimeError(f"Failed to resolve remote home: {err}")
+def _remote_expand_root(client: paramiko.SSHClient, root: str) -> str:
+    return _remote_expand_paths(client, root)[0]
 
 
 def _unlink_local_if_exists(path: Path) -> None:
-    if path.is_symlink() or path.exists():
-        path.unlink()
+    path.unlink(missing_ok=True)
 
 
 def _remove_remote_if_exists(sftp: paramiko.SFTPClient, path: str) -> None:
     try:
-        sftp.remove(path)
+        _retry_transient(sftp.remove, path)
     except OSError:
         return
 
 
+def _put_remote_file(
+    sftp: paramiko.SFTPClient,
+    local_path: str,
+    remote_path: str,
+    *,
+    confirm: bool,
+) -> None:
+    # put() reads the source 32 KiB at a time into fresh bytes objects; one
+    # reusable 1 MiB buffer cuts read syscalls and allocations on big files.
+    # SFTP frames every write, so os.sendfile cannot feed the channel.
+    buffer = bytearray(UPLOAD_CHUNK_BYTES)
+    view = memoryview(buffer)
+    size = 0
+    with (
+        open(local_path, "rb", buffering=0) as source,
+        sftp.open(remote_path, "wb") as target,
+    ):
+        target.set_pipelined(True)
+        while count := source.readinto(buffer):
+            target.write(view[:count])
+            size += count
+    if confirm:
+        remote_size = sftp.stat(remote_path).st_size
+        if remote_size != size:
+            raise OSError(f"size mismatch in put! {remote_size} != {size}")
+
+
+def _get_remote_file(
+    sftp: paramiko.SFTPClient, remote_path: str, local_path: str, file_size: int
+) -> None:
+    # get() prefetches too, but then drains the prefetched data 32 KiB at a
+    # time in Python; copyfileobj with 1 MiB reads does far fewer rounds.
+    # file_size comes from the caller's lstat, saving a stat round trip.
+    with (
+        sftp.open(remote_path, "rb") as source,
+        open(local_path, "wb") as target,
+    ):
+        source.prefetch(file_size)
+        shutil.copyfileobj(source, target, DOWNLOAD_CHUNK_BYTES)
+    size = os.stat(local_path).st_size
+    if size != file_size:
+        raise OSError(f"size mismatch in get! {size} != {file_size}")
+
+
 def _put_remote_with_replace_fallback(
     sftp: paramiko.SFTPClient,
     local_path: str,
@@ -385,7 +614,9 @@ def _put_remote_with_replace_fallback(
     confirm: bool,
 ) -> None:
     try:
-        sftp.put(local_path, remote_path, confirm=confirm)
+        _retry_transient(
+            _put_remote_file, sftp, local_path, remote_path, confirm=confirm
+        )
         return
     except Exception as direct_error:  # noqa: BLE001
         parent = os.path.dirname(remote_path)
@@ -396,7 +627,9 @@ def _put_remote_with_replace_fallback(
         )
 
         try:
-            sftp.put(local_path, temporary_path, confirm=confirm)
+            _retry_transient(
+                _put_remote_file, sftp, local_path, temporary_path, confirm=confirm
+            )
             sftp.posix_rename(temporary_path, remote_path)
         except Exception as replacement_error:  # noqa: BLE001
             _remove_remote_if_exists(sftp, temporary_path)
@@ -406,6 +639,49 @@ def _put_remote_with_replace_fallback(
             ) from replacement_error
 
 
+def _wants_zstd_upload(local_path: Path, size: int) -> bool:
+    return (
+        zstandard is not None
+        and size >= ZSTD_MIN_UPLOAD_BYTES
+        and local_path.suffix.lower() not in COMPRESSED_SUFFIXES
+    )
+
+
+def _put_remote_zstd(
+    remote: _RemoteRuntime,
+    local_path: Path,
+    remote_path: str,
+) -> bool:
+    if zstandard is None or not remote.zstd_available:
+        return False
+    parent = os.path.dirname(remote_path)
+    compressed_name = f".{os.path.basename(remote_path)}.limsync-{uuid.uuid4().hex}.zst"
+    compressed_path = (
+        f"{parent.rstrip('/')}/{compressed_name}" if parent else compressed_name
+    )
+    try:
+        compressor = zstandard.ZstdCompressor(level=1)
+        with (
+            local_path.open("rb") as source,
+            remote.sftp.open(compressed_path, "wb") as handle,
+        ):
+            handle.set_pipelined(True)
+            compressor.copy_stream(source, handle)
+        command = (
+            f"zstd -q -d -f {shlex.quote(compressed_path)} "
+            f"-o {shlex.quote(remote_path)}"
+        )
+        _stdin, stdout, _stderr = remote.client.exec_command(command)
+        ok = stdout.channel.recv_exit_status() == 0
+    except Exception:  # noqa: BLE001
+        ok = False
+    _remove_remote_if_exists(remote.sftp, compressed_path)
+    if not ok:
+        # Most likely the remote has no zstd binary: stop trying for this run.
+        remote.zstd_available = False
+    return ok
+
+
 def _coerce_endpoint(value: EndpointSpec | str | Path) -> EndpointSpec:
     if isinstance(value, EndpointSpec):
         return value
@@ -419,26 +695,35 @@ def _remote_runtime(
     endpoint: EndpointSpec,
     *,
     compress: bool,
+    plain_transport: bool = False,
 ) -> _RemoteRuntime:
     assert endpoint.is_remote
-    client = stack.enter_context(
-        pooled_ssh_client(
-            host=str(endpoint.host),
-            user=endpoint.user,
-            port=endpoint.port,
-            compress=compress,
-            timeout=10,
-            client_factory=paramiko.SSHClient,
-            auto_add_policy_factory=paramiko.AutoAddPolicy,
+
+    def connect(compress: bool) -> paramiko.SSHClient:
+        return stack.enter_context(
+            pooled_ssh_client(
+                host=str(endpoint.host),
+                user=endpoint.user,
+                port=endpoint.port,
+                compress=compress,
+                timeout=10,
+                client_factory=paramiko.SSHClient,
+                auto_add_policy_factory=paramiko.AutoAddPolicy,
+            )
         )
-    )
-    root = _remote_expand_root(client, endpoint.root)
-    try:
-        home = _remote_expand_home(client)
-    except Exception:
+
+    client = connect(compress)
+    root, home = _remote_expand_paths(client, endpoint.root)
+    if home is None:
         home = f"/home/{endpoint.user}"
-    sftp = client.open_sftp()
+    sftp = open_sftp(client)
     stack.callback(sftp.close)
+    plain_client = None
+    plain_sftp = None
+    if compress and plain_transport:
+        plain_client = connect(False)
+        plain_sftp = open_sftp(plain_client)
+        stack.callback(plain_sftp.close)
     return _RemoteRuntime(
         client=client,
         sftp=sftp,
@@ -447,6 +732,8 @@ def _remote_runtime(
         user=endpoint.user or "",
         host=str(endpoint.host),
         port=endpoint.port or DEFAULT_REMOTE_PORT,
+        plain_client=plain_client,
+        plain_sftp=plain_sftp,
     )
 
 
@@ -456,24 +743,35 @@ def _side_runtime(
     *,
     compress: bool,
     local_home: Path,
+    plain_transport: bool = False,
 ) -> _SideRuntime:
     if endpoint.is_local:
+        local_root = Path(endpoint.root).expanduser().resolve()
         return _SideRuntime(
             endpoint=endpoint,
-            local_root=Path(endpoint.root).expanduser().resolve(),
+            local_root=local_root,
             local_home=local_home,
             remote=None,
+            root_path=local_root,
+            home_path=local_home,
         )
-    remote = _remote_runtime(stack, endpoint, compress=compress)
+    remote = _remote_runtime(
+        stack, endpoint, compress=compress, plain_transport=plain_transport
+    )
     return _SideRuntime(
         endpoint=endpoint,
         local_root=None,
         local_home=local_home,
         remote=remote,
+        root_path=Path(remote.root),
+        home_path=Path(remote.home),
     )
 
 
 def _side_path(side: _SideRuntime, relpath: str) -> Path | str:
+    path = side.paths.get(relpath)
+    if path is not None:
+        return path
     if side.is_local:
         assert side.local_root is not None
         return side.local_root / relpath
@@ -481,26 +779,26 @@ def _side_path(side: _SideRuntime, relpath: str) -> Path | str:
     return _join_remote(side.remote.root, relpath)
 
 
-def _side_lstat(side: _SideRuntime, relpath: str) -> StatLike:
+def _prime_side_paths(side: _SideRuntime, relpaths: Iterable[str]) -> None:
     if side.is_local:
-        path = _side_path(side, relpath)
-        assert isinstance(path, Path)
-        return path.lstat()
+        assert side.local_root is not None
+        local_root = side.local_root
+        side.paths = {relpath: local_root / relpath for relpath in relpaths}
+        return
     assert side.remote is not None
-    path = _side_path(side, relpath)
-    assert isinstance(path, str)
-    return side.remote.sftp.lstat(path)
+    root_prefix = side.remote.root.rstrip("/")
+    side.paths = {relpath: f"{root_prefix}/{relpath}" for relpath in relpaths}
 
 
-def _side_stat(side: _SideRuntime, relpath: str) -> StatLike:
+def _side_lstat(side: _SideRuntime, relpath: str) -> StatLike:
     if side.is_local:
         path = _side_path(side, relpath)
         assert isinstance(path, Path)
-        return path.stat()
+        return path.lstat()
     assert side.remote is not None
     path = _side_path(side, relpath)
     assert isinstance(path, str)
-    return side.remote.sftp.stat(path)
+    return side.remote.sftp.lstat(path)
 
 
 def _side_remove_file(side: _SideRuntime, relpath: str) -> None:
@@ -512,7 +810,7 @@ def _side_remove_file(side: _SideRuntime, relpath: str) -> None:
     assert side.remote is not None
     path = _side_path(side, relpath)
     assert isinstance(path, str)
-    side.remote.sftp.remove(path)
+    _retry_transient(side.remote.sftp.remove, path)
 
 
 def _side_remove_if_exists(side: _SideRuntime, relpath: str) -> None:
@@ -559,7 +857,7 @@ def _side_ensure_parent(
     if side.is_local:
         path = _side_path(side, relpath)
         assert isinstance(path, Path)
-        _ensure_local_parent(path)
+        _ensure_local_parent(path, side.known_local_dirs)
         return
     assert side.remote is not None
     path = _side_path(side, relpath)
@@ -601,15 +899,17 @@ def _copy_between(
         known_remote_dirs=dst_known_dirs,
     )
 
+    # For regular files lstat and stat agree, so source_lstat also carries the
+    # mode/mtime to replicate and no second stat round trip is needed.
     if _is_symlink(source_lstat):
         source_target = _side_readlink(source_side, relpath)
         mapped_target = map_symlink_target_for_destination(
-            source_root=Path(source_side.root_text),
-            source_home=Path(source_side.home_text),
+            source_root=source_side.root_path,
+            source_home=source_side.home_path,
             source_relpath=relpath,
             source_target=source_target,
-            destination_root=Path(destination_side.root_text),
-            destination_home=Path(destination_side.home_text),
+            destination_root=destination_side.root_path,
+            destination_home=destination_side.home_path,
             destination_relpath=relpath,
         )
         _side_remove_if_exists(destination_side, relpath)
@@ -630,12 +930,18 @@ def _copy_between(
         assert isinstance(src_path, Path)
         assert isinstance(dst_path, str)
         assert destination_side.remote is not None
-        _put_remote_with_replace_fallback(
-            destination_side.remote.sftp,
-            str(src_path),
-            dst_path,
-            confirm=settings.sftp_put_confirm,
+        uploaded = (
+            settings.compression == "zstd"
+            and _wants_zstd_upload(src_path, int(getattr(source_lstat, "st_size", 0)))
+            and _put_remote_zstd(destination_side.remote, src_path, dst_path)
         )
+        if not uploaded:
+            _put_remote_with_replace_fallback(
+                destination_side.remote.sftp,
+                str(src_path),
+                dst_path,
+                confirm=settings.sftp_put_confirm,
+            )
         _apply_remote_metadata_from_local(
             destination_side.remote.sftp,
             dst_path,
@@ -647,9 +953,14 @@ def _copy_between(
         assert isinstance(src_path, str)
         assert isinstance(dst_path, Path)
         assert source_side.remote is not None
-        source_stat = _side_stat(source_side, relpath)
-        source_side.remote.sftp.get(src_path, str(dst_path))
-        _apply_local_metadata_from_remote(dst_path, source_stat)
+        _retry_transient(
+            _get_remote_file,
+            source_side.remote.sftp,
+            src_path,
+            str(dst_path),
+            int(source_lstat.st_size),
+        )
+        _apply_local_metadata_from_remote(dst_path, source_lstat)
         return
 
     assert isinstance(src_path, str)
@@ -657,11 +968,16 @@ def _copy_between(
     assert source_side.remote is not None
     assert destination_side.remote is not None
 
-    source_stat = _side_stat(source_side, relpath)
     with tempfile.NamedTemporaryFile(prefix="limsync-r2r-", delete=False) as handle:
         tmp_path = Path(handle.name)
     try:
-        source_side.remote.sftp.get(src_path, str(tmp_path))
+        _retry_transient(
+            _get_remote_file,
+            source_side.remote.sftp,
+            src_path,
+            str(tmp_path),
+            int(source_lstat.st_size),
+        )
         _put_remote_with_replace_fallback(
             destination_side.remote.sftp,
             str(tmp_path),
@@ -671,7 +987,7 @@ def _copy_between(
         _apply_remote_metadata_from_remote(
             destination_side.remote.sftp,
             dst_path,
-            source_stat,
+            source_lstat,
         )
     finally:
         tmp_path.unlink(missing_ok=True)
@@ -683,44 +999,52 @@ def _apply_metadata_from_right_to_left(
     relpath: str,
     *,
     both_directions: bool,
+    right_snapshot: tuple[int, int] | None = None,
 ) -> None:
     left_stat = _side_lstat(left_side, relpath)
-    right_stat = _side_lstat(right_side, relpath)
-
-    if _is_symlink(left_stat) or _is_symlink(right_stat):
+    if _is_symlink(left_stat):
         return
-
-    target_mode = (
-        min(_local_mode(left_stat), _local_mode(right_stat))
-        if both_directions
-        else None
-    )
-    target_mtime_ns = (
-        min(_local_mtime_ns(left_stat), _local_mtime_ns(right_stat))
-        if both_directions
-        else None
-    )
-
-    mode = target_mode if target_mode is not None else _local_mode(right_stat)
-    mtime_ns = (
-        target_mtime_ns if target_mtime_ns is not None else _local_mtime_ns(right_stat)
-    )
+    if right_snapshot is not None:
+        right_mode, right_mtime_ns = right_snapshot
+    else:
+        right_stat = _side_lstat(right_side, relpath)
+        if _is_symlink(right_stat):
+            return
+        right_mode = _local_mode(right_stat)
+        right_mtime_ns = _local_mtime_ns(right_stat)
+
+    # Each stat field is converted once; the left values only matter when the
+    # two sides converge on the older/stricter of both.
+    if both_directions:
+        mode = min(_local_mode(left_stat), right_mode)
+        mtime_ns = min(_local_mtime_ns(left_stat), right_mtime_ns)
+    else:
+        mode = right_mode
+        mtime_ns = right_mtime_ns
 
     left_path = _side_path(left_side, relpath)
     if left_side.is_local:
         assert isinstance(left_path, Path)
-        os.chmod(left_path, mode)
-        os.utime(left_path, ns=(int(getattr(left_stat, "st_atime_ns")), mtime_ns))
+        if _local_mode(left_stat) != mode:
+            os.chmod(left_path, mode)
+        if _local_mtime_ns(left_stat) != mtime_ns:
+            os.utime(left_path, ns=(int(getattr(left_stat, "st_atime_ns")), mtime_ns))
     else:
         assert isinstance(left_path, str)
         assert left_side.remote is not None
-        left_side.remote.sftp.chmod(left_path, mode)
-        left_side.remote.sftp.utime(
+        # SFTP carries whole seconds, so compare at that precision; a copy of
+        # this path earlier in the run has often already set both.
+        if _local_mode(left_stat) == mode and int(
+            float(getattr(left_stat, "st_mtime", 0))
+        ) == int(mtime_ns / 1_000_000_000):
+            return
+        _retry_transient(
+            _sftp_setstat,
+            left_side.remote.sftp,
             left_path,
-            (
-                int(float(getattr(left_stat, "st_atime", 0))),
-                int(mtime_ns / 1_000_000_000),
-            ),
+            mode,
+            int(float(getattr(left_stat, "st_atime", 0))),
+            int(mtime_ns / 1_000_000_000),
         )
 
 
@@ -730,15 +1054,23 @@ def _apply_metadata_from_left_to_right(
     relpath: str,
     *,
     both_directions: bool,
+    left_snapshot: tuple[int, int] | None = None,
 ) -> None:
     _apply_metadata_from_right_to_left(
         right_side,
         left_side,
         relpath,
         both_directions=both_directions,
+        right_snapshot=left_snapshot,
     )
 
 
+def _op_source_snapshot(op: PlanOperation) -> tuple[int, int] | None:
+    if op.source_mode is None or op.source_mtime_ns is None:
+        return None
+    return op.source_mode, op.source_mtime_ns
+
+
 def _remote_metadata_helper_source() -> str:
     return (
         Path(__file__)
@@ -886,6 +1218,20 @@ def _operation_metadata_fields(op: PlanOperation) -> tuple[str, ...]:
     return op.metadata_fields or ("mode", "mtime")
 
 
+def _snapshot_metadata_values(op: PlanOperation) -> dict[str, object] | None:
+    fields = _operation_metadata_fields(op)
+    item: dict[str, object] = {}
+    if "mode" in fields:
+        if op.source_mode is None:
+            return None
+        item["mode"] = op.source_mode
+    if "mtime" in fields:
+        if op.source_mtime_ns is None:
+            return None
+        item["mtime_ns"] = op.source_mtime_ns
+    return item
+
+
 def _read_metadata_batch(
     source_side: _SideRuntime,
     operations: list[PlanOperation],
@@ -893,8 +1239,16 @@ def _read_metadata_batch(
 ) -> tuple[dict[int, dict[str, object]], dict[int, str]]:
     values: dict[int, dict[str, object]] = {}
     errors: dict[int, str] = {}
+    pending: list[tuple[int, PlanOperation]] = []
+    for request_id, op in enumerate(operations):
+        snapshot = _snapshot_metadata_values(op)
+        if snapshot is not None:
+            values[request_id] = snapshot
+        else:
+            pending.append((request_id, op))
+
     if source_side.is_local:
-        for request_id, op in enumerate(operations):
+        for request_id, op in pending:
             if cancel_event.is_set():
                 break
             try:
@@ -913,6 +1267,9 @@ def _read_metadata_batch(
                 errors[request_id] = str(exc)
         return values, errors
 
+    if not pending:
+        return values, errors
+
     assert source_side.remote is not None
     requests = [
         {
@@ -920,12 +1277,12 @@ def _read_metadata_batch(
             "relpath": op.relpath,
             "fields": list(_operation_metadata_fields(op)),
         }
-        for request_id, op in enumerate(operations)
+        for request_id, op in pending
     ]
     responses, helper_error = _run_remote_metadata_helper(
         source_side.remote, "read", requests, cancel_event=cancel_event
     )
-    for request_id, _op in enumerate(operations):
+    for request_id, _op in pending:
         response = responses.get(request_id)
         if response is None:
             if cancel_event.is_set():
@@ -955,9 +1312,9 @@ def _apply_local_metadata_values(
     target_path = _side_path(destination_side, op.relpath)
     assert isinstance(target_path, Path)
     fields = _operation_metadata_fields(op)
-    if "mode" in fields:
+    if "mode" in fields and _local_mode(target_stat) != int(values["mode"]):
         os.chmod(target_path, int(values["mode"]))
-    if "mtime" in fields:
+    if "mtime" in fields and _local_mtime_ns(target_stat) != int(values["mtime_ns"]):
         os.utime(
             target_path,
             ns=(int(getattr(target_stat, "st_atime_ns")), int(values["mtime_ns"])),
@@ -1052,10 +1409,137 @@ def _execute_metadata_batch(
             )
 
 
+def _is_incompressible(relpath: str) -> bool:
+    return os.path.splitext(relpath)[1].lower() in COMPRESSED_SUFFIXES
+
+
+def _copy_transport_side(side: _SideRuntime, relpath: str) -> _SideRuntime:
+    remote = side.remote
+    if remote is None or remote.plain_sftp is None or not _is_incompressible(relpath):
+        return side
+    return replace(side, remote=replace(remote, sftp=remote.plain_sftp))
+
+
+@dataclass(frozen=True)
+class _OperationContext:
+    """What an operation handler needs besides the operation itself."""
+
+    left: _SideRuntime
+    right: _SideRuntime
+    settings: ApplySettings
+    known_remote_dirs: dict[int, set[str]]
+    # Paths whose metadata is updated in both directions in this run.
+    bidirectional_paths: frozenset[str]
+
+
+def _do_copy_right(ctx: _OperationContext, op: PlanOperation) -> None:
+    _copy_between(
+        _copy_transport_side(ctx.left, op.relpath),
+        _copy_transport_side(ctx.right, op.relpath),
+        op.relpath,
+        settings=ctx.settings,
+        known_remote_dirs=ctx.known_remote_dirs,
+    )
+
+
+def _do_copy_left(ctx: _OperationContext, op: PlanOperation) -> None:
+    _copy_between(
+        _copy_transport_side(ctx.right, op.relpath),
+        _copy_transport_side(ctx.left, op.relpath),
+        op.relpath,
+        settings=ctx.settings,
+        known_remote_dirs=ctx.known_remote_dirs,
+    )
+
+
+def _do_delete_right(ctx: _OperationContext, op: PlanOperation) -> None:
+    _side_remove_file(ctx.right, op.relpath)
+
+
+def _do_delete_left(ctx: _OperationContext, op: PlanOperation) -> None:
+    _side_remove_file(ctx.left, op.relpath)
+
+
+def _do_metadata_update_left(ctx: _OperationContext, op: PlanOperation) -> None:
+    _apply_metadata_from_right_to_left(
+        ctx.left,
+        ctx.right,
+        op.relpath,
+        both_directions=op.relpath in ctx.bidirectional_paths,
+        right_snapshot=_op_source_snapshot(op),
+    )
+
+
+def _do_metadata_update_right(ctx: _OperationContext, op: PlanOperation) -> None:
+    _apply_metadata_from_left_to_right(
+        ctx.left,
+        ctx.right,
+        op.relpath,
+        both_directions=op.relpath in ctx.bidirectional_paths,
+        left_snapshot=_op_source_snapshot(op),
+    )
+
+
+_OPERATION_HANDLERS: dict[str, Callable[[_OperationContext, PlanOperation], None]] = {
+    "copy_right": _do_copy_right,
+    "copy_left": _do_copy_left,
+    "delete_right": _do_delete_right,
+    "delete_left": _do_delete_left,
+    "metadata_update_left": _do_metadata_update_left,
+    "metadata_update_right": _do_metadata_update_right,
+}
+
+
+def _run_operation(ctx: _OperationContext, op: PlanOperation) -> None:
+    handler = _OPERATION_HANDLERS.get(op.kind)
+    if handler is None:
+        raise ValueError(f"unsupported operation kind: {op.kind}")
+    handler(ctx, op)
+
+
+def _locality_key(group: list[PlanOperation]) -> tuple[str, bool, str]:
+    # Walk the tree directory by directory so the remote keeps the same
+    # directory warm in its caches, clearing deletes before the copies there.
+    relpath = group[0].relpath
+    only_deletes = all(op.kind in {"delete_left", "delete_right"} for op in group)
+    return os.path.dirname(relpath), not only_deletes, relpath
+
+
+def _apply_worker_count(
+    settings: ApplySettings,
+    sides: tuple[_SideRuntime, ...],
+    path_count: int,
+) -> int:
+    # Workers hide SFTP round-trips; purely local plans are disk-bound and
+    # stay serial.
+    if path_count < 2 or all(side.is_local for side in sides):
+        return 1
+    return max(1, min(settings.concurrency, MAX_APPLY_WORKERS, path_count))
+
+
+def _worker_side(
+    side: _SideRuntime,
+    known_remote_dirs: dict[int, set[str]],
+    opened: list[paramiko.SFTPClient],
+) -> _SideRuntime:
+    if side.remote is None:
+        return side
+    known_dirs = known_remote_dirs[id(side.remote.sftp)]
+    sftp = open_sftp(side.remote.client)
+    opened.append(sftp)
+    known_remote_dirs[id(sftp)] = known_dirs
+    plain_sftp = None
+    if side.remote.plain_client is not None:
+        plain_sftp = open_sftp(side.remote.plain_client)
+        opened.append(plain_sftp)
+        known_remote_dirs[id(plain_sftp)] = known_dirs
+    return replace(side, remote=replace(side.remote, sftp=sftp, plain_sftp=plain_sftp))
+
+
 def execute_plan(
     source: EndpointSpec | str | Path,
     destination: EndpointSpec | str | Path,
-    operations: list[PlanOperation],
+    operations: Iterable[PlanOperation],
     progress_cb: Callable[[int, int, PlanOperation, bool, str | None], None]
     | None = None,
     settings: ApplySettings | None = None,
@@ -1067,7 +1551,13 @@ def execute_plan(
     resolved_settings = settings or ApplySettings()
     resolved_cancel_event = cancel_event or threading.Event()
 
-    if not operations:
+    operations_list: list[PlanOperation] = []
+    path_ops: dict[str, list[PlanOperation]] = {}
+    for op in operations:
+        operations_list.append(op)
+        path_ops.setdefault(op.relpath, []).append(op)
+
+    if not operations_list:
         return ExecuteResult(
             completed_paths=set(),
             errors=[],
@@ -1080,137 +1570,228 @@ def execute_plan(
             completed_paths=set(),
             errors=[],
             succeeded_operations=0,
-            total_operations=len(operations),
+            total_operations=len(operations_list),
             cancelled=True,
         )
 
-    path_ops: dict[str, list[PlanOperation]] = {}
-    for op in operations:
-        path_ops.setdefault(op.relpath, []).append(op)
-
     errors: list[str] = []
     succeeded: set[tuple[str, str]] = set()
+    # Distinct operations still outstanding per path; a path is complete once
+    # its count drops to zero.
+    pending_per_path = {
+        relpath: len({op.kind for op in path_operations})
+        for relpath, path_operations in path_ops.items()
+    }
+    completed_paths: set[str] = set()
     done_count = 0
-    total = len(operations)
-    op_counts: dict[str, int] = {}
-    op_seconds: dict[str, float] = {}
+    total = len(operations_list)
+    op_counts = dict.fromkeys(OPERATION_KINDS, 0)
+    op_elapsed_ns = dict.fromkeys(OPERATION_KINDS, 0)
+    every_ops = max(1, resolved_settings.progress_emit_every_ops)
+    every_seconds = resolved_settings.progress_emit_every_ms / 1000.0
+    last_emit_count = 0
+    last_emit_at = 0.0
+    result_lock = threading.Lock()
+
+    # Compressing JPEGs or archives again only burns CPU, so when the transport
+    # compresses, such copies get a second, uncompressed connection.
+    plain_transport = resolved_settings.transport_compression and any(
+        op.kind in {"copy_left", "copy_right"} and _is_incompressible(op.relpath)
+        for op in operations_list
+    )
 
     with ExitStack() as stack:
         left_side = _side_runtime(
             stack,
             source_endpoint,
-            compress=resolved_settings.ssh_compression,
+            compress=resolved_settings.transport_compression,
             local_home=local_home,
+            plain_transport=plain_transport,
         )
         right_side = _side_runtime(
             stack,
             destination_endpoint,
-            compress=resolved_settings.ssh_compression,
+            compress=resolved_settings.transport_compression,
             local_home=local_home,
+            plain_transport=plain_transport,
         )
 
         known_remote_dirs: dict[int, set[str]] = {}
         for side in (left_side, right_side):
+            _prime_side_paths(side, path_ops)
             if side.remote is None:
                 continue
             normalized_remote_root = side.remote.root.rstrip("/") or "/"
             known_remote_dirs[id(side.remote.sftp)] = {"/", normalized_remote_root}
+            if side.remote.plain_sftp is not None:
+                known_remote_dirs[id(side.remote.plain_sftp)] = known_remote_dirs[
+                    id(side.remote.sftp)
+                ]
 
         batch_groups: dict[str, list[PlanOperation]] = {}
         regular_operations: list[PlanOperation] = []
-        for op in operations:
-            same_path_ops = path_ops.get(op.relpath, [])
-            if (
-                op.kind in {"metadata_update_left", "metadata_update_right"}
-                and len(same_path_ops) == 1
-            ):
+        for copy_kind, destination_side in (
+            ("copy_right", right_side),
+            ("copy_left", left_side),
+        ):
+            if destination_side.remote is None:
+                continue
+            _prepare_remote_parents(
+                destination_side.remote,
+                (
+                    str(destination_side.paths[op.relpath])
+                    for op in operations_list
+                    if op.kind == copy_kind
+                ),
+                known_remote_dirs[id(destination_side.remote.sftp)],
+            )
+
+        metadata_left_paths: set[str] = set()
+        metadata_right_paths: set[str] = set()
+        for op in operations_list:
+            if op.kind == "metadata_update_left":
+                metadata_left_paths.add(op.relpath)
+            elif op.kind == "metadata_update_right":
+                metadata_right_paths.add(op.relpath)
+            else:
+                regular_operations.append(op)
+                continue
+            if len(path_ops[op.relpath]) == 1:
                 batch_groups.setdefault(op.kind, []).append(op)
             else:
                 regular_operations.append(op)
+        bidirectional_metadata_paths = metadata_left_paths & metadata_right_paths
 
         def record_result(
             op: PlanOperation,
             ok: bool,
             error: str | None,
-            elapsed: float = 0.0,
+            elapsed_ns: int = 0,
+        ) -> None:
+            with result_lock:
+                record_result_locked(op, ok, error, elapsed_ns)
+
+        def record_result_locked(
+            op: PlanOperation,
+            ok: bool,
+            error: str | None,
+            elapsed_ns: int,
         ) -> None:
-            nonlocal done_count
-            op_counts[op.kind] = op_counts.get(op.kind, 0) + 1
-            op_seconds[op.kind] = op_seconds.get(op.kind, 0.0) + elapsed
+            nonlocal done_count, last_emit_count, last_emit_at
+            if op.kind in op_counts:
+                op_counts[op.kind] += 1
+                op_elapsed_ns[op.kind] += elapsed_ns
+            else:
+                op_counts[op.kind] = 1
+                op_elapsed_ns[op.kind] = elapsed_ns
             if ok:
-                succeeded.add((op.kind, op.relpath))
+                key = (op.kind, op.relpath)
+                if key not in succeeded:
+                    succeeded.add(key)
+                    pending_per_path[op.relpath] -= 1
+                    if not pending_per_path[op.relpath]:
+                        completed_paths.add(op.relpath)
             elif error:
                 errors.append(f"{op.kind} {op.relpath}: {error}")
             done_count += 1
-            if progress_cb is not None:
-                progress_cb(done_count, total, op, ok, error)
+            if progress_cb is None:
+                return
+            # First, last and failed operations are always reported; in between
+            # emit at most every N operations or every M milliseconds.
+            now = time.monotonic()
+            if (
+                ok
+                and 1 < done_count < total
+                and done_count - last_emit_count < every_ops
+                and now - last_emit_at < every_seconds
+            ):
+                return
+            last_emit_count = done_count
+            last_emit_at = now
+            progress_cb(done_count, total, op, ok, error)
+
+        main_ctx = _OperationContext(
+            left=left_side,
+            right=right_side,
+            settings=resolved_settings,
+            known_remote_dirs=known_remote_dirs,
+            bidirectional_paths=frozenset(bidirectional_metadata_paths),
+        )
 
-        for op in regular_operations:
-            if resolved_cancel_event.is_set():
-                break
-            relpath = op.relpath
+        def run_timed(op: PlanOperation, ctx: _OperationContext) -> None:
             ok = False
             error: str | None = None
-            started = time.perf_counter()
-
+            started = time.perf_counter_ns()
             try:
-                if op.kind == "copy_right":
-                    _copy_between(
-                        left_side,
-                        right_side,
-                        relpath,
-                        settings=resolved_settings,
-                        known_remote_dirs=known_remote_dirs,
-                    )
-                    ok = True
-                elif op.kind == "copy_left":
-                    _copy_between(
-                        right_side,
-                        left_side,
-                        relpath,
-                        settings=resolved_settings,
-                        known_remote_dirs=known_remote_dirs,
-                    )
-                    ok = True
-                elif op.kind == "delete_right":
-                    _side_remove_file(right_side, relpath)
-                    ok = True
-                elif op.kind == "delete_left":
-                    _side_remove_file(left_side, relpath)
-                    ok = True
-                elif op.kind in {"metadata_update_left", "metadata_update_right"}:
-                    op_kinds = {item.kind for item in path_ops.get(relpath, [])}
-                    both_directions = (
-                        "metadata_update_left" in op_kinds
-                        and "metadata_update_right" in op_kinds
-                    )
-                    if op.kind == "metadata_update_left":
-                        _apply_metadata_from_right_to_left(
-                            left_side,
-                            right_side,
-                            relpath,
-                            both_directions=both_directions,
-                        )
-                    else:
-                        _apply_metadata_from_left_to_right(
-                            left_side,
-                            right_side,
-                            relpath,
-                            both_directions=both_directions,
-                        )
-                    ok = True
-                else:
-                    error = f"unsupported operation kind: {op.kind}"
+                _run_operation(ctx, op)
+                ok = True
             except Exception as exc:  # noqa: BLE001
                 error = str(exc)
+            record_result(op, ok, error, time.perf_counter_ns() - started)
+
+        path_groups: dict[str, list[PlanOperation]] = {}
+        for op in regular_operations:
+            path_groups.setdefault(op.relpath, []).append(op)
+        ordered_groups = [
+            path_groups[relpath]
+            for relpath in sorted(
+                path_groups, key=lambda relpath: _locality_key(path_groups[relpath])
+            )
+        ]
+        workers = _apply_worker_count(
+            resolved_settings, (left_side, right_side), len(path_groups)
+        )
+        if workers <= 1:
+            for op in chain.from_iterable(ordered_groups):
+                if resolved_cancel_event.is_set():
+                    break
+                run_timed(op, main_ctx)
+        else:
+            worker_state = threading.local()
+            worker_sftps: list[paramiko.SFTPClient] = []
+
+            def run_path_group(group: list[PlanOperation]) -> None:
+                ctx = getattr(worker_state, "ctx", None)
+                if ctx is None:
+                    try:
+                        ctx = replace(
+                            main_ctx,
+                            left=_worker_side(
+                                left_side, known_remote_dirs, worker_sftps
+                            ),
+                            right=_worker_side(
+                                right_side, known_remote_dirs, worker_sftps
+                            ),
+                        )
+                    except Exception as exc:  # noqa: BLE001
+                        # e.g. the server refused another session: fail this
+                        # group's operations but keep what others applied.
+                        # The next group on this worker tries again.
+                        for op in group:
+                            record_result(op, False, f"sftp channel: {exc}")
+                        return
+                    worker_state.ctx = ctx
+                for op in group:
+                    if resolved_cancel_event.is_set():
+                        return
+                    run_timed(op, ctx)
+
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = [
+                        executor.submit(run_path_group, group)
+                        for group in ordered_groups
+                    ]
+                    for future in futures:
+                        future.result()
             finally:
-                elapsed = time.perf_counter() - started
-            record_result(op, ok, error, elapsed)
+                for worker_sftp in worker_sftps:
+                    worker_sftp.close()
 
         for kind, metadata_operations in batch_groups.items():
             if resolved_cancel_event.is_set():
                 break
-            batch_started = time.perf_counter()
+            batch_started = time.perf_counter_ns()
             if kind == "metadata_update_left":
                 metadata_source = right_side
                 metadata_destination = left_side
@@ -1224,14 +1805,7 @@ def execute_plan(
                 record_result,
                 resolved_cancel_event,
             )
-            op_seconds[kind] = op_seconds.get(kind, 0.0) + (
-                time.perf_counter() - batch_started
-            )
-
-    completed_paths: set[str] = set()
-    for relpath, path_operations in path_ops.items():
-        if all((op.kind, op.relpath) in succeeded for op in path_operations):
-            completed_paths.add(relpath)
+            op_elapsed_ns[kind] += time.perf_counter_ns() - batch_started
 
     return ExecuteResult(
         completed_paths=completed_paths,
@@ -1239,7 +1813,11 @@ def execute_plan(
         succeeded_operations=len(succeeded),
         total_operations=total,
         succeeded_operation_keys=frozenset(succeeded),
-        operation_counts=op_counts,
-        operation_seconds=op_seconds,
+        operation_counts={kind: count for kind, count in op_counts.items() if count},
+        operation_seconds={
+            kind: elapsed_ns / 1_000_000_000
+            for kind, elapsed_ns in op_elapsed_ns.items()
+            if op_counts[kind]
+        },
         cancelled=resolved_cancel_event.is_set() and done_count < total,
     )
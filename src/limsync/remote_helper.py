@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 import argparse
+import atexit
+import hashlib
 import json
 import os
 import sqlite3
 import stat
 import sys
 import time
+from array import array
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import PurePosixPath
 
 try:
@@ -15,22 +21,84 @@ except Exception:
     # [[IGNORE_RULES_SHARED]]
     pass
 
-CACHE_FOLDERS = {"__pycache__", ".pytest_cache", ".cache", ".ruff_cache"}
-EXCLUDED_FOLDERS = {"node_modules", ".tox", ".venv", ".limsync"} | CACHE_FOLDERS
-EXCLUDED_FILE_NAMES = {".DS_Store", "Icon\r"}
+CACHE_FOLDERS = frozenset({"__pycache__", ".pytest_cache", ".cache", ".ruff_cache"})
+EXCLUDED_FOLDERS = (
+    frozenset({"node_modules", ".tox", ".venv", ".limsync"}) | CACHE_FOLDERS
+)
+EXCLUDED_FILE_NAMES = frozenset({".DS_Store", "Icon\r"})
+WALK_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+# Directory listings read ahead of the walk; bounds memory on wide trees.
+WALK_PREFETCH = WALK_WORKERS * 2
+
+
+EMIT_BUFFER_BYTES = 64 * 1024
+SQLITE_MAX_VARIABLES = 999
+# stat.S_IFMT() and S_IMODE() are function calls; the walk masks inline.
+_S_IFMT_MASK = 0o170000
+_STATE_DB_CONNECTIONS: dict[str, sqlite3.Connection] = {}
+_OUT_BUF = bytearray()
+_RECORD_TEMPLATE = (
+    '{"event": "record", "relpath": %s, "node_type": %s, "size": %d,'
+    ' "mtime_ns": %d, "mode": %d, "link_target": %s, "link_target_key": %s,'
+    ' "owner": null, "group": null}\n'
+)
+_json_str = json.encoder.encode_basestring_ascii
 
 
 def emit(event: dict[str, object]) -> None:
-    sys.stdout.write(json.dumps(event, ensure_ascii=True) + "\n")
-    sys.stdout.flush()
+    # Records are batched; anything the client reacts to right away
+    # (progress, error, done) pushes the batch out with it.
+    _OUT_BUF.extend(json.dumps(event, ensure_ascii=True).encode("ascii"))
+    _OUT_BUF.extend(b"\n")
+    if event.get("event") != "record" or len(_OUT_BUF) >= EMIT_BUFFER_BYTES:
+        flush_emit()
+
+
+def emit_record(
+    relpath: str,
+    ntype: str,
+    size: int,
+    mtime_ns: int,
+    mode: int,
+    link_target: str | None,
+    link_target_key: str | None,
+) -> None:
+    # Same bytes as emit() on the equivalent dict, without building the dict
+    # or running the generic encoder for the fixed record schema.
+    _OUT_BUF.extend(
+        (
+            _RECORD_TEMPLATE
+            % (
+                _json_str(relpath),
+                _json_str(ntype),
+                size,
+                mtime_ns,
+                mode,
+                "null" if link_target is None else _json_str(link_target),
+                "null" if link_target_key is None else _json_str(link_target_key),
+            )
+        ).encode("ascii")
+    )
+    if len(_OUT_BUF) >= EMIT_BUFFER_BYTES:
+        flush_emit()
 
 
-def node_type(st_mode: int) -> str:
-    if stat.S_ISDIR(st_mode):
-        return "dir"
-    if stat.S_ISLNK(st_mode):
-        return "symlink"
-    return "file"
+def flush_emit() -> None:
+    if not _OUT_BUF:
+        return
+    data = bytes(_OUT_BUF)
+    _OUT_BUF.clear()
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        sys.stdout.write(data.decode("ascii"))
+        sys.stdout.flush()
+        return
+    sys.stdout.flush()
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
 
 
 def _symlink_target_compare_key(
@@ -64,27 +132,112 @@ def _symlink_target_compare_key(
     return f"rel:{normalized}"
 
 
-def update_state_db(
-    state_db: str,
-    root: str,
-    records: list[tuple[str, str, int, int, int]],
-    dirs_scanned: int,
-    files_seen: int,
+def _read_dir(
+    path: str,
+) -> list[tuple[os.DirEntry[str], bool, os.stat_result | OSError | None]]:
+    # (entry, is_dir, lstat result or the OSError it raised; None for dirs)
+    with os.scandir(path) as scan_it:
+        entries = list(scan_it)
+    listing: list[tuple[os.DirEntry[str], bool, os.stat_result | OSError | None]] = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            listing.append((entry, True, None))
+            continue
+        try:
+            st: os.stat_result | OSError = entry.stat(follow_symlinks=False)
+        except OSError as exc:
+            st = exc
+        listing.append((entry, False, st))
+    return listing
+
+
+def _execute_multirow(
+    conn: sqlite3.Connection,
+    head: str,
+    tail: str,
+    width: int,
+    rows: Iterable[tuple[object, ...]],
 ) -> None:
-    expanded_state_db = os.path.expanduser(state_db)
-    db_path = (
-        expanded_state_db
-        if os.path.isabs(expanded_state_db)
-        else os.path.join(root, expanded_state_db)
-    )
-    db_dir = os.path.dirname(db_path)
-    if db_dir:
-        os.makedirs(db_dir, exist_ok=True)
+    # One statement per chunk of rows instead of one per row; chunks stay
+    # under the 999 bound variables older SQLite builds allow.
+    per_chunk = SQLITE_MAX_VARIABLES // width
+    row_sql = "(" + ", ".join("?" * width) + ")"
+    statements: dict[int, str] = {}
+    row_iter = iter(rows)
+    while True:
+        chunk = list(islice(row_iter, per_chunk))
+        if not chunk:
+            return
+        sql = statements.get(len(chunk))
+        if sql is None:
+            sql = f"{head} VALUES {', '.join([row_sql] * len(chunk))} {tail}"
+            statements[len(chunk)] = sql
+        conn.execute(sql, [value for row in chunk for value in row])
+
+
+class ScanRecords:
+    """Scan rows kept column-wise: no 5-tuple per file while the walk runs."""
+
+    def __init__(self) -> None:
+        self.relpaths: list[str] = []
+        self.node_types: list[str] = []
+        self.sizes = array("q")
+        self.mtimes_ns = array("q")
+        self.modes = array("i")
+
+    def append(
+        self, relpath: str, ntype: str, size: int, mtime_ns: int, mode: int
+    ) -> None:
+        self.relpaths.append(relpath)
+        self.node_types.append(ntype)
+        self.sizes.append(size)
+        self.mtimes_ns.append(mtime_ns)
+        self.modes.append(mode)
+
+    def __len__(self) -> int:
+        return len(self.relpaths)
+
+    def __iter__(self) -> Iterator[tuple[str, str, int, int, int]]:
+        return zip(
+            self.relpaths, self.node_types, self.sizes, self.mtimes_ns, self.modes
+        )
 
-    now = int(time.time())
+
+def _records_fingerprint(records: ScanRecords) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    relpaths = records.relpaths
+    node_types = records.node_types
+    sizes = records.sizes
+    mtimes_ns = records.mtimes_ns
+    modes = records.modes
+    # Relpaths are unique: walking an index sorted by them keeps the digest
+    # independent of walk order without building a row tuple per file.
+    for idx in sorted(range(len(relpaths)), key=relpaths.__getitem__):
+        digest.update(
+            f"{relpaths[idx]}\0{node_types[idx]}\0{sizes[idx]}"
+            f"\0{mtimes_ns[idx]}\0{modes[idx]}\n".encode("utf-8", "surrogateescape")
+        )
+    return digest.hexdigest()
+
+
+def _state_db_connection(db_path: str) -> sqlite3.Connection:
+    # One connection per DB for the life of the process: pragmas and schema
+    # checks run once, and sqlite3's statement cache survives between scans.
+    conn = _STATE_DB_CONNECTIONS.get(db_path)
+    if conn is not None:
+        return conn
     conn = sqlite3.connect(db_path)
     try:
         conn.execute("PRAGMA journal_mode=WAL")
+        # The DB is a rebuildable scan cache: WAL without a sync per commit
+        # is enough, and the `seen` scratch table can live in memory.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS records (
@@ -105,27 +258,111 @@ def update_state_db(
                 root TEXT PRIMARY KEY,
                 scanned_at INTEGER NOT NULL,
                 dirs_scanned INTEGER NOT NULL,
-                files_seen INTEGER NOT NULL
+                files_seen INTEGER NOT NULL,
+                fingerprint TEXT
             )
             """
         )
+        meta_columns = {
+            row[1] for row in conn.execute("PRAGMA table_info(scan_meta)").fetchall()
+        }
+        if "fingerprint" not in meta_columns:
+            conn.execute("ALTER TABLE scan_meta ADD COLUMN fingerprint TEXT")
+    except BaseException:
+        conn.close()
+        raise
+    _STATE_DB_CONNECTIONS[db_path] = conn
+    return conn
+
+
+def _close_state_db_connections() -> None:
+    while _STATE_DB_CONNECTIONS:
+        _db_path, conn = _STATE_DB_CONNECTIONS.popitem()
+        conn.close()
+
+
+atexit.register(_close_state_db_connections)
+
+
+def _drop_ignored(
+    rules: IgnoreRules, dir_relpath: str, items: list[tuple], is_dir: bool
+) -> list[tuple]:
+    verdicts = rules.filter_children(
+        dir_relpath, [item[0].name for item in items], is_dir
+    )
+    return [item for item, ignored in zip(items, verdicts) if not ignored]
 
+
+def update_state_db(
+    state_db: str,
+    root: str,
+    records: ScanRecords,
+    dirs_scanned: int,
+    files_seen: int,
+) -> None:
+    expanded_state_db = os.path.expanduser(state_db)
+    db_path = (
+        expanded_state_db
+        if os.path.isabs(expanded_state_db)
+        else os.path.join(root, expanded_state_db)
+    )
+    db_dir = os.path.dirname(db_path)
+    if db_dir:
+        os.makedirs(db_dir, exist_ok=True)
+
+    now = int(time.time())
+    conn = _state_db_connection(db_path)
+    try:
+        fingerprint = _records_fingerprint(records)
+        previous = conn.execute(
+            "SELECT fingerprint FROM scan_meta WHERE root = ?", (root,)
+        ).fetchone()
+        if previous is not None and previous[0] == fingerprint:
+            # Same tree as last time: only the scan bookkeeping changes.
+            with conn:
+                conn.execute(
+                    """
+                    UPDATE scan_meta
+                    SET scanned_at = ?, dirs_scanned = ?, files_seen = ?
+                    WHERE root = ?
+                    """,
+                    (now, dirs_scanned, files_seen, root),
+                )
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
         with conn:
             conn.execute("CREATE TEMP TABLE seen(relpath TEXT PRIMARY KEY)")
-            conn.executemany(
+            # Unchanged rows are left alone, so a rescan of a quiet tree
+            # rewrites (almost) no pages; updated_at records the last change.
+            _execute_multirow(
+                conn,
+                "INSERT INTO records"
+                " (root, relpath, node_type, size, mtime_ns, mode, updated_at)",
                 """
-                INSERT OR REPLACE INTO records
-                (root, relpath, node_type, size, mtime_ns, mode, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(root, relpath) DO UPDATE SET
+                    node_type = excluded.node_type,
+                    size = excluded.size,
+                    mtime_ns = excluded.mtime_ns,
+                    mode = excluded.mode,
+                    updated_at = excluded.updated_at
+                WHERE node_type != excluded.node_type
+                   OR size != excluded.size
+                   OR mtime_ns != excluded.mtime_ns
+                   OR mode != excluded.mode
                 """,
+                7,
                 (
                     (root, relpath, ntype, size, mtime_ns, mode, now)
                     for relpath, ntype, size, mtime_ns, mode in records
                 ),
             )
-            conn.executemany(
-                "INSERT OR IGNORE INTO seen(relpath) VALUES (?)",
-                ((relpath,) for relpath, _ntype, _size, _mtime_ns, _mode in records),
+            _execute_multirow(
+                conn,
+                "INSERT OR IGNORE INTO seen(relpath)",
+                "",
+                1,
+                ((relpath,) for relpath in records.relpaths),
             )
             conn.execute(
                 """
@@ -138,17 +375,21 @@ def update_state_db(
             conn.execute("DROP TABLE seen")
             conn.execute(
                 """
-                INSERT INTO scan_meta (root, scanned_at, dirs_scanned, files_seen)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO scan_meta
+                (root, scanned_at, dirs_scanned, files_seen, fingerprint)
+                VALUES (?, ?, ?, ?, ?)
                 ON CONFLICT(root) DO UPDATE SET
                     scanned_at = excluded.scanned_at,
                     dirs_scanned = excluded.dirs_scanned,
-                    files_seen = excluded.files_seen
+                    files_seen = excluded.files_seen,
+                    fingerprint = excluded.fingerprint
                 """,
-                (root, now, dirs_scanned, files_seen),
+                (root, now, dirs_scanned, files_seen, fingerprint),
             )
-    finally:
+    except BaseException:
+        _STATE_DB_CONNECTIONS.pop(db_path, None)
         conn.close()
+        raise
 
 
 def _normalize_subtree(subtree: str | None) -> PurePosixPath:
@@ -184,7 +425,7 @@ def run_scan(
     rules = IgnoreRules()
     subtree_rel = _normalize_subtree(subtree)
     _prime_rules_for_subtree(rules, root, subtree_rel)
-    records_for_db: list[tuple[str, str, int, int, int]] = []
+    records_for_db = ScanRecords()
 
     dirs_scanned = 0
     files_seen = 0
@@ -222,102 +463,113 @@ def run_scan(
             )
             return 0
 
-    for current_dir, dirs, files in os.walk(
-        start_root, topdown=True, onerror=on_walk_error, followlinks=False
-    ):
-        current_abs = os.path.abspath(current_dir)
-        rel_dir = os.path.relpath(current_abs, root)
-        rel_posix = PurePosixPath(
-            "." if rel_dir == "." else rel_dir.replace(os.sep, "/")
-        )
-
-        dirs_scanned += 1
-        now = time.monotonic()
-        if (now - last_progress) >= progress_interval:
-            emit(
-                {
-                    "event": "progress",
-                    "relpath": rel_posix.as_posix(),
-                    "dirs_scanned": dirs_scanned,
-                    "files_seen": files_seen,
-                }
-            )
-            last_progress = now
-
-        rules.load_if_exists(root, rel_posix)
-
-        kept_dirs: list[str] = []
-        for dirname in dirs:
-            if dirname in EXCLUDED_FOLDERS:
-                continue
-            child_rel = (
-                PurePosixPath(dirname)
-                if rel_posix == PurePosixPath(".")
-                else rel_posix / dirname
-            )
-            if rules.is_ignored(child_rel, is_dir=True):
-                continue
-            kept_dirs.append(dirname)
-        dirs[:] = kept_dirs
-
-        for filename in files:
-            if filename in EXCLUDED_FILE_NAMES:
-                continue
-            child_rel = (
-                PurePosixPath(filename)
-                if rel_posix == PurePosixPath(".")
-                else rel_posix / filename
-            )
-            if rules.is_ignored(child_rel, is_dir=False):
-                continue
-
-            full_path = os.path.join(current_abs, filename)
+    # Hand-rolled top-down walk over os.scandir: unlike os.walk it keeps the
+    # DirEntry objects, so each file is stat'ed through its entry (cached,
+    # and free where the platform returns stat data with the listing) and no
+    # per-directory relpath/abspath bookkeeping is needed. Directory reads are
+    # prefetched on a thread pool for the next WALK_PREFETCH stack entries,
+    # while this thread still consumes them in walk order: .dropboxignore
+    # loading, rule checks and emit stay sequential.
+    start_abs = os.path.abspath(start_root)
+    start_rel = os.path.relpath(start_abs, root)
+    executor = ThreadPoolExecutor(max_workers=WALK_WORKERS)
+    # [relpath, abspath, listing future once prefetched]
+    stack: list[list] = [
+        [
+            "." if start_rel == "." else start_rel.replace(os.sep, "/"),
+            start_abs,
+            None,
+        ]
+    ]
+    try:
+        while stack:
+            for pending in stack[-WALK_PREFETCH:]:
+                if pending[2] is None:
+                    pending[2] = executor.submit(_read_dir, pending[1])
+            rel_str, _abs_path, listing_future = stack.pop()
             try:
-                st = os.lstat(full_path)
+                listing = listing_future.result()
             except OSError as exc:
-                errors += 1
-                emit({"event": "error", "message": str(exc), "path": full_path})
-                continue
-
-            ntype = node_type(st.st_mode)
-            if ntype == "dir":
+                on_walk_error(exc)
                 continue
 
-            relpath = child_rel.as_posix()
-            files_seen += 1
-            link_target = None
-            link_target_key = None
-            if ntype == "symlink":
-                try:
-                    link_target = PurePosixPath(os.readlink(full_path)).as_posix()
-                    link_target_key = _symlink_target_compare_key(
-                        root, home, relpath, link_target
-                    )
-                except OSError:
-                    link_target = None
-                    link_target_key = None
-            record = {
-                "event": "record",
-                "relpath": relpath,
-                "node_type": ntype,
-                "size": int(st.st_size),
-                "mtime_ns": int(st.st_mtime_ns),
-                "mode": int(stat.S_IMODE(st.st_mode)),
-                "link_target": link_target,
-                "link_target_key": link_target_key,
-                "owner": None,
-                "group": None,
-            }
-            emit(record)
-            records_for_db.append(
-                (
-                    relpath,
-                    ntype,
-                    int(st.st_size),
-                    int(st.st_mtime_ns),
-                    int(stat.S_IMODE(st.st_mode)),
+            dirs_scanned += 1
+            now = time.monotonic()
+            if (now - last_progress) >= progress_interval:
+                emit(
+                    {
+                        "event": "progress",
+                        "relpath": rel_str,
+                        "dirs_scanned": dirs_scanned,
+                        "files_seen": files_seen,
+                    }
                 )
-            )
+                last_progress = now
+
+            rules.load_if_exists(root, PurePosixPath(rel_str))
+            rules_active = rules.has_rules
+            child_prefix = "" if rel_str == "." else f"{rel_str}/"
+
+            dir_candidates = [
+                item
+                for item in listing
+                if item[1] and item[0].name not in EXCLUDED_FOLDERS
+            ]
+            file_candidates = [
+                item
+                for item in listing
+                if not item[1] and item[0].name not in EXCLUDED_FILE_NAMES
+            ]
+            if rules_active:
+                dir_candidates = _drop_ignored(rules, rel_str, dir_candidates, True)
+                file_candidates = _drop_ignored(rules, rel_str, file_candidates, False)
+
+            # Like os.walk(followlinks=False): symlinked directories are
+            # neither descended into nor reported as files.
+            kept_dirs = [
+                (entry.path, child_prefix + entry.name)
+                for entry, _is_dir, _st in dir_candidates
+                if not entry.is_symlink()
+            ]
+
+            for entry, _is_dir, st in file_candidates:
+                relpath = child_prefix + entry.name
+                full_path = entry.path
+                if isinstance(st, OSError):
+                    errors += 1
+                    emit({"event": "error", "message": str(st), "path": full_path})
+                    continue
+
+                st_mode = st.st_mode
+                file_kind = st_mode & _S_IFMT_MASK
+                if file_kind == stat.S_IFDIR:
+                    continue
+                ntype = "symlink" if file_kind == stat.S_IFLNK else "file"
+
+                files_seen += 1
+                link_target = None
+                link_target_key = None
+                if ntype == "symlink":
+                    try:
+                        link_target = PurePosixPath(os.readlink(full_path)).as_posix()
+                        link_target_key = _symlink_target_compare_key(
+                            root, home, relpath, link_target
+                        )
+                    except OSError:
+                        link_target = None
+                        link_target_key = None
+                size = st.st_size
+                mtime_ns = st.st_mtime_ns
+                mode = st_mode & 0o7777
+                emit_record(
+                    relpath, ntype, size, mtime_ns, mode, link_target, link_target_key
+                )
+                records_for_db.append(relpath, ntype, size, mtime_ns, mode)
+
+            for child_abs, child_rel in reversed(kept_dirs):
+                stack.append([child_rel, child_abs, None])
+    finally:
+        executor.shutdown(wait=True)
 
     if subtree_rel == PurePosixPath("."):
         try:
@@ -351,7 +603,10 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
-    return run_scan(args.root, args.state_db, args.progress_interval, args.subtree)
+    try:
+        return run_scan(args.root, args.state_db, args.progress_interval, args.subtree)
+    finally:
+        flush_emit()
 
 
 if __name__ == "__main__":
@@ -75,12 +75,14 @@ def process_request(
                     or not 0 <= requested_mode <= 0o7777
                 ):
                     raise ValueError("mode must be an integer permission value")
-                os.chmod(target, requested_mode)
+                if stat.S_IMODE(target_stat.st_mode) != requested_mode:
+                    os.chmod(target, requested_mode)
             if "mtime" in fields:
                 requested_mtime = request.get("mtime_ns")
                 if not isinstance(requested_mtime, int):
                     raise ValueError("mtime_ns must be an integer")
-                os.utime(target, ns=(target_stat.st_atime_ns, requested_mtime))
+                if target_stat.st_mtime_ns != requested_mtime:
+                    os.utime(target, ns=(target_stat.st_atime_ns, requested_mtime))
         else:
             raise ValueError(f"unsupported helper mode: {mode}")
         response["ok"] = True
@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import difflib
+import functools
 import platform
 import posixpath
 import shutil
 import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path, PurePosixPath
 
+from rich.text import Text
 from textual.widgets import Tree
 
 from .compare import compare_records
 from .deletion_intent import apply_intentional_deletion_hints
+from .endpoints import EndpointSpec
 from .modals import (
     ApplyRunModal,
     CommandsModal,
@@ -29,10 +36,10 @@ from .planner_apply import (
     ACTION_SUGGESTED,
     ExecuteResult,
     PlanOperation,
-    build_plan_operations,
+    _remote_expand_root,
     summarize_operations,
 )
-from .ssh_pool import pooled_ssh_client
+from .ssh_pool import open_sftp, pooled_ssh_client
 from .state_db import (
     clear_action_overrides,
     delete_paths_from_current_state,
@@ -42,22 +49,68 @@ from .state_db import (
 )
 from .view_filters import ViewFilter, count_view_filters
 
+BINARY_SNIFF_BYTES = 8192
+DROPBOXIGNORE_FLUSH_SECONDS = 0.5
+_SYSTEM = platform.system()
+
+
+@functools.cache
+def _clipboard_command() -> tuple[str, ...] | None:
+    # Resolved once per process; PATH is not rescanned on every copy.
+    system = _SYSTEM
+    if system == "Darwin":
+        return ("pbcopy",)
+    if system == "Windows":
+        return ("clip",)
+    if shutil.which("wl-copy"):
+        return ("wl-copy",)
+    if shutil.which("xclip"):
+        return ("xclip", "-selection", "clipboard")
+    if shutil.which("xsel"):
+        return ("xsel", "--clipboard", "--input")
+    return None
+
+
+def _sftp_session_usable(sftp, client) -> bool:
+    # Reuse a cached session only while its channel is open on the pooled
+    # client's current transport; a reconnect gets a fresh session.
+    get_channel = getattr(sftp, "get_channel", None)
+    if get_channel is None:
+        return True
+    channel = get_channel()
+    if channel is None or channel.closed:
+        return False
+    get_transport = getattr(client, "get_transport", None)
+    return get_transport is None or channel.get_transport() is get_transport()
+
+
+def _close_sftp_quietly(sftp) -> None:
+    try:
+        sftp.close()
+    except Exception:  # noqa: BLE001
+        return
+
+
+def _sftp_expand_root(client, sftp, root: str) -> str:
+    # The SFTP session starts in the login directory, so `~` and `~/...`
+    # resolve with a REALPATH request; only `~user` needs a remote shell.
+    if root == "~" or root.startswith("~/"):
+        return posixpath.join(sftp.normalize("."), root[2:])
+    if root.startswith("~"):
+        return _remote_expand_root(client, root)
+    return root
+
 
 class ReviewActionsMixin:
     def action_apply_plan(self) -> None:
-        plan_ops = build_plan_operations(self.diffs, self.action_overrides)
+        plan_ops = self._plan_operations()
         summary = summarize_operations(plan_ops)
         if summary.total == 0:
             self.status_message = "Nothing to apply."
             self._update_plan_panel()
             return
 
-        self._pending_apply_ops = plan_ops
-        self._apply_required_ops = {}
-        self._apply_done_ops = {}
-        self._apply_newly_completed = set()
-        for op in plan_ops:
-            self._apply_required_ops.setdefault(op.relpath, set()).add(op.kind)
+        self._reset_apply_tracking(plan_ops)
         self.push_screen(
             ConfirmApplyModal(summary.total),
             callback=self._on_apply_confirmed,
@@ -80,6 +133,15 @@ class ReviewActionsMixin:
             callback=self._on_apply_finished,
         )
 
+    def _reset_apply_tracking(self, operations: list[PlanOperation]) -> None:
+        self._pending_apply_ops = operations
+        self._apply_required_ops = defaultdict(set)
+        self._apply_done_ops = defaultdict(set)
+        self._apply_newly_completed = set()
+        required = self._apply_required_ops
+        for op in operations:
+            required[op.relpath].add(op.kind)
+
     def _on_apply_finished(self, result: ExecuteResult | None) -> None:
         if result is None:
             self.status_message = "Apply interrupted."
@@ -87,12 +149,13 @@ class ReviewActionsMixin:
             return
 
         if result.completed_paths:
-            self._mark_completed_paths(set(result.completed_paths))
+            self._mark_completed_paths(result.completed_paths)
 
+        succeeded_keys = result.succeeded_operation_keys
         remaining_ops = [
             op
             for op in self._pending_apply_ops
-            if (op.kind, op.relpath) not in result.succeeded_operation_keys
+            if (op.kind, op.relpath) not in succeeded_keys
         ]
         if result.cancelled:
             self.status_message = (
@@ -121,8 +184,8 @@ class ReviewActionsMixin:
         kind, relpath = data
         if kind != "dir":
             return
-        self._expanded_dir_relpaths.add(str(relpath))
-        dir_entry = self.dirs_by_relpath.get(str(relpath))
+        self._expanded_dir_relpaths.add(relpath)
+        dir_entry = self.dirs_by_relpath.get(relpath)
         # Avoid repopulating already-built nodes during restore/rebuild.
         # Re-population here can reset nested expansion state.
         if dir_entry is not None and not event.node.children:
@@ -135,8 +198,8 @@ class ReviewActionsMixin:
         kind, relpath = data
         if kind != "dir":
             return
-        if str(relpath) != ".":
-            self._expanded_dir_relpaths.discard(str(relpath))
+        if relpath != ".":
+            self._expanded_dir_relpaths.discard(relpath)
 
     def on_tree_node_highlighted(self, event: Tree.NodeHighlighted) -> None:
         data = event.node.data
@@ -144,14 +207,14 @@ class ReviewActionsMixin:
             return
         kind, relpath = data
         if kind == "dir":
-            entry = self.dirs_by_relpath.get(str(relpath))
+            entry = self.dirs_by_relpath.get(relpath)
             if entry is not None:
                 self._set_info_for_dir(entry)
         else:
-            entry = self.files_by_relpath.get(str(relpath))
+            entry = self.files_by_relpath.get(relpath)
             if entry is not None:
                 self._set_info_for_file(entry)
-        self._update_plan_panel()
+        self._schedule_plan_panel_update()
 
     def action_toggle_hide_identical(self) -> None:
         self.hide_identical = not self.hide_identical
@@ -159,12 +222,10 @@ class ReviewActionsMixin:
             self.db_path, "review.hide_identical", "1" if self.hide_identical else "0"
         )
         self._sync_hide_binding_label()
-        self._rebuild_tree()
-        self._set_info_for_dir(self.root)
-        self._update_plan_panel()
+        self._refresh_from_root()
 
     def action_toggle_cursor_node(self) -> None:
-        tree = self.query_one(Tree)
+        tree = self._tree_widget
         node = tree.cursor_node
         data = getattr(node, "data", None)
         if not data:
@@ -172,17 +233,17 @@ class ReviewActionsMixin:
         kind, relpath = data
         if kind != "dir":
             return
-        dir_entry = self.dirs_by_relpath.get(str(relpath))
+        dir_entry = self.dirs_by_relpath.get(relpath)
         if dir_entry is None:
             return
         if node.is_expanded:
             node.collapse()
-            if str(relpath) != ".":
-                self._expanded_dir_relpaths.discard(str(relpath))
+            if relpath != ".":
+                self._expanded_dir_relpaths.discard(relpath)
         else:
             self._populate_node(node, dir_entry)
             node.expand()
-            self._expanded_dir_relpaths.add(str(relpath))
+            self._expanded_dir_relpaths.add(relpath)
 
     def action_apply_left_wins(self) -> None:
         self._apply_action(ACTION_LEFT_WINS)
@@ -209,10 +270,41 @@ class ReviewActionsMixin:
         *,
         is_dir: bool,
     ) -> bool:
-        rule = f"{rule_name}/" if is_dir else rule_name
-        existing_aliases = {rule}
-        if is_dir:
-            existing_aliases.add(rule_name)
+        return bool(
+            self._append_dropboxignore_rules(parent_relpath, [(rule_name, is_dir)])
+        )
+
+    def _append_dropboxignore_rules(
+        self, parent_relpath: str, rules: list[tuple[str, bool]]
+    ) -> list[str]:
+        """Add `(name, is_dir)` rules to one `.dropboxignore` in a single write.
+
+        Returns the rules that were not already present.
+        """
+
+        def _with_rules(content: str) -> tuple[str, list[str]]:
+            # A rule whose name is not even a substring of the file cannot be
+            # one of its lines; only parse the lines when some name occurs.
+            if any(rule_name in content for rule_name, _is_dir in rules):
+                present = {
+                    stripped
+                    for stripped in map(str.strip, content.splitlines())
+                    if stripped and not stripped.startswith("#")
+                }
+            else:
+                present = set()
+            added: list[str] = []
+            for rule_name, is_dir in rules:
+                rule = f"{rule_name}/" if is_dir else rule_name
+                if rule in present or (is_dir and rule_name in present):
+                    continue
+                present.add(rule)
+                added.append(rule)
+            if not added:
+                return content, added
+            if content and not content.endswith("\n"):
+                content += "\n"
+            return content + "".join(f"{rule}\n" for rule in added), added
 
         if self.source_endpoint.is_local:
             source_root = Path(self.source_endpoint.root)
@@ -227,99 +319,82 @@ class ReviewActionsMixin:
             else:
                 parent_path.mkdir(parents=True, exist_ok=True)
                 content = ""
-        else:
-            endpoint = self.source_endpoint
-
-            def _ensure_remote_dir(sftp, path: str) -> None:
-                if path in {"", "/"}:
-                    return
-                parts: list[str] = []
-                cur = path
-                while cur and cur != "/":
-                    parts.append(cur)
-                    cur = posixpath.dirname(cur)
-                for seg in reversed(parts):
-                    try:
-                        sftp.stat(seg)
-                    except OSError:
-                        sftp.mkdir(seg)
-
-            with pooled_ssh_client(
-                host=str(endpoint.host),
-                user=endpoint.user,
-                port=endpoint.port,
-                compress=self.apply_settings.ssh_compression,
-                timeout=10,
-            ) as client:
-                sftp = client.open_sftp()
+            updated, added = _with_rules(content)
+            if added:
+                ignore_path.write_text(updated, encoding="utf-8")
+            return added
+
+        endpoint = self.source_endpoint
+
+        def _ensure_remote_dir(sftp, path: str) -> None:
+            if path in {"", "/"}:
+                return
+            parts: list[str] = []
+            cur = path
+            while cur and cur != "/":
+                parts.append(cur)
+                cur = posixpath.dirname(cur)
+            for seg in reversed(parts):
                 try:
-                    quoted = endpoint.root.replace("'", "'\\''")
-                    _stdin, stdout, _stderr = client.exec_command(
-                        f"python3 -c \"import os; print(os.path.expanduser('{quoted}'))\""
-                    )
-                    expanded = (
-                        stdout.read().decode("utf-8", errors="replace").strip()
-                        or endpoint.root
-                    )
-                    remote_root_abs = sftp.normalize(expanded)
-                    parent_path = (
-                        remote_root_abs
-                        if parent_relpath == "."
-                        else f"{remote_root_abs.rstrip('/')}/{parent_relpath}"
-                    )
-                    _ensure_remote_dir(sftp, parent_path)
-                    ignore_path = f"{parent_path.rstrip('/')}/.dropboxignore"
-                    try:
-                        with sftp.open(ignore_path, "r") as handle:
-                            content = handle.read().decode("utf-8", errors="replace")
-                    except OSError:
-                        content = ""
-                finally:
-                    sftp.close()
-
-        for line in content.splitlines():
-            stripped = line.strip()
-            if not stripped or stripped.startswith("#"):
-                continue
-            if stripped in existing_aliases:
-                return False
-
-        if content and not content.endswith("\n"):
-            content += "\n"
-        content += f"{rule}\n"
-        if self.source_endpoint.is_local:
-            ignore_path.write_text(content, encoding="utf-8")
-        else:
-            endpoint = self.source_endpoint
-            with pooled_ssh_client(
-                host=str(endpoint.host),
-                user=endpoint.user,
-                port=endpoint.port,
-                compress=self.apply_settings.ssh_compression,
-                timeout=10,
-            ) as client:
-                sftp = client.open_sftp()
-                try:
-                    quoted = endpoint.root.replace("'", "'\\''")
-                    _stdin, stdout, _stderr = client.exec_command(
-                        f"python3 -c \"import os; print(os.path.expanduser('{quoted}'))\""
-                    )
-                    expanded = (
-                        stdout.read().decode("utf-8", errors="replace").strip()
-                        or endpoint.root
-                    )
-                    remote_root_abs = sftp.normalize(expanded)
-                    parent_path = (
-                        remote_root_abs
-                        if parent_relpath == "."
-                        else f"{remote_root_abs.rstrip('/')}/{parent_relpath}"
-                    )
-                    ignore_path = f"{parent_path.rstrip('/')}/.dropboxignore"
-                    with sftp.open(ignore_path, "w") as handle:
-                        handle.write(content)
-                finally:
-                    sftp.close()
-        return True
+                    sftp.stat(seg)
+                except OSError:
+                    sftp.mkdir(seg)
+
+        # Read and rewrite over the same pooled connection and SFTP channel.
+        with pooled_ssh_client(
+            host=str(endpoint.host),
+            user=endpoint.user,
+            port=endpoint.port,
+            compress=self.apply_settings.transport_compression,
+            timeout=10,
+        ) as client:
+            sftp = self._endpoint_sftp(endpoint, client)
+            remote_root_abs = self._remote_root_abs(endpoint, client, sftp)
+            parent_path = (
+                remote_root_abs
+                if parent_relpath == "."
+                else f"{remote_root_abs.rstrip('/')}/{parent_relpath}"
+            )
+            _ensure_remote_dir(sftp, parent_path)
+            ignore_path = f"{parent_path.rstrip('/')}/.dropboxignore"
+            try:
+                with sftp.open(ignore_path, "r") as handle:
+                    content = handle.read().decode("utf-8", errors="replace")
+            except OSError:
+                content = ""
+            updated, added = _with_rules(content)
+            if added:
+                with sftp.open(ignore_path, "w") as handle:
+                    handle.write(updated)
+        return added
+
+    def _endpoint_sftp(self, endpoint: EndpointSpec, client):
+        """SFTP session for `endpoint`, kept open for the whole review."""
+        key = (str(endpoint.host), endpoint.user, endpoint.port, endpoint.root)
+        sftp = self._sftp_sessions.get(key)
+        if sftp is not None and _sftp_session_usable(sftp, client):
+            return sftp
+        if sftp is not None:
+            _close_sftp_quietly(sftp)
+        sftp = open_sftp(client)
+        self._sftp_sessions[key] = sftp
+        return sftp
+
+    def _close_sftp_sessions(self) -> None:
+        sessions = list(self._sftp_sessions.values())
+        self._sftp_sessions.clear()
+        for sftp in sessions:
+            _close_sftp_quietly(sftp)
+
+    def _remote_root_abs(self, endpoint: EndpointSpec, client, sftp) -> str:
+        # The absolute remote root never changes during a review session;
+        # resolve it once per endpoint instead of once per remote action.
+        key = (str(endpoint.host), endpoint.user, endpoint.port, endpoint.root)
+        cached = self._remote_root_abs_cache.get(key)
+        if cached is None:
+            cached = sftp.normalize(_sftp_expand_root(client, sftp, endpoint.root))
+            self._remote_root_abs_cache[key] = cached
+        return cached
 
     def action_add_to_dropboxignore(self) -> None:
         selected = self._selected_node()
@@ -331,49 +406,138 @@ class ReviewActionsMixin:
             self._notify_message("Cannot ignore the root folder.", severity="warning")
             return
 
-        selected_path = PurePosixPath(relpath)
-        parent_relpath = selected_path.parent.as_posix()
-        name = selected_path.name
+        parent_relpath, name = posixpath.split(relpath)
+        parent_relpath = parent_relpath or "."
+        ignore_file = (
+            ".dropboxignore"
+            if parent_relpath == "."
+            else f"{parent_relpath}/.dropboxignore"
+        )
 
-        try:
-            added = self._append_dropboxignore_rule(
-                parent_relpath=parent_relpath,
-                rule_name=name,
-                is_dir=(kind == "dir"),
-            )
-        except Exception as exc:  # noqa: BLE001
-            self._notify_message(
-                f"Failed to update .dropboxignore: {exc}", severity="error"
-            )
+        if self.source_endpoint.is_local:
+            try:
+                added = self._append_dropboxignore_rule(
+                    parent_relpath=parent_relpath,
+                    rule_name=name,
+                    is_dir=(kind == "dir"),
+                )
+            except Exception as exc:  # noqa: BLE001
+                self._notify_message(
+                    f"Failed to update .dropboxignore: {exc}", severity="error"
+                )
+                return
+            if added:
+                self.status_message = f"Added '{name}' to {ignore_file}."
+            else:
+                self.status_message = f"'{name}' already present in {ignore_file}."
+            self._forget_ignored_paths([(kind, relpath)])
             return
 
-        removed_paths = (
-            {relpath} if kind == "file" else set(self.dir_files_map.get(relpath, []))
+        # Hiding several siblings in a row is common; remote rules are queued
+        # and written with one read-modify-write per folder. The rows stay in
+        # the review until their rule is actually on the remote.
+        self._pending_ignore_rules.setdefault(parent_relpath, []).append(
+            (name, kind == "dir")
         )
+        if self._ignore_flush_timer is not None:
+            self._ignore_flush_timer.stop()
+        self._ignore_flush_timer = self.set_timer(
+            DROPBOXIGNORE_FLUSH_SECONDS, self._flush_dropboxignore
+        )
+        self.status_message = f"Adding '{name}' to {ignore_file}..."
+        self._update_plan_panel()
+
+    def _forget_ignored_paths(self, ignored: list[tuple[str, str]]) -> None:
+        """Drop `(kind, relpath)` nodes now covered by a `.dropboxignore` rule."""
+        removed_paths: set[str] = set()
+        for kind, relpath in ignored:
+            if kind == "file":
+                removed_paths.add(relpath)
+            else:
+                removed_paths.update(self.dir_files_map.get(relpath, []))
         if removed_paths:
             delete_paths_from_current_state(self.db_path, removed_paths)
 
         self._reload_state()
         self.action_overrides = load_action_overrides(self.db_path)
-        self._expanded_dir_relpaths.discard(relpath)
-        ignore_file = (
-            ".dropboxignore"
-            if parent_relpath == "."
-            else f"{parent_relpath}/.dropboxignore"
+        for _kind, relpath in ignored:
+            self._expanded_dir_relpaths.discard(relpath)
+        self._refresh_from_root()
+
+    def _flush_dropboxignore(self) -> bool:
+        """Write the queued remote `.dropboxignore` rules; False on failure.
+
+        Folders that could not be written stay queued for the next flush.
+        """
+        self._ignore_flush_timer = None
+        pending = self._pending_ignore_rules
+        if not pending:
+            return True
+        added_count = 0
+        written: list[tuple[str, str]] = []
+        failure: Exception | None = None
+        for parent_relpath, rules in list(pending.items()):
+            try:
+                added_count += len(
+                    self._append_dropboxignore_rules(parent_relpath, rules)
+                )
+            except Exception as exc:  # noqa: BLE001
+                failure = exc
+                break
+            del pending[parent_relpath]
+            written.extend(
+                (
+                    "dir" if is_dir else "file",
+                    name if parent_relpath == "." else f"{parent_relpath}/{name}",
+                )
+                for name, is_dir in rules
+            )
+        if written:
+            self._forget_ignored_paths(written)
+        if failure is not None:
+            self._notify_message(
+                f"Failed to update .dropboxignore: {failure}", severity="error"
+            )
+            return False
+        self.status_message = (
+            f"Added {added_count} rule{'' if added_count == 1 else 's'}"
+            " to .dropboxignore."
         )
-        if added:
-            self.status_message = f"Added '{name}' to {ignore_file}."
-        else:
-            self.status_message = f"'{name}' already present in {ignore_file}."
-        self._rebuild_tree()
-        self._set_info_for_dir(self.root)
         self._update_plan_panel()
+        return True
+
+    async def action_quit(self) -> None:
+        # One flush attempt, never a gate: with the remote unreachable the
+        # user must still be able to leave. Unwritten rules are listed on
+        # stderr once the terminal is restored.
+        if self._flush_dropboxignore():
+            self.exit()
+            return
+        unwritten: list[str] = []
+        for parent_relpath, rules in self._pending_ignore_rules.items():
+            ignore_file = (
+                ".dropboxignore"
+                if parent_relpath == "."
+                else f"{parent_relpath}/.dropboxignore"
+            )
+            unwritten.extend(
+                f"  {ignore_file}: {name}/" if is_dir else f"  {ignore_file}: {name}"
+                for name, is_dir in rules
+            )
+        self._pending_ignore_rules = {}
+        self.exit(
+            message=Text(
+                f"{len(unwritten)} .dropboxignore rule"
+                f"{'' if len(unwritten) == 1 else 's'} not written:\n"
+                + "\n".join(unwritten)
+            )
+        )
 
     def action_apply_suggested(self) -> None:
         self._apply_action(ACTION_SUGGESTED)
 
     def action_view_plan(self) -> None:
-        plan_ops = build_plan_operations(self.diffs, self.action_overrides)
+        plan_ops = self._plan_operations()
         self.push_screen(PlanTreeModal(plan_ops))
 
     def action_update_selected_path(self) -> None:
@@ -385,16 +549,33 @@ class ReviewActionsMixin:
         scope_relpath = relpath
         scope_is_dir = kind == "dir"
 
+        previous_content_states = {
+            relpath: self.diffs_by_relpath[relpath].content_state
+            for relpath in self._scope_relpaths(scope_relpath, scope_is_dir)
+        }
+        self.status_message = f"Updating path: {scope_relpath}..."
+        self._update_plan_panel()
+        # Rescanning can take a while on large or remote trees; keep the UI
+        # responsive and swap the results in once both scans are done.
+        self.run_worker(
+            self._update_path(scope_relpath, scope_is_dir, previous_content_states),
+            group="update-path",
+            exclusive=True,
+        )
+
+    async def _update_path(
+        self,
+        scope_relpath: str,
+        scope_is_dir: bool,
+        previous_content_states: dict[str, ContentState],
+    ) -> None:
         try:
-            previous_content_states = {
-                relpath: diff.content_state
-                for relpath, diff in self.diffs_by_relpath.items()
-                if self._scope_match(relpath, scope_relpath, scope_is_dir)
-            }
-            source_records, destination_records = self._scan_subtree_records(
+            source_records, destination_records = await self._scan_subtree_records(
                 scope_relpath, scope_is_dir
             )
-            scoped_diffs = compare_records(source_records, destination_records)
+            scoped_diffs = await asyncio.to_thread(
+                compare_records, source_records, destination_records
+            )
             scoped_diffs = apply_intentional_deletion_hints(
                 scoped_diffs, previous_content_states
             )
@@ -410,19 +591,7 @@ class ReviewActionsMixin:
         self._refresh_after_plan_change()
 
     def _copy_text_to_clipboard(self, text: str) -> None:
-        system = platform.system()
-        cmd: list[str] | None = None
-        if system == "Darwin":
-            cmd = ["pbcopy"]
-        elif system == "Windows":
-            cmd = ["clip"]
-        else:
-            if shutil.which("wl-copy"):
-                cmd = ["wl-copy"]
-            elif shutil.which("xclip"):
-                cmd = ["xclip", "-selection", "clipboard"]
-            elif shutil.which("xsel"):
-                cmd = ["xsel", "--clipboard", "--input"]
+        cmd = _clipboard_command()
         if cmd is None:
             raise RuntimeError("No clipboard utility found.")
         subprocess.run(
@@ -458,28 +627,27 @@ class ReviewActionsMixin:
         if selected is None:
             return "", []
         kind, relpath = selected
-        relpaths = (
-            [relpath] if kind == "file" else list(self.dir_files_map.get(relpath, []))
-        )
-        if kind == "dir":
+        if kind == "file":
+            relpaths = [relpath]
+        else:
+            visible = self.visible_changed_relpaths
             relpaths = [
-                path for path in relpaths if path in self.visible_changed_relpaths
+                path for path in self.dir_files_map.get(relpath, []) if path in visible
             ]
 
-        ops_by_key: dict[tuple[str, str], PlanOperation] = {}
+        # dir_files_map lists each file once, so every (kind, relpath) pair
+        # below is already unique.
+        ops: list[PlanOperation] = []
+        diffs_by_relpath = self.diffs_by_relpath
         for target_relpath in relpaths:
-            diff = self.diffs_by_relpath.get(target_relpath)
+            diff = diffs_by_relpath.get(target_relpath)
             if diff is None:
                 continue
             if diff.content_state != ContentState.ONLY_RIGHT:
-                ops_by_key[("delete_left", target_relpath)] = PlanOperation(
-                    "delete_left", target_relpath
-                )
+                ops.append(PlanOperation("delete_left", target_relpath))
             if diff.content_state != ContentState.ONLY_LEFT:
-                ops_by_key[("delete_right", target_relpath)] = PlanOperation(
-                    "delete_right", target_relpath
-                )
-        return relpath, list(ops_by_key.values())
+                ops.append(PlanOperation("delete_right", target_relpath))
+        return relpath, ops
 
     def action_delete_selected_both(self) -> None:
         relpath, ops = self._delete_ops_for_selected()
@@ -509,12 +677,7 @@ class ReviewActionsMixin:
             self._update_plan_panel()
             return
 
-        self._pending_apply_ops = operations
-        self._apply_required_ops = {}
-        self._apply_done_ops = {}
-        self._apply_newly_completed = set()
-        for op in operations:
-            self._apply_required_ops.setdefault(op.relpath, set()).add(op.kind)
+        self._reset_apply_tracking(operations)
 
         self.push_screen(
             ApplyRunModal(
@@ -530,20 +693,29 @@ class ReviewActionsMixin:
     def _on_delete_finished(self, result: ExecuteResult | None) -> None:
         self._on_apply_finished(result)
 
-    def _refresh_after_plan_change(self) -> None:
-        self._rebuild_tree()
-        self._update_plan_panel()
-        selected = self._current_selection()
-        if selected is None:
-            self._set_info_for_dir(self.root)
-            return
-        kind, relpath = selected
-        if kind == "file" and relpath in self.files_by_relpath:
-            self._set_info_for_file(self.files_by_relpath[relpath])
-        elif kind == "dir" and relpath in self.dirs_by_relpath:
-            self._set_info_for_dir(self.dirs_by_relpath[relpath])
-        else:
+    def _refresh_from_root(self) -> None:
+        # Rebuilding the tree and both side panels in one batch lets Textual
+        # lay out and repaint once instead of after each step.
+        with self.batch_update():
+            self._rebuild_tree()
             self._set_info_for_dir(self.root)
+            self._update_plan_panel()
+
+    def _refresh_after_plan_change(self) -> None:
+        with self.batch_update():
+            self._rebuild_tree()
+            self._update_plan_panel()
+            selected = self._current_selection()
+            if selected is None:
+                self._set_info_for_dir(self.root)
+                return
+            kind, relpath = selected
+            if kind == "file" and relpath in self.files_by_relpath:
+                self._set_info_for_file(self.files_by_relpath[relpath])
+            elif kind == "dir" and relpath in self.dirs_by_relpath:
+                self._set_info_for_dir(self.dirs_by_relpath[relpath])
+            else:
+                self._set_info_for_dir(self.root)
 
     def action_clear_plan(self) -> None:
         if not self.action_overrides:
@@ -623,16 +795,20 @@ class ReviewActionsMixin:
     def _read_text_lines_for_diff(
         self, file_path: Path, side_label: str
     ) -> tuple[list[str] | None, str | None]:
+        # Like git, classify by a NUL byte in the first block only, and read
+        # text straight into str instead of holding the raw bytes as well.
         try:
-            payload = file_path.read_bytes()
+            with file_path.open("rb") as handle:
+                head = handle.read(BINARY_SNIFF_BYTES)
+            if b"\x00" in head:
+                return (
+                    None,
+                    f"{side_label}: binary content detected; textual diff is not available.",
+                )
+            with file_path.open(encoding="utf-8", errors="replace", newline="") as f:
+                text = f.read()
         except Exception as exc:  # noqa: BLE001
             return None, f"{side_label}: read failed ({exc})"
-        if b"\x00" in payload:
-            return (
-                None,
-                f"{side_label}: binary content detected; textual diff is not available.",
-            )
-        text = payload.decode("utf-8", errors="replace")
         return text.splitlines(), None
 
     def _build_text_diff(
@@ -647,26 +823,27 @@ class ReviewActionsMixin:
         if destination_error is not None:
             return destination_error
 
-        diff_lines = list(
-            difflib.unified_diff(
-                source_lines or [],
-                destination_lines or [],
-                fromfile=f"left/{relpath}",
-                tofile=f"right/{relpath}",
-                lineterm="",
-            )
+        diff_iter = difflib.unified_diff(
+            source_lines or [],
+            destination_lines or [],
+            fromfile=f"left/{relpath}",
+            tofile=f"right/{relpath}",
+            lineterm="",
         )
+        max_lines = 2500
+        # Keep only what the modal shows; the rest of the diff is counted
+        # for the truncation note but never held in memory.
+        diff_lines = list(islice(diff_iter, max_lines))
         if not diff_lines:
             return "No textual differences."
 
-        max_lines = 2500
-        if len(diff_lines) > max_lines:
-            shown = diff_lines[:max_lines]
-            shown.append("")
-            shown.append(
-                f"... diff truncated: showing {max_lines} of {len(diff_lines)} lines ..."
+        hidden = sum(1 for _line in diff_iter)
+        if hidden:
+            diff_lines.append("")
+            diff_lines.append(
+                f"... diff truncated: showing {max_lines} of "
+                f"{max_lines + hidden} lines ..."
             )
-            diff_lines = shown
         return "\n".join(diff_lines)
 
     def action_diff_selected(self) -> None:
@@ -682,10 +859,20 @@ class ReviewActionsMixin:
             return
 
         try:
-            source_path = self._download_endpoint_file(self.source_endpoint, relpath)
-            destination_path = self._download_endpoint_file(
-                self.destination_endpoint, relpath
-            )
+            # Fetch both sides at once; each endpoint has its own SSH session.
+            self._open_temp_root()
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                source_future = pool.submit(
+                    self._download_endpoint_file, self.source_endpoint, relpath, "left"
+                )
+                destination_future = pool.submit(
+                    self._download_endpoint_file,
+                    self.destination_endpoint,
+                    relpath,
+                    "right",
+                )
+                source_path = source_future.result()
+                destination_path = destination_future.result()
             diff_text = self._build_text_diff(relpath, source_path, destination_path)
             self.push_screen(FileDiffModal(relpath, diff_text))
         except Exception as exc:  # noqa: BLE001
@@ -1,17 +1,26 @@
 from __future__ import annotations
 
-import platform
+import asyncio
+import functools
+import heapq
+import posixpath
 import re
 import subprocess
 import tempfile
 import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from operator import attrgetter
 from pathlib import Path, PurePosixPath
+from typing import Any
 
 from rich.text import Text
 from textual.app import App, ComposeResult
 from textual.binding import Binding, BindingsMap
 from textual.containers import Horizontal, Vertical
+from textual.timer import Timer
 from textual.widgets import Footer, Header, Static, Tree
+from textual.widgets.tree import TreeNode
 
 from .config import RemoteConfig
 from .endpoints import EndpointSpec, default_endpoint_state_db
@@ -19,11 +28,15 @@ from .models import ContentState, DiffRecord, FileRecord, MetadataState
 from .planner_apply import (
     ACTION_IGNORE,
     ACTION_SUGGESTED,
+    OPERATION_KINDS,
     ApplySettings,
+    PlanOperation,
+    PlanSummary,
     build_plan_operations,
+    iter_plan_operations,
     summarize_operations,
 )
-from .review_actions import ReviewActionsMixin
+from .review_actions import _SYSTEM, ReviewActionsMixin
 from .scanner_local import LocalScanner
 from .scanner_remote import RemoteScanner
 from .ssh_pool import pooled_ssh_client
@@ -37,7 +50,12 @@ from .state_db import (
 from .tree_builder import (
     DirEntry,
     FileEntry,
+    FolderCounts,
+    _action_counts_for_files,
+    _ancestor_dir_keys,
+    _apply_counts,
     _build_model,
+    _counts_delta,
     _file_counts,
     _file_label,
     _folder_action_counts_by_relpath,
@@ -48,6 +66,11 @@ from .tree_builder import (
 )
 from .view_filters import ALL_VIEW_FILTERS, ViewFilter, classify_diff_for_view
 
+PLAN_PANEL_DEBOUNCE_SECONDS = 0.05
+_MODE_DETAIL_RE = re.compile(r"mode:\s+left=(0x[0-7]{3})\s+right=(0x[0-7]{3})")
+_MTIME_DETAIL_RE = re.compile(r"mtime:\s+left=(.*?)\s+right=(.*?)$")
+_diff_relpath = attrgetter("relpath")
+
 
 def _op_label(kind: str) -> str:
     if kind == "copy_right":
@@ -74,15 +97,13 @@ def _ops_text(kinds: list[str]) -> str:
 
 def _parse_metadata_details(details: list[str]) -> dict[str, str]:
     parsed: dict[str, str] = {}
-    mode_re = re.compile(r"mode:\s+left=(0x[0-7]{3})\s+right=(0x[0-7]{3})")
-    mtime_re = re.compile(r"mtime:\s+left=(.*?)\s+right=(.*?)$")
     for detail in details:
-        mode_match = mode_re.match(detail)
+        mode_match = _MODE_DETAIL_RE.match(detail)
         if mode_match:
             parsed["mode_left"] = mode_match.group(1)
             parsed["mode_right"] = mode_match.group(2)
             continue
-        mtime_match = mtime_re.match(detail)
+        mtime_match = _MTIME_DETAIL_RE.match(detail)
         if mtime_match:
             parsed["mtime_left"] = mtime_match.group(1)
             parsed["mtime_right"] = mtime_match.group(2)
@@ -111,21 +132,26 @@ def _suggested_action_with_reason(entry: FileEntry, suggested_ops: list[str]) ->
     return f"copy metadata from {source}"
 
 
-def _ops_direction_marker(kinds: list[str]) -> str:
+_LEFT_KINDS = frozenset({"copy_left", "metadata_update_left", "delete_left"})
+_RIGHT_KINDS = frozenset({"copy_right", "metadata_update_right", "delete_right"})
+
+
+@functools.lru_cache(maxsize=256)
+def _ops_direction_marker(kinds: tuple[str, ...]) -> str:
     if not kinds:
         return ""
-    has_left = any(
-        kind in {"copy_left", "metadata_update_left", "delete_left"} for kind in kinds
-    )
-    has_right = any(
-        kind in {"copy_right", "metadata_update_right", "delete_right"}
-        for kind in kinds
-    )
-    has_delete = any(kind in {"delete_left", "delete_right"} for kind in kinds)
-    if has_delete:
-        if "delete_left" in kinds and "delete_right" in kinds:
+    has_left = has_right = delete_left = delete_right = False
+    for kind in kinds:
+        if kind in _LEFT_KINDS:
+            has_left = True
+            delete_left = delete_left or kind == "delete_left"
+        elif kind in _RIGHT_KINDS:
+            has_right = True
+            delete_right = delete_right or kind == "delete_right"
+    if delete_left or delete_right:
+        if delete_left and delete_right:
             return " <=DEL=> "
-        if "delete_left" in kinds:
+        if delete_left:
             return " <=DEL "
         return " DEL=> "
     if has_left and has_right:
@@ -205,11 +231,29 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         self.status_message = ""
         self.can_apply = False
         self._pending_apply_ops: list = []
-        self._apply_required_ops: dict[str, set[str]] = {}
-        self._apply_done_ops: dict[str, set[str]] = {}
+        self._apply_required_ops: defaultdict[str, set[str]] = defaultdict(set)
+        self._apply_done_ops: defaultdict[str, set[str]] = defaultdict(set)
         self._apply_newly_completed: set[str] = set()
         self._open_temp_dir: Path | None = None
         self._expanded_dir_relpaths: set[str] = {"."}
+        self._plan_ops_cache: (
+            tuple[list[DiffRecord], dict[str, str], list[PlanOperation]] | None
+        ) = None
+        # Operation counts per kind for the plan panel, valid for the same
+        # (diffs, overrides) pair as _plan_ops_cache.
+        self._plan_counts: (
+            tuple[list[DiffRecord], dict[str, str], Counter[str]] | None
+        ) = None
+        self._remote_root_abs_cache: dict[
+            tuple[str, str | None, int | None, str], str
+        ] = {}
+        self._plan_panel_timer: Timer | None = None
+        self._ops_cache: dict[tuple[str, str], tuple[DiffRecord, list[str]]] = {}
+        self._visible_children_cache: dict[str, bool] = {}
+        self._nodes_by_data: dict[tuple[str, str], TreeNode] = {}
+        self._sftp_sessions: dict[tuple[str, str | None, int | None, str], Any] = {}
+        self._pending_ignore_rules: dict[str, list[tuple[str, bool]]] = {}
+        self._ignore_flush_timer: Timer | None = None
 
         self._reload_state()
         self.action_overrides = load_action_overrides(self.db_path)
@@ -217,6 +261,7 @@ class ReviewApp(ReviewActionsMixin, App[None]):
 
     def _reload_state(self) -> None:
         rows = load_current_diffs(db_path=self.db_path)
+        self._ops_cache = {}
         (
             self.root,
             self.dirs_by_relpath,
@@ -227,6 +272,8 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         self.diffs = list(self.diffs_by_relpath.values())
 
     def _refresh_view_aggregates(self) -> None:
+        # Everything the visibility checks read is recomputed here.
+        self._visible_children_cache = {}
         self.visible_changed_relpaths = {
             relpath
             for relpath, diff in self.diffs_by_relpath.items()
@@ -264,15 +311,22 @@ class ReviewApp(ReviewActionsMixin, App[None]):
                 yield Static(id="plan")
         yield Footer()
 
+    def on_unmount(self) -> None:
+        self._close_sftp_sessions()
+
     def on_mount(self) -> None:
+        # The layout never changes, so look the widgets up once.
+        self._tree_widget: Tree = self.query_one(Tree)
+        self._info_panel: Static = self.query_one("#info", Static)
+        self._plan_panel: Static = self.query_one("#plan", Static)
         self._sync_hide_binding_label()
         self._rebuild_tree()
         self._set_info_for_dir(self.root)
         self._update_plan_panel()
 
-    def _visible_dir(self, entry: DirEntry) -> bool:
+    def _dir_has_visible_changes(self, entry: DirEntry) -> bool:
         counts = self.display_counts_by_dir.get(entry.relpath, entry.counts)
-        has_visible_changes = any(
+        return any(
             (
                 counts.only_left,
                 counts.only_right,
@@ -281,7 +335,9 @@ class ReviewApp(ReviewActionsMixin, App[None]):
                 counts.uncertain,
             )
         )
-        if has_visible_changes:
+
+    def _visible_dir(self, entry: DirEntry) -> bool:
+        if self._dir_has_visible_changes(entry):
             return True
         return not self.hide_identical and _is_identical_folder(entry)
 
@@ -289,56 +345,99 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         return entry.relpath in self.visible_changed_relpaths
 
     def _dir_has_visible_children(self, entry: DirEntry) -> bool:
-        return any(self._visible_dir(child) for child in entry.dirs.values()) or any(
-            self._visible_file(file_entry) for file_entry in entry.files
-        )
+        # Re-expanding a folder asks again for each of its subfolders; the
+        # answer only changes when the view aggregates are refreshed.
+        cached = self._visible_children_cache.get(entry.relpath)
+        if cached is None:
+            cached = any(
+                self._visible_dir(child) for child in entry.dirs.values()
+            ) or any(self._visible_file(file_entry) for file_entry in entry.files)
+            self._visible_children_cache[entry.relpath] = cached
+        return cached
 
     def _populate_node(self, tree_node, dir_entry: DirEntry) -> None:
         tree_node.remove_children()
-        for child_name in sorted(dir_entry.dirs):
-            child = dir_entry.dirs[child_name]
+        # _build_model stores children already sorted by name.
+        for child in dir_entry.dirs.values():
             if not self._visible_dir(child):
                 continue
-            tree_node.add(
+            # Children are collapsed placeholders filled on expand. Visible
+            # changes counted below a folder imply a visible child, so only
+            # folders shown for being identical need their children scanned.
+            data = ("dir", child.relpath)
+            self._nodes_by_data[data] = tree_node.add(
                 self._folder_label_for(child),
-                data=("dir", child.relpath),
-                allow_expand=self._dir_has_visible_children(child),
+                data=data,
+                allow_expand=self._dir_has_visible_changes(child)
+                or self._dir_has_visible_children(child),
             )
-        for file_entry in sorted(dir_entry.files, key=lambda item: item.name):
+        for file_entry in dir_entry.files:
             if not self._visible_file(file_entry):
                 continue
-            action = self._effective_action(file_entry.relpath)
-            ops = self._operations_for_entry(file_entry.relpath, action)
-            marker = _ops_direction_marker(ops)
-            label = _file_label(file_entry)
-            if marker:
-                if any(kind in {"delete_left", "delete_right"} for kind in ops):
-                    label.stylize("dim")
-                label.append(marker, style="magenta")
-            tree_node.add(label, data=("file", file_entry.relpath), allow_expand=False)
+            data = ("file", file_entry.relpath)
+            self._nodes_by_data[data] = tree_node.add(
+                self._file_node_label(file_entry), data=data, allow_expand=False
+            )
+
+    def _file_node_label(self, file_entry: FileEntry) -> Text:
+        action = self._effective_action(file_entry.relpath)
+        ops = self._operations_for_entry(file_entry.relpath, action)
+        marker = _ops_direction_marker(tuple(ops))
+        label = _file_label(file_entry)
+        if marker:
+            if any(kind in {"delete_left", "delete_right"} for kind in ops):
+                label.stylize("dim")
+            label.append(marker, style="magenta")
+        return label
+
+    def _relabel_for_override_changes(self, relpaths: Iterable[str]) -> None:
+        """Refresh labels touched by new actions without rebuilding the tree.
+
+        Overrides only change file markers and folder action counts, never
+        which nodes are visible, so the existing nodes are relabelled.
+        """
+        visible = self.visible_changed_relpaths
+        nodes = self._nodes_by_data
+        dir_keys: set[str] = set()
+        for relpath in relpaths:
+            dir_keys.update(_ancestor_dir_keys(relpath))
+            file_entry = self.files_by_relpath.get(relpath)
+            node = nodes.get(("file", relpath))
+            if file_entry is not None and node is not None:
+                node.set_label(self._file_node_label(file_entry))
+        for dir_key in dir_keys:
+            self.action_counts_by_dir[dir_key] = _action_counts_for_files(
+                [
+                    path
+                    for path in self.dir_files_map.get(dir_key, [])
+                    if path in visible
+                ],
+                self.files_by_relpath,
+                self.action_overrides,
+            )
+            entry = self.dirs_by_relpath.get(dir_key)
+            node = nodes.get(("dir", dir_key))
+            if entry is not None and node is not None:
+                node.set_label(self._folder_label_for(entry))
 
     def _rebuild_tree(self) -> None:
         expanded_before, selected_before = self._capture_tree_state()
-        tree = self.query_one(Tree)
+        tree = self._tree_widget
         tree.root.remove_children()
         self._refresh_view_aggregates()
         tree.root.set_label(self._folder_label_for(self.root))
         tree.root.data = ("dir", self.root.relpath)
+        self._nodes_by_data = {tree.root.data: tree.root}
         self._populate_node(tree.root, self.root)
         tree.root.expand()
         self._restore_tree_state(expanded_before, selected_before)
 
     def _capture_tree_state(self) -> tuple[set[str], tuple[str, str] | None]:
-        tree = self.query_one(Tree)
-        expanded_dirs: set[str] = {"."}
-        stack = [tree.root]
-        while stack:
-            node = stack.pop()
-            data = getattr(node, "data", None)
-            if data and str(data[0]) == "dir" and node.is_expanded:
-                expanded_dirs.add(str(data[1]))
-            for child in reversed(getattr(node, "children", ())):
-                stack.append(child)
+        # The expand/collapse handlers keep _expanded_dir_relpaths current,
+        # so there is no need to walk the tree for is_expanded flags.
+        tree = self._tree_widget
+        expanded_dirs = set(self._expanded_dir_relpaths)
+        expanded_dirs.add(".")
 
         selected: tuple[str, str] | None = None
         cursor_data = getattr(tree.cursor_node, "data", None)
@@ -349,44 +448,35 @@ class ReviewApp(ReviewActionsMixin, App[None]):
     def _restore_tree_state(
         self, expanded_dirs: set[str], selected: tuple[str, str] | None
     ) -> None:
-        tree = self.query_one(Tree)
+        tree = self._tree_widget
         restored_expanded: set[str] = {"."}
 
-        def expand_dir_node(node) -> None:
-            data = getattr(node, "data", None)
-            if not data or str(data[0]) != "dir":
-                return
-            relpath = str(data[1])
-            if relpath != "." and relpath not in expanded_dirs:
-                return
+        # Only the remembered folders are visited, parents before children;
+        # _populate_node indexes every node it adds, so reaching a folder is a
+        # dict get. Folders whose parent is gone or collapsed are skipped.
+        nodes_by_data = self._nodes_by_data
+        for relpath in sorted(expanded_dirs, key=lambda key: key.count("/")):
+            if relpath == ".":
+                continue
+            node = nodes_by_data.get(("dir", relpath))
             entry = self.dirs_by_relpath.get(relpath)
-            if entry is None:
-                return
-            self._populate_node(node, entry)
+            if node is None or entry is None:
+                continue
+            parent = node.parent
+            if parent is None or not parent.is_expanded:
+                continue
+            if not node.children:
+                self._populate_node(node, entry)
             node.expand()
             restored_expanded.add(relpath)
-            for child in getattr(node, "children", ()):
-                expand_dir_node(child)
-
-        def find_node_by_data(node, target: tuple[str, str]):
-            data = getattr(node, "data", None)
-            if data and str(data[0]) == target[0] and str(data[1]) == target[1]:
-                return node
-            for child in getattr(node, "children", ()):
-                found = find_node_by_data(child, target)
-                if found is not None:
-                    return found
-            return None
 
-        expand_dir_node(tree.root)
         selected_node = None
         candidate = selected
         while candidate is not None and selected_node is None:
-            selected_node = find_node_by_data(tree.root, candidate)
+            selected_node = nodes_by_data.get(candidate)
             if selected_node is not None or candidate == ("dir", "."):
                 break
-            parent = PurePosixPath(candidate[1]).parent.as_posix()
-            candidate = ("dir", parent if parent not in {"", "."} else ".")
+            candidate = ("dir", posixpath.dirname(candidate[1]) or ".")
         if selected_node is None:
             selected_node = tree.root
         tree.select_node(selected_node)
@@ -400,7 +490,15 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         diff = self.diffs_by_relpath.get(relpath)
         if diff is None:
             return []
-        return [op.kind for op in build_plan_operations([diff], {relpath: action})]
+        # DiffRecords are frozen and replaced whenever a path changes, so a
+        # cached answer is valid as long as it was computed for this object.
+        key = (relpath, action)
+        cached = self._ops_cache.get(key)
+        if cached is not None and cached[0] is diff:
+            return list(cached[1])
+        kinds = [op.kind for op in iter_plan_operations((diff,), {relpath: action})]
+        self._ops_cache[key] = (diff, kinds)
+        return list(kinds)
 
     def _effective_action(self, relpath: str) -> str:
         return self.action_overrides.get(relpath, ACTION_IGNORE)
@@ -440,12 +538,13 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         self.refresh_bindings()
 
     def _current_selection(self) -> tuple[str, str] | None:
-        tree = self.query_one(Tree)
+        tree = self._tree_widget
         node = tree.cursor_node
         data = getattr(node, "data", None)
         if not data:
             return None
-        return str(data[0]), str(data[1])
+        # Node data is always built as a (kind, relpath) tuple of strings.
+        return data
 
     def _selected_target_files(self) -> list[str]:
         selected = self._current_selection()
@@ -470,13 +569,18 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         prefix = f"{scope_relpath.rstrip('/')}/"
         return relpath == scope_relpath or relpath.startswith(prefix)
 
-    def _scan_subtree_records(
+    async def _scan_subtree_records(
         self, scope_relpath: str, scope_is_dir: bool
     ) -> tuple[dict[str, FileRecord], dict[str, FileRecord]]:
         subtree = PurePosixPath(scope_relpath)
-        source_records = self._scan_endpoint_records(self.source_endpoint, subtree)
-        destination_records = self._scan_endpoint_records(
-            self.destination_endpoint, subtree
+        # Both sides are scanned at once, in threads, off the UI loop.
+        source_records, destination_records = await asyncio.gather(
+            asyncio.to_thread(
+                self._scan_endpoint_records, self.source_endpoint, subtree
+            ),
+            asyncio.to_thread(
+                self._scan_endpoint_records, self.destination_endpoint, subtree
+            ),
         )
 
         scoped_source = {
@@ -491,24 +595,63 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         }
         return scoped_source, scoped_destination
 
+    def _scope_relpaths(self, scope_relpath: str, scope_is_dir: bool) -> set[str]:
+        """Known diff relpaths matching `_scope_match` for this scope."""
+        if scope_relpath == ".":
+            return set(self.diffs_by_relpath)
+        if not scope_is_dir:
+            return {scope_relpath} & self.diffs_by_relpath.keys()
+        # dir_files_map already lists every file below a folder, so there is
+        # no need to prefix-test all the diffs.
+        scoped = set(self.dir_files_map.get(scope_relpath.rstrip("/"), ()))
+        scoped.add(scope_relpath)
+        return scoped & self.diffs_by_relpath.keys()
+
+    def _sync_dir_files_map(self, removed: set[str], added: set[str]) -> None:
+        stale_dirs: set[str] = set()
+        for relpath in removed:
+            stale_dirs.update(_ancestor_dir_keys(relpath))
+        for dir_key in stale_dirs:
+            files = self.dir_files_map.get(dir_key)
+            if files is not None:
+                files[:] = [path for path in files if path not in removed]
+        for relpath in sorted(added):
+            for dir_key in _ancestor_dir_keys(relpath):
+                self.dir_files_map.setdefault(dir_key, []).append(relpath)
+
     def _replace_scope_with_diffs(
         self, scope_relpath: str, scope_is_dir: bool, scoped_diffs: list[DiffRecord]
     ) -> None:
         new_diffs_by_relpath = {diff.relpath: diff for diff in scoped_diffs}
-        for relpath in list(self.diffs_by_relpath):
-            if self._scope_match(relpath, scope_relpath, scope_is_dir):
-                self.diffs_by_relpath.pop(relpath, None)
+        previous = self._scope_relpaths(scope_relpath, scope_is_dir)
+        for relpath in previous:
+            self.diffs_by_relpath.pop(relpath, None)
         self.diffs_by_relpath.update(new_diffs_by_relpath)
-        self.diffs = [
-            self.diffs_by_relpath[key] for key in sorted(self.diffs_by_relpath)
-        ]
+        self._sync_dir_files_map(
+            previous - new_diffs_by_relpath.keys(),
+            new_diffs_by_relpath.keys() - previous,
+        )
+        # self.diffs is kept sorted by relpath: merge the sorted scope back in
+        # instead of re-sorting every known diff.
+        self.diffs = list(
+            heapq.merge(
+                (diff for diff in self.diffs if diff.relpath not in previous),
+                sorted(new_diffs_by_relpath.values(), key=_diff_relpath),
+                key=_diff_relpath,
+            )
+        )
         replace_diffs_in_scope(
             self.db_path,
             scoped_diffs,
             scope_relpath=scope_relpath,
             scope_is_dir=scope_is_dir,
         )
-        self.action_overrides = load_action_overrides(self.db_path)
+        # replace_diffs_in_scope clears every stored action in the scope, so
+        # the in-memory overrides only need the scope's diffs dropped instead
+        # of reloading all of them. Actions for paths that are not diffs do
+        # not reach the plan and come back in sync on the next full load.
+        for relpath in previous | new_diffs_by_relpath.keys():
+            self.action_overrides.pop(relpath, None)
 
     def _set_info_for_dir(self, entry: DirEntry) -> None:
         c = self.display_counts_by_dir.get(entry.relpath, entry.counts)
@@ -537,7 +680,7 @@ class ReviewApp(ReviewActionsMixin, App[None]):
             f"Filters shown: {len(self.enabled_view_filters)}/{len(ALL_VIEW_FILTERS)}",
             "Actions: ?=commands l=left wins r=right wins i=ignore s=suggested",
         ]
-        self.query_one("#info", Static).update("\n".join(lines))
+        self._info_panel.update("\n".join(lines))
 
     def _set_info_for_file(self, entry: FileEntry) -> None:
         suggested_ops = self._operations_for_entry(entry.relpath, ACTION_SUGGESTED)
@@ -579,7 +722,7 @@ class ReviewApp(ReviewActionsMixin, App[None]):
                 "Actions: ?=commands l=left wins r=right wins i=ignore s=suggested",
             ]
         )
-        self.query_one("#info", Static).update("\n".join(lines))
+        self._info_panel.update("\n".join(lines))
 
     def _selected_file_relpath(self) -> str | None:
         selected = self._current_selection()
@@ -593,9 +736,9 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         return relpath
 
     def _open_with_default_app(self, file_path: Path) -> None:
-        if platform.system() == "Darwin":
+        if _SYSTEM == "Darwin":
             cmd = ["open", str(file_path)]
-        elif platform.system() == "Windows":
+        elif _SYSTEM == "Windows":
             cmd = ["cmd", "/c", "start", "", str(file_path)]
         else:
             cmd = ["xdg-open", str(file_path)]
@@ -639,10 +782,16 @@ class ReviewApp(ReviewActionsMixin, App[None]):
             )
         ).scan(subtree=subtree)
 
-    def _download_endpoint_file(self, endpoint: EndpointSpec, relpath: str) -> Path:
+    def _open_temp_root(self) -> Path:
         if self._open_temp_dir is None:
             self._open_temp_dir = Path(tempfile.mkdtemp(prefix="limsync-open-"))
-        target = self._open_temp_dir / relpath
+        return self._open_temp_dir
+
+    def _download_endpoint_file(
+        self, endpoint: EndpointSpec, relpath: str, side: str
+    ) -> Path:
+        # Each side gets its own copy: a diff needs both files at once.
+        target = self._open_temp_root() / side / relpath
         target.parent.mkdir(parents=True, exist_ok=True)
 
         if endpoint.is_local:
@@ -663,37 +812,25 @@ class ReviewApp(ReviewActionsMixin, App[None]):
             host=str(endpoint.host),
             user=endpoint.user,
             port=endpoint.port,
-            compress=self.apply_settings.ssh_compression,
+            compress=self.apply_settings.transport_compression,
             timeout=10,
         ) as client:
-            sftp = client.open_sftp()
-            try:
-                # Expand ~ on remote shell, then resolve via SFTP.
-                quoted = endpoint.root.replace("'", "'\\''")
-                _stdin, stdout, _stderr = client.exec_command(
-                    f"python3 -c \"import os; print(os.path.expanduser('{quoted}'))\""
-                )
-                expanded = (
-                    stdout.read().decode("utf-8", errors="replace").strip()
-                    or endpoint.root
+            sftp = self._endpoint_sftp(endpoint, client)
+            remote_root_abs = self._remote_root_abs(endpoint, client, sftp)
+
+            last_error: Exception | None = None
+            for rel_candidate in self._candidate_relpaths(relpath):
+                remote_path = str(
+                    PurePosixPath(remote_root_abs) / PurePosixPath(rel_candidate)
                 )
-                remote_root_abs = sftp.normalize(expanded)
-
-                last_error: Exception | None = None
-                for rel_candidate in self._candidate_relpaths(relpath):
-                    remote_path = str(
-                        PurePosixPath(remote_root_abs) / PurePosixPath(rel_candidate)
-                    )
-                    try:
-                        sftp.get(remote_path, str(target))
-                        return target
-                    except Exception as exc:  # noqa: BLE001
-                        last_error = exc
-                        continue
-                if last_error is not None:
-                    raise last_error
-            finally:
-                sftp.close()
+                try:
+                    sftp.get(remote_path, str(target))
+                    return target
+                except Exception as exc:  # noqa: BLE001
+                    last_error = exc
+                    continue
+            if last_error is not None:
+                raise last_error
         return target
 
     def _has_left_copy(self, relpath: str) -> bool:
@@ -707,12 +844,14 @@ class ReviewApp(ReviewActionsMixin, App[None]):
     def _open_file_side(self, relpath: str, side: str) -> None:
         try:
             if side == "left":
-                downloaded = self._download_endpoint_file(self.source_endpoint, relpath)
+                downloaded = self._download_endpoint_file(
+                    self.source_endpoint, relpath, "left"
+                )
                 self._open_with_default_app(downloaded)
                 self._notify_message(f"Opened left file: {relpath}")
             else:
                 downloaded = self._download_endpoint_file(
-                    self.destination_endpoint, relpath
+                    self.destination_endpoint, relpath, "right"
                 )
                 self._open_with_default_app(downloaded)
                 self._notify_message(f"Opened right file: {relpath}")
@@ -725,13 +864,74 @@ class ReviewApp(ReviewActionsMixin, App[None]):
             return
         self._open_file_side(relpath, side)
 
+    def _plan_operations(self) -> list[PlanOperation]:
+        # Panel refreshes, apply and plan view all ask for the plan after
+        # most key presses; rebuild it only when the diffs list was replaced
+        # or the overrides changed since the last call.
+        cached = self._plan_ops_cache
+        if (
+            cached is not None
+            and cached[0] is self.diffs
+            and cached[1] == self.action_overrides
+        ):
+            return list(cached[2])
+        plan_ops = build_plan_operations(self.diffs, self.action_overrides)
+        self._plan_ops_cache = (self.diffs, dict(self.action_overrides), plan_ops)
+        return list(plan_ops)
+
+    def _plan_summary(self) -> PlanSummary:
+        cached = self._plan_counts
+        if (
+            cached is None
+            or cached[0] is not self.diffs
+            or cached[1] != self.action_overrides
+        ):
+            counts = Counter(op.kind for op in self._plan_operations())
+            cached = (self.diffs, dict(self.action_overrides), counts)
+            self._plan_counts = cached
+        counts = cached[2]
+        return PlanSummary(**{kind: counts[kind] for kind in OPERATION_KINDS})
+
+    def _adjust_plan_counts(self, updates: dict[str, str]) -> None:
+        """Move the cached plan counts to the overrides about to be applied.
+
+        Each path contributes its own operations to the plan, so changing a
+        few actions only swaps those paths' operations in the counts.
+        """
+        cached = self._plan_counts
+        if (
+            cached is None
+            or cached[0] is not self.diffs
+            or cached[1] != self.action_overrides
+        ):
+            return
+        _, overrides, counts = cached
+        for relpath, action in updates.items():
+            counts.subtract(
+                self._operations_for_entry(relpath, self._effective_action(relpath))
+            )
+            counts.update(self._operations_for_entry(relpath, action))
+            overrides[relpath] = action
+
+    def _schedule_plan_panel_update(self) -> None:
+        # Holding an arrow key highlights many nodes per second; only the
+        # node the cursor settles on needs the plan panel redrawn.
+        if self._plan_panel_timer is not None:
+            self._plan_panel_timer.stop()
+        self._plan_panel_timer = self.set_timer(
+            PLAN_PANEL_DEBOUNCE_SECONDS, self._run_scheduled_plan_panel_update
+        )
+
+    def _run_scheduled_plan_panel_update(self) -> None:
+        self._plan_panel_timer = None
+        self._update_plan_panel()
+
     def _update_plan_panel(self, *, plan_ops_override: list | None = None) -> None:
-        plan_ops = (
-            plan_ops_override
+        summary = (
+            summarize_operations(plan_ops_override)
             if plan_ops_override is not None
-            else build_plan_operations(self.diffs, self.action_overrides)
+            else self._plan_summary()
         )
-        summary = summarize_operations(plan_ops)
         new_can_apply = summary.total > 0
         if new_can_apply != self.can_apply:
             self.can_apply = new_can_apply
@@ -758,7 +958,7 @@ class ReviewApp(ReviewActionsMixin, App[None]):
         if self.status_message:
             lines.extend(["", f"Status: {self.status_message}"])
 
-        self.query_one("#plan", Static).update("\n".join(lines))
+        self._plan_panel.update("\n".join(lines))
 
     def _apply_action(self, action: str) -> None:
         updates: dict[str, str] = {}
@@ -772,10 +972,12 @@ class ReviewApp(ReviewActionsMixin, App[None]):
 
         self.confirm_apply_pending = False
         self.status_message = ""
+        self._adjust_plan_counts(updates)
         self.action_overrides.update(updates)
         upsert_action_overrides(self.db_path, updates)
-        self._rebuild_tree()
-        self._update_plan_panel()
+        with self.batch_update():
+            self._relabel_for_override_changes(updates)
+            self._update_plan_panel()
 
         selected = self._current_selection()
         if selected is None:
@@ -792,6 +994,7 @@ class ReviewApp(ReviewActionsMixin, App[None]):
 
         override_updates: dict[str, str] = {}
         touched_paths: set[str] = set()
+        dir_deltas: dict[str, FolderCounts] = {}
         for relpath in completed_paths:
             file_entry = self.files_by_relpath.get(relpath)
             if file_entry is None:
@@ -824,39 +1027,24 @@ class ReviewApp(ReviewActionsMixin, App[None]):
             self.action_overrides.pop(relpath, None)
             override_updates[relpath] = ACTION_IGNORE
 
-            path = PurePosixPath(relpath)
-            dir_keys = ["."]
-            current = PurePosixPath(".")
-            for part in path.parts[:-1]:
-                current = (
-                    PurePosixPath(part)
-                    if current == PurePosixPath(".")
-                    else current / part
-                )
-                dir_keys.append(current.as_posix())
-
-            for dir_key in dir_keys:
-                dir_entry = self.dirs_by_relpath.get(dir_key)
-                if dir_entry is None:
-                    continue
-                counts = dir_entry.counts
-                counts.only_left += new_counts.only_left - old_counts.only_left
-                counts.only_right += new_counts.only_right - old_counts.only_right
-                counts.identical += new_counts.identical - old_counts.identical
-                counts.metadata_only += (
-                    new_counts.metadata_only - old_counts.metadata_only
-                )
-                counts.different += new_counts.different - old_counts.different
-                counts.uncertain += new_counts.uncertain - old_counts.uncertain
-                keys = set(old_counts.metadata_fields) | set(new_counts.metadata_fields)
-                for key in keys:
-                    before = old_counts.metadata_fields.get(key, 0)
-                    after = new_counts.metadata_fields.get(key, 0)
-                    counts.metadata_fields[key] = counts.metadata_fields.get(key, 0) + (
-                        after - before
-                    )
-                    if counts.metadata_fields.get(key) == 0:
-                        counts.metadata_fields.pop(key, None)
+            # Sum the per-file deltas per folder first so that every folder's
+            # counts are touched once, however many of its files completed.
+            delta = _counts_delta(old_counts, new_counts)
+            for dir_key in _ancestor_dir_keys(relpath):
+                dir_delta = dir_deltas.get(dir_key)
+                if dir_delta is None:
+                    dir_deltas[dir_key] = dir_delta = FolderCounts()
+                _apply_counts(dir_delta, delta)
+
+        for dir_key, dir_delta in dir_deltas.items():
+            dir_entry = self.dirs_by_relpath.get(dir_key)
+            if dir_entry is None:
+                continue
+            counts = dir_entry.counts
+            _apply_counts(counts, dir_delta)
+            for key in dir_delta.metadata_fields:
+                if counts.metadata_fields.get(key) == 0:
+                    counts.metadata_fields.pop(key, None)
 
         mark_paths_identical(self.db_path, touched_paths)
         if override_updates:
@@ -889,9 +1077,10 @@ class ReviewApp(ReviewActionsMixin, App[None]):
             return
         relpath = op.relpath
         kind = op.kind
-        self._apply_done_ops.setdefault(relpath, set()).add(kind)
-        required = self._apply_required_ops.get(relpath, set())
-        if required and required.issubset(self._apply_done_ops.get(relpath, set())):
+        done_ops = self._apply_done_ops[relpath]
+        done_ops.add(kind)
+        required = self._apply_required_ops.get(relpath)
+        if required and required <= done_ops:
             self._apply_newly_completed.add(relpath)
 
         should_flush = len(self._apply_newly_completed) >= 20 or done == total
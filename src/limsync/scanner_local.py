@@ -6,7 +6,8 @@ import time
 from collections.abc import Callable
 from pathlib import Path, PurePosixPath
 
-from .excludes import IgnoreRules, is_excluded_file_name, is_excluded_folder_name
+from .config import EXCLUDED_FILE_NAMES, EXCLUDED_FOLDERS
+from .excludes import IgnoreRules
 from .models import FileRecord, NodeType
 from .symlink_utils import symlink_target_compare_key
 from .text_utils import normalize_text
@@ -45,11 +46,31 @@ class LocalScanner:
         if start_root is None:
             return records
 
-        for current_dir, dirs, files in os.walk(start_root, topdown=True):
-            current_path = Path(current_dir)
-            rel_dir = PurePosixPath(".")
-            if current_path != self.root:
-                rel_dir = PurePosixPath(current_path.relative_to(self.root).as_posix())
+        # Top-down walk over os.scandir, like the remote helper's: files are
+        # stat'ed through their DirEntry (cached, and free where the listing
+        # carries stat data) instead of a separate lstat on a joined path.
+        # Directories keep os.walk's semantics: unreadable ones are skipped and
+        # symlinked ones are neither descended into nor reported as files.
+        root_text = str(self.root)
+        root_prefix_len = len(root_text.rstrip(os.sep)) + 1
+        start_text = str(start_root)
+        stack = [
+            (
+                start_text,
+                "."
+                if start_text == root_text
+                else start_text[root_prefix_len:].replace(os.sep, "/"),
+            )
+        ]
+        while stack:
+            current_dir, rel_text = stack.pop()
+            try:
+                with os.scandir(current_dir) as scan_it:
+                    entries = list(scan_it)
+            except OSError:
+                continue
+            rel_dir = PurePosixPath(rel_text)
+            child_prefix = "" if rel_text == "." else f"{rel_text}/"
             dirs_scanned += 1
 
             now = time.monotonic()
@@ -58,44 +79,54 @@ class LocalScanner:
                 last_progress = now
 
             rules.load_if_exists(self.root, rel_dir)
+            rules_active = rules.has_rules
+
+            dir_entries: list[os.DirEntry[str]] = []
+            file_entries: list[os.DirEntry[str]] = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if entry.name not in EXCLUDED_FOLDERS:
+                        dir_entries.append(entry)
+                elif entry.name not in EXCLUDED_FILE_NAMES:
+                    file_entries.append(entry)
+            if rules_active:
+                dir_entries = [
+                    entry
+                    for entry, ignored in zip(
+                        dir_entries,
+                        rules.filter_children(
+                            rel_text, [entry.name for entry in dir_entries], True
+                        ),
+                    )
+                    if not ignored
+                ]
+                file_entries = [
+                    entry
+                    for entry, ignored in zip(
+                        file_entries,
+                        rules.filter_children(
+                            rel_text, [entry.name for entry in file_entries], False
+                        ),
+                    )
+                    if not ignored
+                ]
 
-            kept_dirs: list[str] = []
-            for dir_name in dirs:
-                if is_excluded_folder_name(dir_name):
-                    continue
-                child_rel = (
-                    PurePosixPath(dir_name)
-                    if rel_dir == PurePosixPath(".")
-                    else rel_dir / dir_name
-                )
-                if rules.is_ignored(child_rel, is_dir=True):
-                    continue
-                kept_dirs.append(dir_name)
-            dirs[:] = kept_dirs
-
-            for filename in files:
-                if is_excluded_file_name(filename):
-                    continue
-                child_rel = (
-                    PurePosixPath(filename)
-                    if rel_dir == PurePosixPath(".")
-                    else rel_dir / filename
-                )
-                full_path = self.root / child_rel.as_posix()
-                if rules.is_ignored(child_rel, is_dir=False):
-                    continue
-
-                st = full_path.lstat()
+            for entry in file_entries:
+                st = entry.stat(follow_symlinks=False)
                 node_type = _node_type(st.st_mode)
                 if node_type == NodeType.DIR:
                     continue
                 files_seen += 1
 
-                relpath = normalize_text(child_rel.as_posix())
+                relpath = normalize_text(child_prefix + entry.name)
                 link_target = None
                 link_target_key = None
                 if node_type == NodeType.SYMLINK:
-                    link_target = normalize_text(os.readlink(full_path))
+                    link_target = normalize_text(os.readlink(entry.path))
                     link_target_key = symlink_target_compare_key(
                         relpath=relpath,
                         target=link_target,
@@ -114,6 +145,10 @@ class LocalScanner:
                     group=None,
                 )
 
+            for entry in reversed(dir_entries):
+                if not entry.is_symlink():
+                    stack.append((entry.path, child_prefix + entry.name))
+
         if progress_cb is not None:
             progress_cb(PurePosixPath("."), dirs_scanned, files_seen)
 
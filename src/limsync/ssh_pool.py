@@ -18,8 +18,14 @@ class _PoolEntry:
     refcount: int = 0
 
 
+# paramiko already pipelines SFTP reads/writes; a 4 MiB channel window (2 MiB by
+# default) keeps more of those requests in flight on high-latency links.
+SFTP_WINDOW_SIZE = 4 * 1024 * 1024
+SFTP_MAX_PACKET_SIZE = 32 * 1024
+
 _POOL_LOCK = threading.Lock()
 _POOL: dict[tuple[object, ...], _PoolEntry] = {}
+_CONNECTION_OPTIONS: dict[tuple[str, str | None, int | None], SSHConnectionOptions] = {}
 
 
 @dataclass(frozen=True)
@@ -31,12 +37,12 @@ class SSHConnectionOptions:
     proxy_command: str | None = None
 
 
-def resolve_ssh_connection_options(
+def _ssh_effective_config(
     host: str,
     user: str | None,
     port: int | None,
-) -> SSHConnectionOptions:
-    """Resolve an SSH alias using the same config rules as the OpenSSH client."""
+) -> dict[str, list[str]] | None:
+    """`ssh -G` output as lowercase key -> values; None if ssh failed."""
     command = ["ssh", "-G"]
     if user is not None:
         command.extend(["-l", user])
@@ -44,7 +50,6 @@ def resolve_ssh_connection_options(
         command.extend(["-p", str(port)])
     command.append(host)
 
-    values: dict[str, list[str]] = {}
     try:
         result = subprocess.run(
             command,
@@ -54,14 +59,24 @@ def resolve_ssh_connection_options(
             timeout=5,
         )
     except (OSError, subprocess.TimeoutExpired):
-        result = None
+        return None
+    if result.returncode != 0:
+        return None
+
+    values: dict[str, list[str]] = {}
+    for line in result.stdout.splitlines():
+        key, separator, value = line.partition(" ")
+        if separator and value:
+            values.setdefault(key.lower(), []).append(value.strip())
+    return values
 
-    if result is not None and result.returncode == 0:
-        for line in result.stdout.splitlines():
-            key, separator, value = line.partition(" ")
-            if separator and value:
-                values.setdefault(key.lower(), []).append(value.strip())
 
+def _connection_options_from_config(
+    host: str,
+    user: str | None,
+    port: int | None,
+    values: dict[str, list[str]],
+) -> SSHConnectionOptions:
     resolved_host = values.get("hostname", [host])[0]
     resolved_user = values.get("user", [user])[0]
     resolved_port_text = values.get("port", [str(port or 22)])[0]
@@ -88,6 +103,34 @@ def resolve_ssh_connection_options(
     )
 
 
+def resolve_ssh_connection_options(
+    host: str,
+    user: str | None,
+    port: int | None,
+) -> SSHConnectionOptions:
+    """Resolve an SSH alias using the same config rules as the OpenSSH client."""
+    values = _ssh_effective_config(host, user, port)
+    return _connection_options_from_config(host, user, port, values or {})
+
+
+def _cached_connection_options(
+    host: str, user: str | None, port: int | None
+) -> SSHConnectionOptions:
+    # Every pooled_ssh_client() call needs the options to find its pool key;
+    # resolving them runs `ssh -G`, so do that once per host per process.
+    # A failed or timed-out `ssh -G` falls back to the raw arguments for this
+    # call only and is retried next time.
+    key = (host, user, port)
+    options = _CONNECTION_OPTIONS.get(key)
+    if options is not None:
+        return options
+    values = _ssh_effective_config(host, user, port)
+    options = _connection_options_from_config(host, user, port, values or {})
+    if values is not None:
+        _CONNECTION_OPTIONS[key] = options
+    return options
+
+
 def _client_alive(client: Any) -> bool:
     get_transport = getattr(client, "get_transport", None)
     if get_transport is None:
@@ -125,7 +168,7 @@ def pooled_ssh_client(
     client_factory: Callable[[], Any] = paramiko.SSHClient,
     auto_add_policy_factory: Callable[[], Any] = paramiko.AutoAddPolicy,
 ) -> Iterator[Any]:
-    options = resolve_ssh_connection_options(host, user, port)
+    options = _cached_connection_options(host, user, port)
     key = (
         options.hostname,
         options.username,
@@ -176,10 +219,23 @@ def pooled_ssh_client(
                 cached.refcount = max(0, cached.refcount - 1)
 
 
+def open_sftp(client: Any) -> Any:
+    get_transport = getattr(client, "get_transport", None)
+    transport = get_transport() if get_transport is not None else None
+    if transport is None:
+        return client.open_sftp()
+    return paramiko.SFTPClient.from_transport(
+        transport,
+        window_size=SFTP_WINDOW_SIZE,
+        max_packet_size=SFTP_MAX_PACKET_SIZE,
+    )
+
+
 def close_ssh_pool() -> None:
     with _POOL_LOCK:
         items = list(_POOL.items())
         _POOL.clear()
+    _CONNECTION_OPTIONS.clear()
     for _key, entry in items:
         _close_client_quietly(entry.client)
 
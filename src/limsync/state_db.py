@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
 import tomllib
 from dataclasses import dataclass
@@ -116,7 +117,43 @@ def _migrate_db(
     _ = target_version
 
 
-def _init_schema(conn: sqlite3.Connection) -> None:
+_STAT_SNAPSHOT_COLUMNS = {
+    "left_mode": "INTEGER",
+    "right_mode": "INTEGER",
+    "left_mtime_ns": "INTEGER",
+    "right_mtime_ns": "INTEGER",
+}
+
+
+def _ensure_columns(
+    conn: sqlite3.Connection, table: str, columns: dict[str, str]
+) -> None:
+    existing = {
+        str(row["name"]) for row in conn.execute(f'PRAGMA table_info("{table}")')
+    }
+    for name, decl in columns.items():
+        if name not in existing:
+            conn.execute(f'ALTER TABLE "{table}" ADD COLUMN {name} {decl}')
+
+
+# (path, device, inode) of state DBs whose schema this process already set
+# up; the TUI writes after most key presses and the DDL below is not free.
+_SCHEMA_READY: set[tuple[str, int, int]] = set()
+
+
+def _schema_key(db_path: Path) -> tuple[str, int, int] | None:
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    if st.st_size == 0:
+        return None
+    return (str(db_path), st.st_dev, st.st_ino)
+
+
+def _init_schema(conn: sqlite3.Connection, db_path: Path) -> None:
+    if _schema_key(db_path) in _SCHEMA_READY:
+        return
     conn.execute("PRAGMA journal_mode=WAL")
     _migrate_db(conn, _read_db_version(conn), _project_version())
 
@@ -153,10 +190,15 @@ def _init_schema(conn: sqlite3.Connection) -> None:
             metadata_detail_json TEXT NOT NULL DEFAULT '[]',
             metadata_source TEXT,
             left_size INTEGER,
-            right_size INTEGER
+            right_size INTEGER,
+            left_mode INTEGER,
+            right_mode INTEGER,
+            left_mtime_ns INTEGER,
+            right_mtime_ns INTEGER
         )
         """
     )
+    _ensure_columns(conn, "current_diffs", _STAT_SNAPSHOT_COLUMNS)
 
     conn.execute(
         """
@@ -184,6 +226,9 @@ def _init_schema(conn: sqlite3.Connection) -> None:
         """
     )
     conn.commit()
+    key = _schema_key(db_path)
+    if key is not None:
+        _SCHEMA_READY.add(key)
 
 
 def save_current_state(
@@ -193,7 +238,7 @@ def save_current_state(
 ) -> None:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         with conn:
             conn.execute(
                 """
@@ -261,8 +306,12 @@ def save_current_state(
                     metadata_detail_json,
                     metadata_source,
                     left_size,
-                    right_size
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    right_size,
+                    left_mode,
+                    right_mode,
+                    left_mtime_ns,
+                    right_mtime_ns
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(relpath) DO UPDATE SET
                     content_state = excluded.content_state,
                     metadata_state = excluded.metadata_state,
@@ -270,7 +319,11 @@ def save_current_state(
                     metadata_detail_json = excluded.metadata_detail_json,
                     metadata_source = excluded.metadata_source,
                     left_size = excluded.left_size,
-                    right_size = excluded.right_size
+                    right_size = excluded.right_size,
+                    left_mode = excluded.left_mode,
+                    right_mode = excluded.right_mode,
+                    left_mtime_ns = excluded.left_mtime_ns,
+                    right_mtime_ns = excluded.right_mtime_ns
                 """,
                 [
                     (
@@ -284,6 +337,10 @@ def save_current_state(
                         else None,
                         diff.left_size,
                         diff.right_size,
+                        diff.left_mode,
+                        diff.right_mode,
+                        diff.left_mtime_ns,
+                        diff.right_mtime_ns,
                     )
                     for diff in diffs
                 ],
@@ -306,7 +363,7 @@ def save_current_state(
 def get_state_context(db_path: Path) -> StateContext | None:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         row = conn.execute(
             """
             SELECT source_endpoint, destination_endpoint
@@ -327,10 +384,11 @@ def get_state_context(db_path: Path) -> StateContext | None:
 def load_current_diffs(db_path: Path) -> list[dict[str, object]]:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         rows = conn.execute(
             """
-            SELECT relpath, content_state, metadata_state, metadata_diff_json, metadata_detail_json, metadata_source, left_size, right_size
+            SELECT relpath, content_state, metadata_state, metadata_diff_json, metadata_detail_json, metadata_source, left_size, right_size,
+                   left_mode, right_mode, left_mtime_ns, right_mtime_ns
             FROM current_diffs
             ORDER BY relpath
             """
@@ -345,6 +403,10 @@ def load_current_diffs(db_path: Path) -> list[dict[str, object]]:
                 "metadata_source": row["metadata_source"],
                 "left_size": row["left_size"],
                 "right_size": row["right_size"],
+                "left_mode": row["left_mode"],
+                "right_mode": row["right_mode"],
+                "left_mtime_ns": row["left_mtime_ns"],
+                "right_mtime_ns": row["right_mtime_ns"],
             }
             for row in rows
         ]
@@ -355,7 +417,7 @@ def load_current_diffs(db_path: Path) -> list[dict[str, object]]:
 def get_ui_pref(db_path: Path, key: str, default: str) -> str:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         row = conn.execute(
             "SELECT value FROM ui_prefs WHERE key = ?",
             (key,),
@@ -370,7 +432,7 @@ def get_ui_pref(db_path: Path, key: str, default: str) -> str:
 def set_ui_pref(db_path: Path, key: str, value: str) -> None:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         with conn:
             conn.execute(
                 """
@@ -386,7 +448,7 @@ def set_ui_pref(db_path: Path, key: str, value: str) -> None:
 def load_action_overrides(db_path: Path) -> dict[str, str]:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         rows = conn.execute("SELECT relpath, action FROM scan_actions").fetchall()
         return {str(row["relpath"]): str(row["action"]) for row in rows}
     finally:
@@ -398,7 +460,7 @@ def upsert_action_overrides(db_path: Path, updates: dict[str, str]) -> None:
         return
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         with conn:
             conn.executemany(
                 """
@@ -422,7 +484,7 @@ def mark_paths_identical(db_path: Path, relpaths: set[str]) -> None:
         return
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         with conn:
             conn.executemany(
                 """
@@ -445,7 +507,7 @@ def delete_paths_from_current_state(db_path: Path, relpaths: set[str]) -> None:
         return
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         with conn:
             conn.executemany(
                 "DELETE FROM current_diffs WHERE relpath = ?",
@@ -462,7 +524,7 @@ def delete_paths_from_current_state(db_path: Path, relpaths: set[str]) -> None:
 def clear_action_overrides(db_path: Path) -> None:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         with conn:
             conn.execute("DELETE FROM scan_actions")
     finally:
@@ -478,7 +540,7 @@ def replace_diffs_in_scope(
 ) -> None:
     conn = _connect(db_path)
     try:
-        _init_schema(conn)
+        _init_schema(conn, db_path)
         with conn:
             if scope_is_dir:
                 scope_like = f"{normalize_text(scope_relpath).rstrip('/')}/%"
@@ -510,8 +572,12 @@ def replace_diffs_in_scope(
                     metadata_detail_json,
                     metadata_source,
                     left_size,
-                    right_size
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    right_size,
+                    left_mode,
+                    right_mode,
+                    left_mtime_ns,
+                    right_mtime_ns
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(relpath) DO UPDATE SET
                     content_state = excluded.content_state,
                     metadata_state = excluded.metadata_state,
@@ -519,7 +585,11 @@ def replace_diffs_in_scope(
                     metadata_detail_json = excluded.metadata_detail_json,
                     metadata_source = excluded.metadata_source,
                     left_size = excluded.left_size,
-                    right_size = excluded.right_size
+                    right_size = excluded.right_size,
+                    left_mode = excluded.left_mode,
+                    right_mode = excluded.right_mode,
+                    left_mtime_ns = excluded.left_mtime_ns,
+                    right_mtime_ns = excluded.right_mtime_ns
                 """,
                 [
                     (
@@ -533,6 +603,10 @@ def replace_diffs_in_scope(
                         else None,
                         diff.left_size,
                         diff.right_size,
+                        diff.left_mode,
+                        diff.right_mode,
+                        diff.left_mtime_ns,
+                        diff.right_mtime_ns,
                     )
                     for diff in diffs
                 ],
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from pathlib import PurePosixPath
+from operator import attrgetter
 
 from rich.text import Text
 
@@ -85,6 +85,22 @@ def _apply_counts(target: FolderCounts, increment: FolderCounts) -> None:
         target.metadata_fields[key] = target.metadata_fields.get(key, 0) + value
 
 
+def _counts_delta(before: FolderCounts, after: FolderCounts) -> FolderCounts:
+    fields = {
+        key: after.metadata_fields.get(key, 0) - before.metadata_fields.get(key, 0)
+        for key in before.metadata_fields.keys() | after.metadata_fields.keys()
+    }
+    return FolderCounts(
+        only_left=after.only_left - before.only_left,
+        only_right=after.only_right - before.only_right,
+        identical=after.identical - before.identical,
+        metadata_only=after.metadata_only - before.metadata_only,
+        different=after.different - before.different,
+        uncertain=after.uncertain - before.uncertain,
+        metadata_fields=fields,
+    )
+
+
 def _is_identical_folder(entry: DirEntry) -> bool:
     c = entry.counts
     return (
@@ -250,6 +266,10 @@ def _file_label(file_entry: FileEntry) -> Text:
     )
 
 
+def _optional_int(value: object) -> int | None:
+    return int(value) if value is not None else None
+
+
 def _row_to_diff(row: dict[str, object]) -> DiffRecord:
     return DiffRecord(
         relpath=str(row["relpath"]),
@@ -266,9 +286,23 @@ def _row_to_diff(row: dict[str, object]) -> DiffRecord:
         right_size=(
             int(row["right_size"]) if row.get("right_size") is not None else None
         ),
+        left_mode=_optional_int(row.get("left_mode")),
+        right_mode=_optional_int(row.get("right_mode")),
+        left_mtime_ns=_optional_int(row.get("left_mtime_ns")),
+        right_mtime_ns=_optional_int(row.get("right_mtime_ns")),
     )
 
 
+def _ancestor_dir_keys(relpath: str) -> list[str]:
+    """Keys of every folder containing `relpath`, root first."""
+    keys = ["."]
+    idx = relpath.find("/")
+    while idx != -1:
+        keys.append(relpath[:idx])
+        idx = relpath.find("/", idx + 1)
+    return keys
+
+
 def _build_model(
     rows: list[dict[str, object]],
     root_name: str,
@@ -288,30 +322,26 @@ def _build_model(
     for row in rows:
         relpath = str(row["relpath"])
         diffs_by_relpath[relpath] = _row_to_diff(row)
-        path = PurePosixPath(relpath)
-        parts = path.parts
+        # Same components PurePosixPath(relpath).parts yields, without
+        # building a path object per ancestor.
+        parts = [part for part in relpath.split("/") if part and part != "."]
         if not parts:
             continue
 
         current = root
-        current_rel = PurePosixPath(".")
+        current_key = "."
         lineage = [root]
         lineage_keys = ["."]
 
         for part in parts[:-1]:
-            next_rel = (
-                PurePosixPath(part)
-                if current_rel == PurePosixPath(".")
-                else current_rel / part
-            )
-            next_key = next_rel.as_posix()
+            next_key = part if current_key == "." else f"{current_key}/{part}"
             child = current.dirs.get(part)
             if child is None:
                 child = DirEntry(name=part, relpath=next_key)
                 current.dirs[part] = child
                 dirs_by_relpath[next_key] = child
             current = child
-            current_rel = next_rel
+            current_key = next_key
             lineage.append(current)
             lineage_keys.append(next_key)
             dir_files_map.setdefault(next_key, [])
@@ -339,4 +369,11 @@ def _build_model(
         for ancestor in lineage:
             _apply_counts(ancestor.counts, delta)
 
+    # The model is not mutated after loading, so children are put in display
+    # order once here instead of on every tree rebuild.
+    for entry in dirs_by_relpath.values():
+        if len(entry.dirs) > 1:
+            entry.dirs = dict(sorted(entry.dirs.items()))
+        entry.files.sort(key=attrgetter("name"))
+
     return root, dirs_by_relpath, files_by_relpath, dir_files_map, diffs_by_relpath
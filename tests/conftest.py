@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from pathlib import Path
+import io
+from dataclasses import dataclass, replace
 import pytest
+from paramiko.sftp import CMD_SETSTAT
 
 from limsync.models import (
     ContentState,
@@ -78,6 +79,29 @@ class RemoteStat:
     st_mode: int
     st_atime: float
     st_mtime: float
+    st_size: int = 0
+
+
+class FakeRemoteFile(io.BytesIO):
+    """An SFTPFile stand-in; written data lands in the fake on close."""
+
+    def __init__(self, sftp: FakeSFTPClient, path: str, data: bytes = b"", *, writable: bool = False) -> None:
+        super().__init__(data)
+        self._sftp = sftp
+        self._path = path
+        self._writable = writable
+        self.pipelined = False
+
+    def set_pipelined(self, pipelined: bool = True) -> None:
+        self.pipelined = pipelined
+
+    def prefetch(self, file_size: int | None = None) -> None:
+        self._sftp.calls.append(("prefetch", self._path, file_size))
+
+    def close(self) -> None:
+        if self._writable and not self.closed:
+            self._sftp._store_file(self._path, self.getvalue(), pipelined=self.pipelined)
+        super().close()
 
 
 class FakeSFTPClient:
@@ -104,7 +128,10 @@ class FakeSFTPClient:
         if path in self.remote_symlinks:
             return self.remote_stats.get(path, RemoteStat(st_mode=0o100644, st_atime=1.0, st_mtime=1.0))
         if path in self.remote_stats:
-            return self.remote_stats[path]
+            entry = self.remote_stats[path]
+            if path in self.remote_files:
+                return replace(entry, st_size=len(self.remote_files[path]))
+            return entry
         if path in self.existing_dirs:
             return RemoteStat(st_mode=0o040755, st_atime=1.0, st_mtime=1.0)
         raise OSError(f"no such file: {path}")
@@ -123,20 +150,20 @@ class FakeSFTPClient:
         self.calls.append(("mkdir", path))
         self.existing_dirs.add(path)
 
-    def put(self, local_path: str, remote_path: str, *, confirm: bool = True) -> None:
-        self._check_failure("put", remote_path)
-        self.calls.append(("put", local_path, remote_path, confirm))
-        data = Path(local_path).read_bytes()
-        self.remote_symlinks.pop(remote_path, None)
-        self.remote_files[remote_path] = data
-        self.remote_stats.setdefault(remote_path, self._default_file_stat())
-
-    def get(self, remote_path: str, local_path: str) -> None:
-        self._check_failure("get", remote_path)
-        self.calls.append(("get", remote_path, local_path))
-        if remote_path not in self.remote_files:
-            raise FileNotFoundError(f"remote missing: {remote_path}")
-        Path(local_path).write_bytes(self.remote_files[remote_path])
+    def open(self, path: str, mode: str = "r") -> FakeRemoteFile:
+        self._check_failure("open", path)
+        self.calls.append(("open", path, mode))
+        if "w" in mode:
+            return FakeRemoteFile(self, path, writable=True)
+        if path not in self.remote_files:
+            raise FileNotFoundError(f"remote missing: {path}")
+        return FakeRemoteFile(self, path, self.remote_files[path])
+
+    def _store_file(self, path: str, data: bytes, *, pipelined: bool) -> None:
+        self.calls.append(("write", path, pipelined))
+        self.remote_symlinks.pop(path, None)
+        self.remote_files[path] = data
+        self.remote_stats.setdefault(path, self._default_file_stat())
 
     def symlink(self, target_path: str, path: str) -> None:
         self._check_failure("symlink", path)
@@ -200,6 +227,21 @@ class FakeSFTPClient:
             st_mtime=float(times[1]),
         )
 
+    def _adjust_cwd(self, path: str) -> str:
+        return path
+
+    def _request(self, cmd: int, path: str, attrs) -> None:
+        if cmd != CMD_SETSTAT:
+            raise NotImplementedError(f"unsupported SFTP request: {cmd}")
+        self._check_failure("setstat", path)
+        self.calls.append(("setstat", path, attrs.st_mode, attrs.st_atime, attrs.st_mtime))
+        stat_entry = self.remote_stats.get(path, self._default_file_stat())
+        self.remote_stats[path] = RemoteStat(
+            st_mode=(stat_entry.st_mode & 0o170000) | attrs.st_mode,
+            st_atime=float(attrs.st_atime),
+            st_mtime=float(attrs.st_mtime),
+        )
+
     def close(self) -> None:
         self.calls.append(("close",))
 
@@ -96,3 +96,117 @@ def test_remote_and_local_ignore_rules_match_behavior() -> None:
         assert local.is_ignored(relpath, is_dir=is_dir) == remote.is_ignored(
             relpath, is_dir=is_dir
         )
+
+
+def test_compiled_patterns_keep_component_and_negation_semantics() -> None:
+    rules = IgnoreRules()
+    rules.add_spec(PurePosixPath("."), ["a*b", "docs/build", "/top.txt"])
+
+    assert rules.is_ignored(PurePosixPath("x/axxb"), is_dir=False)
+    assert not rules.is_ignored(PurePosixPath("z/a/x/b"), is_dir=False)
+    assert rules.is_ignored(PurePosixPath("src/docs/build"), is_dir=True)
+    assert rules.is_ignored(PurePosixPath("top.txt"), is_dir=False)
+    assert not rules.is_ignored(PurePosixPath("x/top.txt"), is_dir=False)
+
+    negated = IgnoreRules()
+    negated.add_spec(PurePosixPath("."), ["*.log", "!keep.log", "keep*"])
+    assert negated.is_ignored(PurePosixPath("a.log"), is_dir=False)
+    assert negated.is_ignored(PurePosixPath("keep.log"), is_dir=False)
+    negated.add_spec(PurePosixPath("."), ["*.log", "keep*", "!keep.log"])
+    assert not negated.is_ignored(PurePosixPath("keep.log"), is_dir=False)
+
+
+def test_bare_pattern_component_cache_is_bounded(monkeypatch) -> None:
+    from limsync import ignore_rules_shared
+
+    monkeypatch.setattr(ignore_rules_shared, "MATCH_CACHE_SIZE", 2)
+    rules = IgnoreRules()
+    rules.add_spec(PurePosixPath("."), ["cach?"])
+
+    assert rules.is_ignored(PurePosixPath("a/cache/x.txt"), is_dir=False)
+    assert not rules.is_ignored(PurePosixPath("b/c/d.txt"), is_dir=False)
+    assert len(rules._compiled["."]._bare_part_cache) == 2
+
+
+def test_rules_without_specs_never_ignore() -> None:
+    rules = IgnoreRules()
+    assert not rules.has_rules
+    assert not rules.is_ignored(PurePosixPath("a/b.tmp"), is_dir=False)
+
+    rules.add_spec(PurePosixPath("."), ["*.tmp"])
+    assert rules.has_rules
+    assert rules.is_ignored(PurePosixPath("a/b.tmp"), is_dir=False)
+
+
+def test_is_ignored_str_matches_path_variant() -> None:
+    rules = IgnoreRules()
+    rules.add_spec(PurePosixPath("."), ["/build", "*.log"])
+    rules.add_spec(PurePosixPath("src"), ["gen/", "!keep.log"])
+
+    for relpath, is_dir in [
+        ("build", True),
+        ("src/build", True),
+        ("src/gen", True),
+        ("src/gen/a.py", False),
+        ("src/keep.log", False),
+        ("src/other.log", False),
+        ("docs/x.log", False),
+        ("docs/x.txt", False),
+    ]:
+        assert rules.is_ignored_str(relpath, is_dir) == rules.is_ignored(
+            PurePosixPath(relpath), is_dir
+        )
+    assert rules.is_ignored_str("src/gen/a.py", is_dir=False)
+    assert not rules.is_ignored_str("src/keep.log", is_dir=False)
+
+
+def test_extension_and_literal_patterns_use_set_lookups() -> None:
+    rules = IgnoreRules()
+    rules.add_spec(PurePosixPath("."), ["*.pyc", "Thumbs.db", "a*b"])
+    scope = rules._compiled["."]
+    assert scope.bare_exts == {"pyc"}
+    assert scope.bare_literals == {"Thumbs.db"}
+
+    assert rules.is_ignored(PurePosixPath("pkg/mod.cpython-313.pyc"), is_dir=False)
+    assert rules.is_ignored(PurePosixPath(".pyc"), is_dir=False)
+    assert not rules.is_ignored(PurePosixPath("pkg/pyc"), is_dir=False)
+    assert rules.is_ignored(PurePosixPath("x/Thumbs.db/y.txt"), is_dir=False)
+    assert rules.is_ignored(PurePosixPath("a/x/b"), is_dir=False)
+
+
+def test_directory_components_checked_once_per_directory() -> None:
+    rules = IgnoreRules()
+    rules.add_spec(PurePosixPath("."), ["tmp*"])
+    scope = rules._compiled["."]
+    checked: list[list[str]] = []
+    original = scope.bare_part_matches
+
+    def recording(parts: list[str]) -> bool:
+        checked.append(parts)
+        return original(parts)
+
+    scope.bare_part_matches = recording
+    assert not rules.is_ignored_str("src/pkg/a.py", is_dir=False)
+    assert not rules.is_ignored_str("src/pkg/b.py", is_dir=False)
+    assert rules.is_ignored_str("src/pkg/tmpfile", is_dir=False)
+    assert rules.is_ignored_str("src/tmpdir/c.py", is_dir=False)
+
+    assert checked.count(["src", "pkg"]) == 1
+    assert ["src", "tmpdir"] in checked
+
+
+def test_filter_children_matches_per_path_checks() -> None:
+    rules = IgnoreRules()
+    rules.add_spec(PurePosixPath("."), ["*.log", "/build"])
+    rules.add_spec(PurePosixPath("src"), ["!keep.log", "gen"])
+    names = ["a.log", "keep.log", "gen", "build", "main.py"]
+
+    for dir_relpath in [".", "src", "src/pkg"]:
+        for is_dir in (False, True):
+            expected = [
+                rules.is_ignored_str(
+                    name if dir_relpath == "." else f"{dir_relpath}/{name}", is_dir
+                )
+                for name in names
+            ]
+            assert rules.filter_children(dir_relpath, names, is_dir) == expected
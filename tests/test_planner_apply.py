@@ -3,6 +3,7 @@ from __future__ import annotations
 import os
 import stat
 import threading
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
@@ -23,6 +24,7 @@ from limsync.planner_apply import (
     _remote_mtime_ns,
     build_plan_operations,
     execute_plan,
+    iter_plan_operations,
     parse_remote_address,
     summarize_operations,
 )
@@ -73,6 +75,39 @@ def test_infer_metadata_source_from_details_mode_then_mtime() -> None:
     )
     assert _infer_metadata_source_from_details(mtime_diff) == "left"
 
+    both_diff = replace(
+        mtime_diff,
+        metadata_details=(*mtime_diff.metadata_details, "mode: left=0x777 right=0x600"),
+    )
+    assert _infer_metadata_source_from_details(both_diff) == "right"
+
+
+def test_infer_metadata_source_prefers_structured_stat_fields() -> None:
+    diff = mk_diff(
+        "x",
+        content_state=ContentState.IDENTICAL,
+        metadata_state=MetadataState.DIFFERENT,
+        metadata_details=("mode: left=0x600 right=0x777",),
+    )
+    assert (
+        _infer_metadata_source_from_details(
+            replace(diff, left_mode=0o644, right_mode=0o640)
+        )
+        == "right"
+    )
+    assert (
+        _infer_metadata_source_from_details(
+            replace(
+                diff,
+                left_mode=0o644,
+                right_mode=0o644,
+                left_mtime_ns=5,
+                right_mtime_ns=9,
+            )
+        )
+        == "left"
+    )
+
 
 def test_build_plan_operations_default_ignore_no_ops() -> None:
     diffs = [mk_diff("a", content_state=ContentState.ONLY_LEFT)]
@@ -175,6 +210,20 @@ def test_build_plan_metadata_operation_carries_only_changed_fields() -> None:
     ]
 
 
+def test_iter_plan_operations_streams_and_skips_duplicates() -> None:
+    diffs = [
+        mk_diff("a", content_state=ContentState.ONLY_LEFT),
+        mk_diff("a", content_state=ContentState.ONLY_LEFT),
+        mk_diff("b", content_state=ContentState.ONLY_RIGHT),
+    ]
+    ops = iter_plan_operations(
+        iter(diffs), {"a": ACTION_SUGGESTED, "b": ACTION_SUGGESTED}
+    )
+
+    assert next(ops) == PlanOperation("copy_right", "a")
+    assert list(ops) == [PlanOperation("copy_left", "b")]
+
+
 def test_summarize_operations_counts() -> None:
     ops = [
         PlanOperation("delete_left", "a"),
@@ -224,7 +273,9 @@ def test_execute_plan_copy_right_and_delete_right(tmp_path, monkeypatch) -> None
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     progress = []
     result = execute_plan(
@@ -258,8 +309,9 @@ def test_execute_plan_copy_right_symlink_rewrites_in_root_target(tmp_path, monke
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
-    monkeypatch.setattr(pa, "_remote_expand_home", lambda _client: "/home/dario")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", "/home/dario")
+    )
 
     result = execute_plan(
         local_root,
@@ -313,7 +365,9 @@ def test_execute_plan_copy_left_and_delete_left(tmp_path, monkeypatch) -> None:
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     result = execute_plan(
         local_root,
@@ -324,6 +378,11 @@ def test_execute_plan_copy_left_and_delete_left(tmp_path, monkeypatch) -> None:
     target = local_root / "b.txt"
     assert target.read_bytes() == b"remote-content"
     assert stat.S_IMODE(target.stat().st_mode) == 0o600
+    # lstat falls back to stat in the fake; one pair means a single round trip.
+    assert [call[0] for call in sftp.calls if call[1:] == ("/remote/b.txt",)] == [
+        "lstat",
+        "stat",
+    ]
     assert not to_delete.exists()
     assert result.total_operations == 2
     assert result.succeeded_operations == 2
@@ -345,8 +404,9 @@ def test_execute_plan_copy_left_symlink_rewrites_in_root_target(tmp_path, monkey
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
-    monkeypatch.setattr(pa, "_remote_expand_home", lambda _client: "/home/dario")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", "/home/dario")
+    )
 
     result = execute_plan(
         local_root,
@@ -377,8 +437,9 @@ def test_execute_plan_copy_left_symlink_rewrites_home_prefix(tmp_path, monkeypat
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
-    monkeypatch.setattr(pa, "_remote_expand_home", lambda _client: "/home/dario")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", "/home/dario")
+    )
 
     result = execute_plan(
         local_root,
@@ -406,7 +467,9 @@ def test_execute_plan_put_uses_confirm_false_by_default(tmp_path, monkeypatch) -
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     execute_plan(
         local_root,
@@ -414,22 +477,20 @@ def test_execute_plan_put_uses_confirm_false_by_default(tmp_path, monkeypatch) -
         [PlanOperation("copy_right", "a.txt")],
     )
 
-    put_calls = [call for call in sftp.calls if call[0] == "put"]
-    assert put_calls
-    assert put_calls[0][-1] is False
+    assert ("open", "/remote/a.txt", "wb") in sftp.calls
+    # Without confirm the upload is not stat'ed back for a size check.
+    assert ("stat", "/remote/a.txt") not in sftp.calls
 
 
 def test_execute_plan_put_replaces_read_only_remote_via_temporary_file(
     tmp_path, monkeypatch
 ) -> None:
     class ReadOnlyDestinationSFTP(FakeSFTPClient):
-        def put(
-            self, local_path: str, remote_path: str, *, confirm: bool = True
-        ) -> None:
-            if remote_path == "/remote/a.txt":
-                self.calls.append(("put", local_path, remote_path, confirm))
+        def open(self, path: str, mode: str = "r"):
+            if path == "/remote/a.txt" and "w" in mode:
+                self.calls.append(("open", path, mode))
                 raise PermissionError("Permission denied")
-            super().put(local_path, remote_path, confirm=confirm)
+            return super().open(path, mode)
 
     local_root = tmp_path / "local"
     local_root.mkdir()
@@ -447,7 +508,9 @@ def test_execute_plan_put_replaces_read_only_remote_via_temporary_file(
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     result = execute_plan(
         local_root,
@@ -459,9 +522,9 @@ def test_execute_plan_put_replaces_read_only_remote_via_temporary_file(
     assert result.succeeded_operations == 1
     assert sftp.remote_files["/remote/a.txt"] == b"replacement"
     assert stat.S_IMODE(sftp.remote_stats["/remote/a.txt"].st_mode) == 0o444
-    put_calls = [call for call in sftp.calls if call[0] == "put"]
+    put_calls = [call for call in sftp.calls if call[0] == "open"]
     assert len(put_calls) == 2
-    temporary_path = put_calls[1][2]
+    temporary_path = put_calls[1][1]
     assert temporary_path.startswith("/remote/.a.txt.limsync-")
     assert temporary_path.endswith(".tmp")
     assert temporary_path not in sftp.remote_files
@@ -472,13 +535,11 @@ def test_execute_plan_put_cleans_temporary_file_when_replace_fails(
     tmp_path, monkeypatch
 ) -> None:
     class FailedReplacementSFTP(FakeSFTPClient):
-        def put(
-            self, local_path: str, remote_path: str, *, confirm: bool = True
-        ) -> None:
-            if remote_path == "/remote/a.txt":
-                self.calls.append(("put", local_path, remote_path, confirm))
+        def open(self, path: str, mode: str = "r"):
+            if path == "/remote/a.txt" and "w" in mode:
+                self.calls.append(("open", path, mode))
                 raise PermissionError("Permission denied")
-            super().put(local_path, remote_path, confirm=confirm)
+            return super().open(path, mode)
 
         def posix_rename(self, oldpath: str, newpath: str) -> None:
             self.calls.append(("posix_rename", oldpath, newpath))
@@ -497,7 +558,9 @@ def test_execute_plan_put_cleans_temporary_file_when_replace_fails(
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     result = execute_plan(
         local_root,
@@ -513,6 +576,187 @@ def test_execute_plan_put_cleans_temporary_file_when_replace_fails(
     assert not any(".limsync-" in path for path in sftp.remote_files)
 
 
+def test_execute_plan_retries_transient_sftp_errors(tmp_path, monkeypatch) -> None:
+    import paramiko
+
+    class FlakySFTP(FakeSFTPClient):
+        def __init__(self) -> None:
+            super().__init__()
+            self.put_failures = 2
+
+        def open(self, path: str, mode: str = "r"):
+            if self.put_failures:
+                self.put_failures -= 1
+                raise paramiko.SSHException("timeout")
+            return super().open(path, mode)
+
+    local_root = tmp_path / "local"
+    local_root.mkdir()
+    (local_root / "a.txt").write_text("hello", encoding="utf-8")
+    sftp = FlakySFTP()
+    sftp.existing_dirs.add("/remote")
+    sftp.failures[("remove", "/remote/gone.txt")] = FileNotFoundError("gone")
+    ssh = FakeSSHClient(sftp)
+
+    from limsync import planner_apply as pa
+
+    monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
+    monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
+    monkeypatch.setattr(pa, "SFTP_RETRY_BACKOFF_SECONDS", 0.0)
+
+    result = execute_plan(
+        local_root,
+        "u@h:~/x",
+        [PlanOperation("copy_right", "a.txt"), PlanOperation("delete_right", "gone.txt")],
+    )
+
+    assert result.completed_paths == {"a.txt"}
+    assert sftp.remote_files["/remote/a.txt"] == b"hello"
+    assert sftp.put_failures == 0
+    assert result.errors == ["delete_right gone.txt: gone"]
+
+
+def test_execute_plan_runs_remote_paths_on_parallel_sftp_channels(
+    tmp_path, monkeypatch
+) -> None:
+    class CountingSSHClient(FakeSSHClient):
+        def __init__(self, sftp: FakeSFTPClient) -> None:
+            super().__init__(sftp)
+            self.sftp_opened = 0
+
+        def open_sftp(self) -> FakeSFTPClient:
+            self.sftp_opened += 1
+            return self.sftp
+
+    local_root = tmp_path / "local"
+    (local_root / "d").mkdir(parents=True)
+    names = [f"d/f{index}.txt" for index in range(6)]
+    for name in names:
+        (local_root / name).write_text(name, encoding="utf-8")
+    sftp = FakeSFTPClient()
+    sftp.existing_dirs.add("/remote")
+    ssh = CountingSSHClient(sftp)
+
+    from limsync import planner_apply as pa
+
+    monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
+    monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
+
+    result = execute_plan(
+        local_root,
+        "u@h:~/x",
+        [PlanOperation("copy_right", name) for name in names],
+        settings=ApplySettings(concurrency=2),
+    )
+
+    assert result.errors == []
+    assert result.completed_paths == set(names)
+    assert {f"/remote/{name}" for name in names} <= set(sftp.remote_files)
+    assert 2 <= ssh.sftp_opened <= 3
+    assert sftp.calls.count(("close",)) == ssh.sftp_opened
+
+
+
+def test_execute_plan_keeps_applied_paths_when_a_worker_channel_fails(
+    tmp_path, monkeypatch
+) -> None:
+    import paramiko
+
+    class RefusingSSHClient(FakeSSHClient):
+        def __init__(self, sftp: FakeSFTPClient) -> None:
+            super().__init__(sftp)
+            self.sftp_opened = 0
+
+        def open_sftp(self) -> FakeSFTPClient:
+            self.sftp_opened += 1
+            if self.sftp_opened == 2:
+                raise paramiko.ChannelException(1, "Administratively prohibited")
+            return self.sftp
+
+    local_root = tmp_path / "local"
+    (local_root / "d").mkdir(parents=True)
+    names = [f"d/f{index}.txt" for index in range(6)]
+    for name in names:
+        (local_root / name).write_text(name, encoding="utf-8")
+    sftp = FakeSFTPClient()
+    sftp.existing_dirs.add("/remote")
+    ssh = RefusingSSHClient(sftp)
+
+    from limsync import planner_apply as pa
+
+    monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
+    monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
+
+    result = execute_plan(
+        local_root,
+        "u@h:~/x",
+        [PlanOperation("copy_right", name) for name in names],
+        settings=ApplySettings(concurrency=2),
+    )
+
+    assert len(result.errors) == 1
+    assert "sftp channel" in result.errors[0]
+    assert len(result.completed_paths) == len(names) - 1
+    assert pa.MAX_APPLY_WORKERS == pa.SSHD_MAX_SESSIONS - 1
+
+def test_execute_plan_batches_remote_parent_mkdir(tmp_path, monkeypatch) -> None:
+    class _ExitChannel:
+        def recv_exit_status(self) -> int:
+            return 0
+
+    class _ExitStream:
+        channel = _ExitChannel()
+
+    class MkdirSSHClient(FakeSSHClient):
+        def __init__(self, sftp: FakeSFTPClient) -> None:
+            super().__init__(sftp)
+            self.commands: list[str] = []
+
+        def exec_command(self, command: str):
+            self.commands.append(command)
+            return None, _ExitStream(), _ExitStream()
+
+    local_root = tmp_path / "local"
+    (local_root / "a" / "b").mkdir(parents=True)
+    (local_root / "c").mkdir()
+    names = ["a/b/one.txt", "a/b/two.txt", "c/three.txt"]
+    for name in names:
+        (local_root / name).write_text(name, encoding="utf-8")
+    sftp = FakeSFTPClient()
+    sftp.existing_dirs.add("/remote")
+    ssh = MkdirSSHClient(sftp)
+
+    from limsync import planner_apply as pa
+
+    monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
+    monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
+
+    result = execute_plan(
+        local_root,
+        "u@h:~/x",
+        [PlanOperation("copy_right", name) for name in names],
+        settings=ApplySettings(concurrency=1),
+    )
+
+    assert result.errors == []
+    assert [cmd for cmd in ssh.commands if cmd.startswith("mkdir")] == [
+        "mkdir -p -- /remote/a/b /remote/c"
+    ]
+    assert not [call for call in sftp.calls if call[0] in {"stat", "mkdir"}]
+
+
 def test_execute_plan_connect_respects_ssh_compression(tmp_path, monkeypatch) -> None:
     local_root = tmp_path / "local"
     local_root.mkdir()
@@ -524,7 +768,9 @@ def test_execute_plan_connect_respects_ssh_compression(tmp_path, monkeypatch) ->
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     execute_plan(
         local_root,
@@ -537,6 +783,80 @@ def test_execute_plan_connect_respects_ssh_compression(tmp_path, monkeypatch) ->
     assert ssh.connect_calls[0]["compress"] is True
 
 
+def test_execute_plan_sends_incompressible_copies_uncompressed(
+    tmp_path, monkeypatch
+) -> None:
+    local_root = tmp_path / "local"
+    local_root.mkdir()
+    (local_root / "notes.txt").write_text("text", encoding="utf-8")
+    (local_root / "photo.jpg").write_bytes(b"jpeg")
+    compressed_sftp = FakeSFTPClient()
+    compressed_sftp.existing_dirs.add("/remote")
+    plain_sftp = FakeSFTPClient()
+    plain_sftp.existing_dirs.add("/remote")
+    clients = [FakeSSHClient(compressed_sftp), FakeSSHClient(plain_sftp)]
+    created = list(clients)
+
+    from limsync import planner_apply as pa
+
+    monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: clients.pop(0))
+    monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
+
+    result = execute_plan(
+        local_root,
+        "u@h:~/plain-transport",
+        [
+            PlanOperation("copy_right", "notes.txt"),
+            PlanOperation("copy_right", "photo.jpg"),
+        ],
+        settings=ApplySettings(ssh_compression=True, concurrency=1),
+    )
+
+    assert result.errors == []
+    assert [client.connect_calls[0]["compress"] for client in created] == [True, False]
+    assert set(compressed_sftp.remote_files) == {"/remote/notes.txt"}
+    assert set(plain_sftp.remote_files) == {"/remote/photo.jpg"}
+
+
+def test_execute_plan_zstd_compression_falls_back_to_plain_put(
+    tmp_path, monkeypatch
+) -> None:
+    local_root = tmp_path / "local"
+    local_root.mkdir()
+    (local_root / "small.txt").write_text("tiny", encoding="utf-8")
+    (local_root / "archive.zip").write_bytes(b"z" * 32 * 1024)
+    sftp = FakeSFTPClient()
+    sftp.existing_dirs.add("/remote")
+    ssh = FakeSSHClient(sftp)
+
+    from limsync import planner_apply as pa
+
+    monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
+    monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
+    monkeypatch.setattr(pa, "zstandard", object())
+
+    result = execute_plan(
+        local_root,
+        "u@h:~/x",
+        [
+            PlanOperation("copy_right", "small.txt"),
+            PlanOperation("copy_right", "archive.zip"),
+        ],
+        settings=ApplySettings(compression="zstd"),
+    )
+
+    assert result.errors == []
+    assert ssh.connect_calls[0]["compress"] is False
+    assert sftp.remote_files["/remote/small.txt"] == b"tiny"
+    assert len(sftp.remote_files["/remote/archive.zip"]) == 32 * 1024
+
+
 def test_execute_plan_metadata_bidirectional_uses_restrictive_and_oldest(tmp_path, monkeypatch) -> None:
     local_root = tmp_path / "local"
     local_root.mkdir()
@@ -555,7 +875,9 @@ def test_execute_plan_metadata_bidirectional_uses_restrictive_and_oldest(tmp_pat
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     result = execute_plan(
         local_root,
@@ -590,7 +912,9 @@ def test_execute_plan_metadata_symlink_is_noop(tmp_path, monkeypatch) -> None:
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     progress = []
     result = execute_plan(
@@ -603,7 +927,7 @@ def test_execute_plan_metadata_symlink_is_noop(tmp_path, monkeypatch) -> None:
     assert result.errors == []
     assert result.succeeded_operations == 1
     assert progress == [(1, 1, "metadata_update_right", True, None)]
-    assert not any(call[0] == "chmod" for call in sftp.calls)
+    assert not any(call[0] in {"chmod", "setstat"} for call in sftp.calls)
 
 
 def test_execute_plan_local_metadata_mode_only_preserves_mtime(tmp_path) -> None:
@@ -667,7 +991,9 @@ def test_execute_plan_batches_local_to_remote_metadata(tmp_path, monkeypatch) ->
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     def fake_helper(remote, mode, requests, response_cb=None, cancel_event=None):
         _ = cancel_event
@@ -695,7 +1021,9 @@ def test_execute_plan_batches_local_to_remote_metadata(tmp_path, monkeypatch) ->
     assert result.succeeded_operations == 2
     assert [mode for mode, _requests in calls] == ["apply"]
     assert all(request["fields"] == ["mode"] for request in calls[0][1])
-    assert not any(call[0] in {"lstat", "chmod", "utime"} for call in sftp.calls)
+    assert not any(
+        call[0] in {"lstat", "chmod", "utime", "setstat"} for call in sftp.calls
+    )
 
 
 def test_execute_plan_batches_remote_to_local_metadata(tmp_path, monkeypatch) -> None:
@@ -711,7 +1039,9 @@ def test_execute_plan_batches_remote_to_local_metadata(tmp_path, monkeypatch) ->
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     def fake_helper(remote, mode, requests, response_cb=None, cancel_event=None):
         _ = (remote, response_cb, cancel_event)
@@ -729,6 +1059,45 @@ def test_execute_plan_batches_remote_to_local_metadata(tmp_path, monkeypatch) ->
     assert stat.S_IMODE((local_root / "x").stat().st_mode) == 0o640
 
 
+def test_execute_plan_metadata_uses_scan_snapshot_instead_of_remote_read(
+    tmp_path, monkeypatch
+) -> None:
+    local_root = tmp_path / "local"
+    local_root.mkdir()
+    (local_root / "x").write_text("x", encoding="utf-8")
+    os.chmod(local_root / "x", 0o777)
+
+    sftp = FakeSFTPClient()
+    ssh = FakeSSHClient(sftp)
+
+    from limsync import planner_apply as pa
+
+    monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
+    monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
+
+    def fake_helper(remote, mode, requests, response_cb=None, cancel_event=None):
+        raise AssertionError("source metadata should come from the scan snapshot")
+
+    monkeypatch.setattr(pa, "_run_remote_metadata_helper", fake_helper)
+    diff = mk_diff(
+        "x",
+        content_state=ContentState.IDENTICAL,
+        metadata_state=MetadataState.DIFFERENT,
+        metadata_diff=("mode",),
+        metadata_source="left",
+    )
+    diff = replace(diff, left_mode=0o640, left_mtime_ns=1_000_000_000)
+    ops = build_plan_operations([diff], {"x": ACTION_SUGGESTED})
+
+    result = execute_plan("u@h:~/x", local_root, ops)
+
+    assert result.errors == []
+    assert stat.S_IMODE((local_root / "x").stat().st_mode) == 0o640
+
+
 def test_execute_plan_batches_remote_to_remote_metadata(tmp_path, monkeypatch) -> None:
     _ = tmp_path
     sftp = FakeSFTPClient()
@@ -739,7 +1108,9 @@ def test_execute_plan_batches_remote_to_remote_metadata(tmp_path, monkeypatch) -
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     def fake_helper(remote, mode, requests, response_cb=None, cancel_event=None):
         _ = cancel_event
@@ -776,7 +1147,9 @@ def test_execute_plan_batch_keeps_per_path_remote_errors(tmp_path, monkeypatch)
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     def fake_helper(remote, mode, requests, response_cb=None, cancel_event=None):
         _ = (remote, mode, cancel_event)
@@ -818,7 +1191,9 @@ def test_execute_plan_partial_failures_and_completed_paths(tmp_path, monkeypatch
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     result = execute_plan(
         local_root,
@@ -888,6 +1263,30 @@ def test_execute_plan_finishes_active_copy_then_stops(tmp_path, monkeypatch) ->
     assert not (right / "b").exists()
 
 
+def test_execute_plan_throttles_progress_callbacks(tmp_path) -> None:
+    left = tmp_path / "left"
+    right = tmp_path / "right"
+    left.mkdir()
+    right.mkdir()
+    names = [f"f{index}" for index in range(7)]
+    for name in names:
+        (left / name).write_text(name, encoding="utf-8")
+
+    progress: list[int] = []
+    result = execute_plan(
+        left,
+        right,
+        [PlanOperation("copy_right", name) for name in names],
+        progress_cb=lambda done, total, op, ok, err: progress.append(done),
+        settings=ApplySettings(
+            progress_emit_every_ops=3, progress_emit_every_ms=60_000
+        ),
+    )
+
+    assert result.succeeded_operations == 7
+    assert progress == [1, 4, 7]
+
+
 def test_execute_plan_cancel_stops_local_metadata_before_next_path(tmp_path) -> None:
     left = tmp_path / "left"
     right = tmp_path / "right"
@@ -938,7 +1337,9 @@ def test_execute_plan_cancel_stops_remote_metadata_without_errors(
 
     monkeypatch.setattr(pa.paramiko, "SSHClient", lambda: ssh)
     monkeypatch.setattr(pa.paramiko, "AutoAddPolicy", DummyAutoAddPolicy)
-    monkeypatch.setattr(pa, "_remote_expand_root", lambda _client, _root: "/remote")
+    monkeypatch.setattr(
+        pa, "_remote_expand_paths", lambda _client, _root: ("/remote", None)
+    )
 
     def fake_helper(remote, mode, requests, response_cb=None, cancel_event=None):
         _ = (remote, mode)
@@ -967,8 +1368,147 @@ def test_execute_plan_cancel_stops_remote_metadata_without_errors(
 def test_remote_expand_root_success_and_error() -> None:
     sftp = FakeSFTPClient()
     ssh_ok = FakeSSHClient(sftp, expand_stdout="/expanded/path\n")
-    assert _remote_expand_root(ssh_ok, "~/Dropbox") == "/expanded/path"
+    assert _remote_expand_root(ssh_ok, "~/Dropbox") == "/expanded/path/Dropbox"
+    assert _remote_expand_root(ssh_ok, "/srv/data") == "/srv/data"
+
+    ssh_user = FakeSSHClient(sftp, expand_stdout="/home/me\n/home/bob/x\n")
+    assert _remote_expand_root(ssh_user, "~bob/x") == "/home/bob/x"
 
     ssh_fail = FakeSSHClient(sftp, expand_stdout="", expand_stderr="boom")
     with pytest.raises(RuntimeError):
         _remote_expand_root(ssh_fail, "~/Dropbox")
+
+
+def test_sftp_setstat_sends_single_request() -> None:
+    from limsync import planner_apply as pa
+
+    sftp = FakeSFTPClient()
+    sftp.remote_files["/remote/a.txt"] = b"a"
+
+    pa._sftp_setstat(sftp, "/remote/a.txt", 0o640, 5, 10)
+
+    assert sftp.calls == [("setstat", "/remote/a.txt", 0o640, 5, 10)]
+    attrs = sftp.remote_stats["/remote/a.txt"]
+    assert (attrs.st_mode, attrs.st_atime, attrs.st_mtime) == (0o100640, 5, 10)
+
+
+def test_put_remote_file_streams_in_large_chunks(tmp_path, monkeypatch) -> None:
+    from limsync import planner_apply as pa
+
+    sftp = FakeSFTPClient()
+    monkeypatch.setattr(pa, "UPLOAD_CHUNK_BYTES", 4)
+    source = tmp_path / "payload.bin"
+    source.write_bytes(b"0123456789")
+
+    pa._put_remote_file(sftp, str(source), "/remote/payload.bin", confirm=True)
+
+    assert sftp.remote_files["/remote/payload.bin"] == b"0123456789"
+    assert ("write", "/remote/payload.bin", True) in sftp.calls
+
+
+def test_execute_plan_creates_each_local_parent_once(tmp_path, monkeypatch) -> None:
+    left_root = tmp_path / "left"
+    (left_root / "docs").mkdir(parents=True)
+    right_root = tmp_path / "right"
+    right_root.mkdir()
+    names = [f"docs/{index}.txt" for index in range(3)]
+    for name in names:
+        (left_root / name).write_text(name, encoding="utf-8")
+
+    mkdir_calls: list[Path] = []
+    original_mkdir = Path.mkdir
+
+    def counting_mkdir(self: Path, *args, **kwargs) -> None:
+        mkdir_calls.append(self)
+        original_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", counting_mkdir)
+
+    result = execute_plan(
+        left_root,
+        right_root,
+        [PlanOperation("copy_right", name) for name in names],
+    )
+
+    assert result.errors == []
+    assert mkdir_calls == [right_root.resolve() / "docs"]
+    assert sorted(path.name for path in (right_root / "docs").iterdir()) == [
+        "0.txt",
+        "1.txt",
+        "2.txt",
+    ]
+
+
+def test_execute_plan_orders_paths_by_directory_with_deletes_first(tmp_path) -> None:
+    left_root = tmp_path / "left"
+    right_root = tmp_path / "right"
+    for root in (left_root, right_root):
+        (root / "a").mkdir(parents=True)
+        (root / "b").mkdir(parents=True)
+    (left_root / "b" / "x.txt").write_text("x", encoding="utf-8")
+    (left_root / "a" / "z.txt").write_text("z", encoding="utf-8")
+    (right_root / "a" / "y.txt").write_text("y", encoding="utf-8")
+    (right_root / "b" / "w.txt").write_text("w", encoding="utf-8")
+    seen: list[str] = []
+
+    result = execute_plan(
+        left_root,
+        right_root,
+        [
+            PlanOperation("copy_right", "b/x.txt"),
+            PlanOperation("delete_right", "b/w.txt"),
+            PlanOperation("copy_right", "a/z.txt"),
+            PlanOperation("delete_right", "a/y.txt"),
+        ],
+        progress_cb=lambda _done, _total, op, _ok, _error: seen.append(op.relpath),
+        settings=ApplySettings(progress_emit_every_ops=1),
+    )
+
+    assert result.errors == []
+    assert seen == ["a/y.txt", "a/z.txt", "b/w.txt", "b/x.txt"]
+
+
+def test_get_remote_file_prefetches_and_copies_in_large_chunks(
+    tmp_path, monkeypatch
+) -> None:
+    from limsync import planner_apply as pa
+
+    sftp = FakeSFTPClient()
+    sftp.remote_files["/remote/payload.bin"] = b"0123456789"
+    sftp.remote_stats["/remote/payload.bin"] = make_remote_stat()
+    reads: list[int] = []
+    fake_open = sftp.open
+
+    def tracking_open(path: str, mode: str = "r"):
+        handle = fake_open(path, mode)
+        read = handle.read
+
+        def tracked_read(size: int = -1) -> bytes:
+            reads.append(size)
+            return read(size)
+
+        handle.read = tracked_read
+        return handle
+
+    sftp.open = tracking_open
+    monkeypatch.setattr(pa, "DOWNLOAD_CHUNK_BYTES", 4)
+    target = tmp_path / "payload.bin"
+
+    pa._get_remote_file(sftp, "/remote/payload.bin", str(target), 10)
+
+    assert target.read_bytes() == b"0123456789"
+    assert sftp.calls == [
+        ("open", "/remote/payload.bin", "rb"),
+        ("prefetch", "/remote/payload.bin", 10),
+    ]
+    assert set(reads) == {4}
+
+
+def test_get_remote_file_rejects_short_download(tmp_path) -> None:
+    from limsync import planner_apply as pa
+
+    sftp = FakeSFTPClient()
+    sftp.remote_files["/remote/payload.bin"] = b"0123"
+
+    with pytest.raises(OSError, match="size mismatch in get"):
+        pa._get_remote_file(sftp, "/remote/payload.bin", str(tmp_path / "p"), 10)
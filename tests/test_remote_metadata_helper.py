@@ -40,6 +40,35 @@ def test_apply_mode_only_preserves_mtime(tmp_path) -> None:
     assert target.stat().st_mtime_ns == 20_000_000_000
 
 
+def test_apply_skips_syscalls_when_metadata_already_matches(
+    tmp_path, monkeypatch
+) -> None:
+    target = tmp_path / "x"
+    target.write_text("x", encoding="utf-8")
+    os.chmod(target, 0o640)
+    os.utime(target, ns=(10_000_000_000, 20_000_000_000))
+
+    def fail(*_args, **_kwargs) -> None:
+        raise AssertionError("metadata already matched")
+
+    monkeypatch.setattr(helper.os, "chmod", fail)
+    monkeypatch.setattr(helper.os, "utime", fail)
+
+    response = process_request(
+        "apply",
+        str(tmp_path),
+        {
+            "id": 1,
+            "relpath": "x",
+            "fields": ["mode", "mtime"],
+            "mode": 0o640,
+            "mtime_ns": 20_000_000_000,
+        },
+    )
+
+    assert response["ok"] is True
+
+
 def test_apply_mtime_only_preserves_mode_and_atime(tmp_path) -> None:
     target = tmp_path / "x"
     target.write_text("x", encoding="utf-8")
@@ -7,6 +7,7 @@ from limsync.planner_apply import ACTION_SUGGESTED, build_plan_operations
 from limsync.review_tui import ReviewApp
 from limsync.state_db import (
     ScanStateSummary,
+    load_action_overrides,
     save_current_state,
     upsert_action_overrides,
 )
@@ -79,3 +80,811 @@ def test_filter_modal_applies_and_cancels_without_changing_plan(tmp_path: Path)
             assert app.visible_changed_relpaths == {"docs/meta.txt"}
 
     asyncio.run(exercise())
+
+
+def test_remote_dropboxignore_update_reuses_one_session_and_cached_root(
+    tmp_path: Path, monkeypatch
+) -> None:
+    import io
+    from contextlib import contextmanager
+
+    from limsync import review_actions
+
+    db_path = tmp_path / "review.sqlite3"
+    save_current_state(db_path, _summary(), [])
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("remote", "~/left", user="u", host="h"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+
+    files = {"/home/u/left/.dropboxignore": b"*.tmp"}
+    sessions: list[str] = []
+    expansions: list[str] = []
+    normalized: list[str] = []
+
+    class _Handle(io.BytesIO):
+        def __init__(self, path: str, mode: str) -> None:
+            super().__init__(files[path] if "r" in mode else b"")
+            self.path = path
+            self.mode = mode
+
+        def write(self, data) -> int:
+            return super().write(data.encode() if isinstance(data, str) else data)
+
+        def __exit__(self, *exc) -> None:
+            if "w" in self.mode:
+                files[self.path] = self.getvalue()
+            super().__exit__(*exc)
+
+    class _Sftp:
+        def normalize(self, path: str) -> str:
+            normalized.append(path)
+            return "/home/u" if path == "." else path
+
+        def stat(self, path: str) -> None:
+            return None
+
+        def open(self, path: str, mode: str) -> _Handle:
+            if "w" in mode and "/bad/" in path:
+                raise PermissionError(path)
+            if "r" in mode and path not in files:
+                raise FileNotFoundError(path)
+            return _Handle(path, mode)
+
+        def close(self) -> None:
+            sessions.append("closed")
+
+    @contextmanager
+    def fake_pool(**_kwargs):
+        sessions.append("opened")
+        yield object()
+
+    def fake_expand(_client, root: str) -> str:
+        expansions.append(root)
+        return "/home/u/left"
+
+    def fake_open_sftp(_client) -> _Sftp:
+        sessions.append("sftp")
+        return _Sftp()
+
+    monkeypatch.setattr(review_actions, "pooled_ssh_client", fake_pool)
+    monkeypatch.setattr(review_actions, "open_sftp", fake_open_sftp)
+    monkeypatch.setattr(review_actions, "_remote_expand_root", fake_expand)
+
+    assert app._append_dropboxignore_rule(".", "build", is_dir=True)
+    assert not app._append_dropboxignore_rule(".", "build", is_dir=True)
+
+    assert files["/home/u/left/.dropboxignore"] == b"*.tmp\nbuild/\n"
+    # One SFTP session serves both updates and stays open for the review.
+    assert sessions == ["opened", "sftp", "opened"]
+    assert expansions == []
+    assert normalized == [".", "/home/u/left"]
+
+    sessions.clear()
+    added = app._append_dropboxignore_rules(
+        ".", [("a.log", False), ("build", True), ("cache", True)]
+    )
+    assert added == ["a.log", "cache/"]
+    assert files["/home/u/left/.dropboxignore"] == b"*.tmp\nbuild/\na.log\ncache/\n"
+    assert sessions == ["opened"]
+
+    forgotten: list[set[str]] = []
+    monkeypatch.setattr(
+        review_actions,
+        "delete_paths_from_current_state",
+        lambda _db, paths: forgotten.append(set(paths)),
+    )
+    app._update_plan_panel = lambda **_kwargs: None
+    app._refresh_from_root = lambda: None
+    app._pending_ignore_rules = {"docs": [("x", False), ("y", True)]}
+    assert app._flush_dropboxignore()
+    assert app._pending_ignore_rules == {}
+    assert files["/home/u/left/docs/.dropboxignore"] == b"x\ny/\n"
+    assert app.status_message == "Added 2 rules to .dropboxignore."
+    assert forgotten == [{"docs/x"}]
+
+    # A failed folder keeps itself and the folders after it queued, and only
+    # the rows of rules that reached the remote leave the review.
+    forgotten.clear()
+    app._pending_ignore_rules = {
+        "src": [("a.o", False)],
+        "bad": [("b", False)],
+        "later": [("c", False)],
+    }
+    assert not app._flush_dropboxignore()
+    assert app._pending_ignore_rules == {
+        "bad": [("b", False)],
+        "later": [("c", False)],
+    }
+    assert files["/home/u/left/src/.dropboxignore"] == b"a.o\n"
+    assert forgotten == [{"src/a.o"}]
+
+    app._close_sftp_sessions()
+    assert sessions[-1] == "closed"
+
+
+def test_quit_exits_even_when_dropboxignore_rules_cannot_be_written(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "review.sqlite3"
+    save_current_state(db_path, _summary(), [])
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("remote", "~/left", user="u", host="h"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+    attempts: list[str] = []
+    exit_messages: list[str] = []
+
+    def unreachable(parent_relpath: str, _rules) -> list[str]:
+        attempts.append(parent_relpath)
+        raise OSError("host unreachable")
+
+    real_exit = app.exit
+
+    def recording_exit(*args, message=None, **kwargs) -> None:
+        exit_messages.append(str(message))
+        real_exit(*args, message=message, **kwargs)
+
+    app._append_dropboxignore_rules = unreachable
+    app.exit = recording_exit
+
+    async def exercise() -> None:
+        async with app.run_test() as pilot:
+            app._pending_ignore_rules = {"docs": [("x", False), ("build", True)]}
+            await pilot.press("q")
+            await pilot.pause()
+
+    asyncio.run(exercise())
+
+    assert attempts == ["docs"]
+    assert exit_messages == [
+        "2 .dropboxignore rules not written:\n"
+        "  docs/.dropboxignore: x\n"
+        "  docs/.dropboxignore: build/"
+    ]
+    assert app._pending_ignore_rules == {}
+
+
+def test_sftp_expand_root_only_shells_out_for_other_users_home(monkeypatch) -> None:
+    from limsync import review_actions
+
+    class _Sftp:
+        def normalize(self, path: str) -> str:
+            assert path == "."
+            return "/home/u"
+
+    monkeypatch.setattr(
+        review_actions, "_remote_expand_root", lambda _client, root: "/home/bob/x"
+    )
+    sftp = _Sftp()
+    assert review_actions._sftp_expand_root(None, sftp, "~") == "/home/u/"
+    assert review_actions._sftp_expand_root(None, sftp, "~/a/b") == "/home/u/a/b"
+    assert review_actions._sftp_expand_root(None, sftp, "/srv/x") == "/srv/x"
+    assert review_actions._sftp_expand_root(None, sftp, "~bob/x") == "/home/bob/x"
+
+
+def test_plan_operations_are_cached_until_overrides_or_diffs_change(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from limsync import review_tui
+
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            "docs/left.txt",
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+    builds: list[int] = []
+    real_build = review_tui.build_plan_operations
+
+    def counting_build(diffs, overrides):
+        builds.append(1)
+        return real_build(diffs, overrides)
+
+    monkeypatch.setattr(review_tui, "build_plan_operations", counting_build)
+
+    assert app._plan_operations() == []
+    assert app._plan_operations() == []
+    assert len(builds) == 1
+
+    app.action_overrides["docs/left.txt"] = ACTION_SUGGESTED
+    assert [op.relpath for op in app._plan_operations()] == ["docs/left.txt"]
+    assert len(builds) == 2
+
+    app.diffs = list(app.diffs)
+    app._plan_operations()
+    assert len(builds) == 3
+
+
+def test_clipboard_command_is_resolved_once(monkeypatch) -> None:
+    from limsync import review_actions
+
+    lookups: list[str] = []
+
+    def fake_which(name: str) -> str | None:
+        lookups.append(name)
+        return "/usr/bin/xclip" if name == "xclip" else None
+
+    review_actions._clipboard_command.cache_clear()
+    monkeypatch.setattr(review_actions, "_SYSTEM", "Linux")
+    monkeypatch.setattr(review_actions.shutil, "which", fake_which)
+    try:
+        assert review_actions._clipboard_command() == (
+            "xclip",
+            "-selection",
+            "clipboard",
+        )
+        assert review_actions._clipboard_command() == (
+            "xclip",
+            "-selection",
+            "clipboard",
+        )
+    finally:
+        review_actions._clipboard_command.cache_clear()
+    assert lookups == ["wl-copy", "xclip"]
+
+
+def test_text_diff_is_truncated_with_total_line_count(tmp_path: Path) -> None:
+    db_path = tmp_path / "review.sqlite3"
+    save_current_state(db_path, _summary(), [])
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+    left = tmp_path / "left.txt"
+    right = tmp_path / "right.txt"
+    left.write_text("".join(f"l{idx}\n" for idx in range(3000)), encoding="utf-8")
+    right.write_text("".join(f"r{idx}\n" for idx in range(3000)), encoding="utf-8")
+
+    text = app._build_text_diff("x.txt", left, right)
+    lines = text.splitlines()
+    assert len(lines) == 2502
+    # 2 file headers, 1 hunk header, 3000 removals and 3000 additions.
+    assert lines[-1] == "... diff truncated: showing 2500 of 6003 lines ..."
+
+    right.write_text(left.read_text(encoding="utf-8"), encoding="utf-8")
+    assert app._build_text_diff("x.txt", left, right) == "No textual differences."
+
+
+def test_diff_binary_detection_only_sniffs_the_first_block(tmp_path: Path) -> None:
+    from limsync import review_actions
+
+    db_path = tmp_path / "review.sqlite3"
+    save_current_state(db_path, _summary(), [])
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+    binary = tmp_path / "bin.dat"
+    binary.write_bytes(b"abc\x00def")
+    late_nul = tmp_path / "late.txt"
+    late_nul.write_bytes(
+        b"a\r\nb\n" + b"x" * review_actions.BINARY_SNIFF_BYTES + b"\x00"
+    )
+
+    lines, error = app._read_text_lines_for_diff(binary, "left")
+    assert lines is None
+    assert error == "left: binary content detected; textual diff is not available."
+    lines, error = app._read_text_lines_for_diff(late_nul, "right")
+    assert error is None
+    assert lines is not None and lines[:2] == ["a", "b"]
+
+
+def test_downloaded_sides_do_not_overwrite_each_other(tmp_path: Path) -> None:
+    left_root = tmp_path / "left"
+    right_root = tmp_path / "right"
+    left_root.mkdir()
+    right_root.mkdir()
+    (left_root / "a.txt").write_text("left\n", encoding="utf-8")
+    (right_root / "a.txt").write_text("right\n", encoding="utf-8")
+    db_path = tmp_path / "review.sqlite3"
+    save_current_state(db_path, _summary(), [])
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", str(left_root)),
+        EndpointSpec("local", str(right_root)),
+        hide_identical=True,
+    )
+
+    left = app._download_endpoint_file(app.source_endpoint, "a.txt", "left")
+    right = app._download_endpoint_file(app.destination_endpoint, "a.txt", "right")
+
+    assert left != right
+    assert left.read_text(encoding="utf-8") == "left\n"
+    assert right.read_text(encoding="utf-8") == "right\n"
+
+
+def test_tree_navigation_debounces_plan_panel_updates(tmp_path: Path) -> None:
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            f"docs/f{idx}.txt",
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+        for idx in range(4)
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+
+    async def exercise() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            updates: list[int] = []
+            real_update = app._update_plan_panel
+
+            def counting_update(**kwargs) -> None:
+                updates.append(1)
+                real_update(**kwargs)
+
+            app._update_plan_panel = counting_update
+            for _ in range(3):
+                app._schedule_plan_panel_update()
+            assert updates == []
+            await pilot.pause(0.2)
+            assert len(updates) == 1
+            assert app._plan_panel_timer is None
+
+    asyncio.run(exercise())
+
+
+def test_update_path_scope_uses_dir_files_map_and_keeps_it_in_sync(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            relpath,
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+        for relpath in ("docs/a.txt", "docs/sub/b.txt", "docsx/c.txt")
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+
+    assert app._scope_relpaths("docs", True) == {"docs/a.txt", "docs/sub/b.txt"}
+    assert app._scope_relpaths("docs/a.txt", False) == {"docs/a.txt"}
+    assert app._scope_relpaths(".", True) == set(app.diffs_by_relpath)
+
+    new_diff = mk_diff(
+        "docs/sub/new.txt",
+        content_state=ContentState.ONLY_LEFT,
+        metadata_state=MetadataState.NOT_APPLICABLE,
+    )
+    upsert_action_overrides(
+        db_path, {"docs/a.txt": ACTION_SUGGESTED, "docs/sub/b.txt": ACTION_SUGGESTED}
+    )
+    app.action_overrides = load_action_overrides(db_path)
+    app._replace_scope_with_diffs("docs/sub", True, [new_diff])
+
+    assert app.action_overrides == {"docs/a.txt": ACTION_SUGGESTED}
+    assert app.action_overrides == load_action_overrides(db_path)
+
+    assert app._scope_relpaths("docs", True) == {"docs/a.txt", "docs/sub/new.txt"}
+    assert app.dir_files_map["docs/sub"] == ["docs/sub/new.txt"]
+    assert "docs/sub/b.txt" not in app.dir_files_map["."]
+    assert [diff.relpath for diff in app.diffs] == [
+        "docs/a.txt",
+        "docs/sub/new.txt",
+        "docsx/c.txt",
+    ]
+
+
+def test_operations_for_entry_reuses_result_until_diff_is_replaced(
+    tmp_path: Path, monkeypatch
+) -> None:
+    import dataclasses
+
+    from limsync import review_tui
+
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            "docs/left.txt",
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+    calls: list[int] = []
+    real_iter = review_tui.iter_plan_operations
+
+    def counting_iter(diffs, overrides):
+        calls.append(1)
+        return real_iter(diffs, overrides)
+
+    monkeypatch.setattr(review_tui, "iter_plan_operations", counting_iter)
+
+    assert app._operations_for_entry("docs/left.txt", ACTION_SUGGESTED) == [
+        "copy_right"
+    ]
+    assert app._operations_for_entry("docs/left.txt", ACTION_SUGGESTED) == [
+        "copy_right"
+    ]
+    assert len(calls) == 1
+
+    app.diffs_by_relpath["docs/left.txt"] = dataclasses.replace(
+        app.diffs_by_relpath["docs/left.txt"],
+        content_state=ContentState.ONLY_RIGHT,
+    )
+    assert app._operations_for_entry("docs/left.txt", ACTION_SUGGESTED) == ["copy_left"]
+    assert len(calls) == 2
+
+
+def test_setting_an_action_relabels_nodes_without_rebuilding_tree(
+    tmp_path: Path,
+) -> None:
+    from textual.widgets import Tree
+
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            relpath,
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+        for relpath in ("docs/a.txt", "docs/b.txt", "top.txt")
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+
+    def labels() -> list[str]:
+        tree = app.query_one(Tree)
+        found: list[str] = []
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            found.append(f"{node.data}: {node.label.plain}")
+            stack.extend(node.children)
+        return sorted(found)
+
+    async def exercise() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            docs_node = app._nodes_by_data[("dir", "docs")]
+            app._populate_node(docs_node, app.dirs_by_relpath["docs"])
+            docs_node.expand()
+            await pilot.pause()
+            app._current_selection = lambda: ("file", "docs/a.txt")
+
+            rebuilds: list[int] = []
+            real_rebuild = app._rebuild_tree
+
+            def counting_rebuild() -> None:
+                rebuilds.append(1)
+                real_rebuild()
+
+            app._rebuild_tree = counting_rebuild
+            app.action_apply_left_wins()
+            await pilot.pause()
+            assert rebuilds == []
+            assert app.action_overrides["docs/a.txt"] == "left_wins"
+            relabelled = labels()
+
+            real_rebuild()
+            await pilot.pause()
+            assert labels() == relabelled
+
+    asyncio.run(exercise())
+
+
+def test_cached_sftp_session_is_replaced_after_reconnect() -> None:
+    from limsync.review_actions import _sftp_session_usable
+
+    class _Channel:
+        def __init__(self, transport, closed=False) -> None:
+            self.transport = transport
+            self.closed = closed
+
+        def get_transport(self):
+            return self.transport
+
+    class _Sftp:
+        def __init__(self, channel) -> None:
+            self.channel = channel
+
+        def get_channel(self):
+            return self.channel
+
+    class _Client:
+        def __init__(self, transport) -> None:
+            self.transport = transport
+
+        def get_transport(self):
+            return self.transport
+
+    transport = object()
+    assert _sftp_session_usable(_Sftp(_Channel(transport)), _Client(transport))
+    assert not _sftp_session_usable(
+        _Sftp(_Channel(transport, closed=True)), _Client(transport)
+    )
+    assert not _sftp_session_usable(_Sftp(_Channel(transport)), _Client(object()))
+
+
+def test_rebuild_keeps_folders_expanded_through_tree_events(tmp_path: Path) -> None:
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            relpath,
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+        for relpath in ("a/b/c.txt", "d/e.txt")
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+
+    async def exercise() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            app._nodes_by_data[("dir", "a")].expand()
+            app._nodes_by_data[("dir", "d")].expand()
+            await pilot.pause()
+            app._nodes_by_data[("dir", "d")].collapse()
+            await pilot.pause()
+
+            app._rebuild_tree()
+            await pilot.pause()
+            assert app._nodes_by_data[("dir", "a")].is_expanded
+            assert not app._nodes_by_data[("dir", "d")].is_expanded
+            assert app._expanded_dir_relpaths == {".", "a"}
+
+    asyncio.run(exercise())
+
+
+def test_rebuild_populates_only_remembered_folders_once(tmp_path: Path) -> None:
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            relpath,
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+        for relpath in ("a/b/c.txt", "d/e.txt")
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+
+    async def exercise() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            app._nodes_by_data[("dir", "a")].expand()
+            await pilot.pause()
+            app._nodes_by_data[("dir", "a/b")].expand()
+            await pilot.pause()
+
+            populated: list[str] = []
+            real_populate = app._populate_node
+
+            def counting_populate(node, entry) -> None:
+                populated.append(entry.relpath)
+                real_populate(node, entry)
+
+            app._populate_node = counting_populate
+            app._rebuild_tree()
+            await pilot.pause()
+            assert populated == [".", "a", "a/b"]
+            assert app._nodes_by_data[("dir", "a/b")].is_expanded
+
+            # A remembered folder under a collapsed parent stays unbuilt.
+            app._expanded_dir_relpaths.discard("a")
+            populated.clear()
+            app._rebuild_tree()
+            await pilot.pause()
+            assert populated == ["."]
+            assert app._expanded_dir_relpaths == {"."}
+
+    asyncio.run(exercise())
+
+
+def test_mark_completed_paths_matches_counts_of_a_fresh_load(tmp_path: Path) -> None:
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            "a/b/one.txt",
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+            left_size=1,
+        ),
+        mk_diff(
+            "a/b/two.txt",
+            content_state=ContentState.IDENTICAL,
+            metadata_state=MetadataState.DIFFERENT,
+            metadata_diff=("mode",),
+            left_size=2,
+            right_size=2,
+        ),
+        mk_diff(
+            "a/three.txt",
+            content_state=ContentState.IDENTICAL,
+            metadata_state=MetadataState.DIFFERENT,
+            metadata_diff=("mode", "mtime"),
+            left_size=3,
+            right_size=3,
+        ),
+        mk_diff(
+            "a/four.txt",
+            content_state=ContentState.DIFFERENT,
+            metadata_state=MetadataState.IDENTICAL,
+            left_size=4,
+            right_size=5,
+        ),
+    ]
+    save_current_state(db_path, _summary(), diffs)
+
+    def open_app() -> ReviewApp:
+        return ReviewApp(
+            db_path,
+            EndpointSpec("local", "/left"),
+            EndpointSpec("local", "/right"),
+            hide_identical=True,
+        )
+
+    app = open_app()
+    app._rebuild_tree = lambda: None
+    app._current_selection = lambda: None
+    app._set_info_for_dir = lambda _entry: None
+    app._mark_completed_paths({"a/b/one.txt", "a/b/two.txt", "a/three.txt"})
+
+    fresh = open_app()
+    for relpath in (".", "a", "a/b"):
+        assert app.dirs_by_relpath[relpath].counts == (
+            fresh.dirs_by_relpath[relpath].counts
+        )
+    assert app.dirs_by_relpath["a"].counts.metadata_fields == {}
+
+
+def test_ops_direction_marker_covers_each_direction() -> None:
+    from limsync.review_tui import _ops_direction_marker
+
+    assert _ops_direction_marker(()) == ""
+    assert _ops_direction_marker(("copy_left",)) == " <- "
+    assert _ops_direction_marker(("metadata_update_right",)) == " -> "
+    assert _ops_direction_marker(("copy_left", "copy_right")) == " <-> "
+    assert _ops_direction_marker(("copy_right", "delete_left")) == " <=DEL "
+    assert _ops_direction_marker(("delete_right",)) == " DEL=> "
+    assert _ops_direction_marker(("delete_left", "delete_right")) == " <=DEL=> "
+
+
+def test_update_selected_path_scans_in_a_worker(tmp_path: Path, monkeypatch) -> None:
+    import threading
+
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            "docs/a.txt",
+            content_state=ContentState.ONLY_LEFT,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+    scan_threads: list[int] = []
+
+    def fake_scan(endpoint, subtree):
+        scan_threads.append(threading.get_ident())
+        return {}
+
+    monkeypatch.setattr(app, "_scan_endpoint_records", fake_scan)
+    monkeypatch.setattr(app, "_selected_node", lambda: ("dir", "docs"))
+
+    async def exercise() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            app.action_update_selected_path()
+            assert "docs/a.txt" in app.diffs_by_relpath
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert "docs/a.txt" not in app.diffs_by_relpath
+            assert len(scan_threads) == 2
+            assert threading.get_ident() not in scan_threads
+
+    asyncio.run(exercise())
+
+
+def test_apply_action_updates_plan_counts_without_rebuilding_plan(
+    tmp_path: Path, monkeypatch
+) -> None:
+    from limsync.planner_apply import ACTION_LEFT_WINS, summarize_operations
+
+    db_path = tmp_path / "review.sqlite3"
+    diffs = [
+        mk_diff(
+            relpath,
+            content_state=content_state,
+            metadata_state=MetadataState.NOT_APPLICABLE,
+        )
+        for relpath, content_state in (
+            ("a.txt", ContentState.ONLY_LEFT),
+            ("b.txt", ContentState.ONLY_RIGHT),
+            ("c.txt", ContentState.DIFFERENT),
+        )
+    ]
+    save_current_state(db_path, _summary(), diffs)
+    app = ReviewApp(
+        db_path,
+        EndpointSpec("local", "/left"),
+        EndpointSpec("local", "/right"),
+        hide_identical=True,
+    )
+
+    async def exercise() -> None:
+        async with app.run_test() as pilot:
+            await pilot.pause()
+            app._update_plan_panel()
+            builds: list[int] = []
+            real_plan_operations = app._plan_operations
+
+            def counting_plan_operations():
+                builds.append(1)
+                return real_plan_operations()
+
+            monkeypatch.setattr(app, "_plan_operations", counting_plan_operations)
+            monkeypatch.setattr(
+                app, "_selected_target_files", lambda: ["b.txt", "c.txt"]
+            )
+            app._apply_action(ACTION_LEFT_WINS)
+
+            assert builds == []
+            expected = summarize_operations(
+                build_plan_operations(app.diffs, app.action_overrides)
+            )
+            assert app._plan_summary() == expected
+            assert expected.delete_right == 1
+            assert expected.copy_right == 1
+
+    asyncio.run(exercise())
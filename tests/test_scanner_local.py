@@ -26,3 +26,21 @@ def test_scan_subtree_missing_path_returns_empty(tmp_path):
     records = LocalScanner(root).scan(subtree=PurePosixPath("missing/path"))
 
     assert records == {}
+
+
+def test_scan_reports_symlinks_but_skips_symlinked_dirs(tmp_path):
+    root = tmp_path / "root"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "a" / "b" / "deep.txt").write_text("d", encoding="utf-8")
+    (root / "top.txt").write_text("t", encoding="utf-8")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "x.js").write_text("x", encoding="utf-8")
+    (root / "linked_dir").symlink_to(root / "a")
+    (root / "linked_file").symlink_to("top.txt")
+
+    records = LocalScanner(root).scan()
+
+    assert sorted(records) == ["a/b/deep.txt", "linked_file", "top.txt"]
+    assert records["linked_file"].node_type.value == "symlink"
+    assert records["linked_file"].link_target == "top.txt"
+    assert records["top.txt"].size == 1
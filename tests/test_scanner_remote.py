@@ -1,10 +1,271 @@
+import json
+
 from limsync.config import RemoteConfig
+from limsync.remote_helper import ScanRecords
 from limsync.scanner_remote import RemoteScanner
 
 
+def _scan_records(*rows: tuple[str, str, int, int, int]) -> ScanRecords:
+    records = ScanRecords()
+    for row in rows:
+        records.append(*row)
+    return records
+
+
 def test_remote_helper_source_injects_shared_ignore_rules() -> None:
     scanner = RemoteScanner(RemoteConfig(host="h", user="u", root="~/r"))
     source = scanner._remote_helper_source()
     assert "# [[IGNORE_RULES_SHARED]]" not in source
     assert "class IgnoreRules" in source
     compile(source, "<stdin>", "exec")
+
+
+def test_remote_helper_walk_keeps_order_and_nested_ignores(
+    tmp_path, monkeypatch, capsys
+) -> None:
+    from limsync import remote_helper
+
+    root = tmp_path / "root"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "c").mkdir()
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "x.js").write_text("x", encoding="utf-8")
+    (root / "top.txt").write_text("t", encoding="utf-8")
+    (root / "a" / "one.txt").write_text("1", encoding="utf-8")
+    (root / "a" / ".dropboxignore").write_text("*.log\n", encoding="utf-8")
+    (root / "a" / "skip.log").write_text("s", encoding="utf-8")
+    (root / "a" / "b" / "deep.log").write_text("d", encoding="utf-8")
+    (root / "a" / "b" / "two.txt").write_text("2", encoding="utf-8")
+    (root / "c" / "three.txt").write_text("3", encoding="utf-8")
+    monkeypatch.setattr(remote_helper, "WALK_WORKERS", 4)
+
+    assert remote_helper.run_scan(str(root), str(tmp_path / "state.db"), 60.0) == 0
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    relpaths = [e["relpath"] for e in events if e["event"] == "record"]
+    assert sorted(relpaths) == [
+        "a/.dropboxignore",
+        "a/b/two.txt",
+        "a/one.txt",
+        "c/three.txt",
+        "top.txt",
+    ]
+    # Depth-first: a directory's files come out before any of its subdirectories'.
+    assert relpaths.index("a/one.txt") < relpaths.index("a/b/two.txt")
+    assert events[-1]["event"] == "done"
+    assert events[-1]["dirs_scanned"] == 4
+    assert events[-1]["files_seen"] == 5
+
+
+def test_remote_helper_walk_bounds_directory_prefetch(
+    tmp_path, monkeypatch, capsys
+) -> None:
+    from limsync import remote_helper
+
+    root = tmp_path / "root"
+    for idx in range(20):
+        (root / f"d{idx:02d}").mkdir(parents=True)
+        (root / f"d{idx:02d}" / "f.txt").write_text("x", encoding="utf-8")
+    submitted: list[str] = []
+    consumed: list[str] = []
+
+    class TrackedListing:
+        def __init__(self, future, path) -> None:
+            self.future = future
+            self.path = path
+
+        def result(self):
+            consumed.append(self.path)
+            return self.future.result()
+
+    class TrackingExecutor(remote_helper.ThreadPoolExecutor):
+        def submit(self, fn, path):
+            submitted.append(path)
+            # Listings read but not yet walked never exceed the look-ahead.
+            assert len(submitted) - len(consumed) <= 3
+            return TrackedListing(super().submit(fn, path), path)
+
+    monkeypatch.setattr(remote_helper, "WALK_PREFETCH", 3)
+    monkeypatch.setattr(remote_helper, "ThreadPoolExecutor", TrackingExecutor)
+
+    assert remote_helper.run_scan(str(root), str(tmp_path / "state.db"), 60.0) == 0
+
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert events[-1]["dirs_scanned"] == 21
+    assert events[-1]["files_seen"] == 20
+    assert len(submitted) == 21
+
+
+def test_remote_helper_emit_batches_records_until_control_event(capsys) -> None:
+    from limsync import remote_helper
+
+    remote_helper.emit({"event": "record", "relpath": "a"})
+    remote_helper.emit({"event": "record", "relpath": "b"})
+    assert capsys.readouterr().out == ""
+
+    remote_helper.emit({"event": "progress", "relpath": "."})
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["event"] for line in lines] == [
+        "record",
+        "record",
+        "progress",
+    ]
+
+
+def test_remote_helper_state_db_only_rewrites_changed_rows(
+    tmp_path, monkeypatch
+) -> None:
+    import sqlite3
+
+    from limsync import remote_helper
+
+    db = tmp_path / "state.db"
+    clock = iter([100, 200])
+    monkeypatch.setattr(remote_helper.time, "time", lambda: next(clock))
+    remote_helper.update_state_db(
+        str(db),
+        str(tmp_path),
+        _scan_records(
+            ("a.txt", "file", 1, 10, 0o644), ("b.txt", "file", 2, 20, 0o644)
+        ),
+        1,
+        2,
+    )
+    remote_helper.update_state_db(
+        str(db), str(tmp_path), _scan_records(("a.txt", "file", 1, 10, 0o644)), 1, 1
+    )
+
+    conn = sqlite3.connect(db)
+    try:
+        rows = conn.execute("SELECT relpath, updated_at FROM records").fetchall()
+    finally:
+        conn.close()
+    assert rows == [("a.txt", 100)]
+
+
+def test_remote_helper_state_db_inserts_in_multirow_chunks(
+    tmp_path, monkeypatch
+) -> None:
+    import sqlite3
+
+    from limsync import remote_helper
+
+    monkeypatch.setattr(remote_helper, "SQLITE_MAX_VARIABLES", 14)
+    rows = [(f"f{idx}.txt", "file", idx, idx, 0o644) for idx in range(5)]
+    db = tmp_path / "state.db"
+    remote_helper.update_state_db(
+        str(db), str(tmp_path), _scan_records(*rows), 1, len(rows)
+    )
+
+    conn = sqlite3.connect(db)
+    try:
+        stored = conn.execute(
+            "SELECT relpath, node_type, size, mtime_ns, mode FROM records"
+            " ORDER BY relpath"
+        ).fetchall()
+    finally:
+        conn.close()
+    assert stored == rows
+
+
+def test_remote_helper_state_db_skips_rewrite_for_same_fingerprint(
+    tmp_path, monkeypatch
+) -> None:
+    import sqlite3
+
+    from limsync import remote_helper
+
+    db = tmp_path / "state.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE scan_meta (root TEXT PRIMARY KEY, scanned_at INTEGER NOT NULL,"
+        " dirs_scanned INTEGER NOT NULL, files_seen INTEGER NOT NULL)"
+    )
+    conn.commit()
+    conn.close()
+
+    records = _scan_records(("a.txt", "file", 1, 10, 0o644))
+    clock = iter([100, 200])
+    monkeypatch.setattr(remote_helper.time, "time", lambda: next(clock))
+    remote_helper.update_state_db(str(db), str(tmp_path), records, 1, 1)
+
+    conn = sqlite3.connect(db)
+    conn.execute("DELETE FROM records")
+    conn.commit()
+    conn.close()
+    remote_helper.update_state_db(str(db), str(tmp_path), records, 1, 1)
+
+    conn = sqlite3.connect(db)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM records").fetchone() == (0,)
+        assert conn.execute("SELECT scanned_at FROM scan_meta").fetchone() == (200,)
+    finally:
+        conn.close()
+
+
+def test_remote_helper_fingerprint_ignores_walk_order() -> None:
+    from limsync import remote_helper
+
+    rows = [("b/x", "file", 2, 20, 0o644), ("a", "symlink", 1, 10, 0o777)]
+
+    assert remote_helper._records_fingerprint(
+        _scan_records(*rows)
+    ) == remote_helper._records_fingerprint(_scan_records(*reversed(rows)))
+
+
+def test_remote_helper_reuses_state_db_connection(tmp_path, monkeypatch) -> None:
+    from limsync import remote_helper
+
+    opened: list[str] = []
+    real_connect = remote_helper.sqlite3.connect
+
+    def counting_connect(path, *args, **kwargs):
+        opened.append(path)
+        return real_connect(path, *args, **kwargs)
+
+    monkeypatch.setattr(remote_helper.sqlite3, "connect", counting_connect)
+    monkeypatch.setattr(remote_helper, "_STATE_DB_CONNECTIONS", {})
+    db = str(tmp_path / "state.db")
+    for relpath in ("a", "b"):
+        records = _scan_records((relpath, "file", 1, 1, 0))
+        remote_helper.update_state_db(db, str(tmp_path), records, 1, 1)
+
+    assert opened == [db]
+    remote_helper._close_state_db_connections()
+    assert remote_helper._STATE_DB_CONNECTIONS == {}
+
+
+def test_remote_helper_scan_records_iterate_as_rows() -> None:
+    from limsync import remote_helper
+
+    records = remote_helper.ScanRecords()
+    records.append("a.txt", "file", 3, 1_700_000_000_000_000_000, 0o644)
+    records.append("link", "symlink", 4, 5, 0o777)
+
+    assert len(records) == 2
+    assert list(records) == [
+        ("a.txt", "file", 3, 1_700_000_000_000_000_000, 0o644),
+        ("link", "symlink", 4, 5, 0o777),
+    ]
+
+
+def test_remote_helper_emit_record_matches_generic_encoding(capsys) -> None:
+    from limsync import remote_helper
+
+    fields = ('dir/café "q".txt', "symlink", 7, 123, 0o777, "../t", None)
+    remote_helper.emit_record(*fields)
+    remote_helper.flush_emit()
+    relpath, ntype, size, mtime_ns, mode, link_target, link_target_key = fields
+    expected = {
+        "event": "record",
+        "relpath": relpath,
+        "node_type": ntype,
+        "size": size,
+        "mtime_ns": mtime_ns,
+        "mode": mode,
+        "link_target": link_target,
+        "link_target_key": link_target_key,
+        "owner": None,
+        "group": None,
+    }
+    assert capsys.readouterr().out == json.dumps(expected, ensure_ascii=True) + "\n"
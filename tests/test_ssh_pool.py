@@ -1,7 +1,12 @@
 from subprocess import CompletedProcess
 from unittest.mock import patch
 
-from limsync.ssh_pool import resolve_ssh_connection_options
+from limsync.ssh_pool import (
+    SFTP_MAX_PACKET_SIZE,
+    SFTP_WINDOW_SIZE,
+    open_sftp,
+    resolve_ssh_connection_options,
+)
 
 
 def test_resolve_ssh_connection_options_uses_openssh_effective_config(
@@ -28,3 +33,80 @@ def test_resolve_ssh_connection_options_uses_openssh_effective_config(
     assert options.username == "remote-user"
     assert options.port == 2200
     assert options.key_filenames == (str(identity),)
+
+
+def test_open_sftp_uses_enlarged_channel_window() -> None:
+    transport = object()
+
+    class Client:
+        def get_transport(self):
+            return transport
+
+    with patch(
+        "limsync.ssh_pool.paramiko.SFTPClient.from_transport",
+        return_value="sftp",
+    ) as from_transport:
+        assert open_sftp(Client()) == "sftp"
+
+    from_transport.assert_called_once_with(
+        transport,
+        window_size=SFTP_WINDOW_SIZE,
+        max_packet_size=SFTP_MAX_PACKET_SIZE,
+    )
+
+
+def test_pooled_ssh_client_resolves_options_once_per_host() -> None:
+    from limsync import ssh_pool
+
+    class Client:
+        def load_system_host_keys(self) -> None:
+            return None
+
+        def set_missing_host_key_policy(self, _policy) -> None:
+            return None
+
+        def connect(self, **_kwargs) -> None:
+            return None
+
+        def close(self) -> None:
+            return None
+
+    ssh_pool.close_ssh_pool()
+    with patch(
+        "limsync.ssh_pool.subprocess.run",
+        return_value=CompletedProcess(["ssh", "-G", "lime"], 0, "", ""),
+    ) as run:
+        for _ in range(3):
+            with ssh_pool.pooled_ssh_client(
+                host="lime",
+                user="u",
+                port=None,
+                compress=False,
+                client_factory=Client,
+                auto_add_policy_factory=object,
+            ):
+                pass
+    ssh_pool.close_ssh_pool()
+
+    assert run.call_count == 1
+
+
+def test_cached_connection_options_retries_failed_resolution() -> None:
+    from limsync import ssh_pool
+
+    ssh_pool.close_ssh_pool()
+    with patch(
+        "limsync.ssh_pool.subprocess.run",
+        side_effect=[
+            CompletedProcess(["ssh", "-G", "lime"], 255, "", "boom"),
+            CompletedProcess(["ssh", "-G", "lime"], 0, "hostname lime.local", ""),
+        ],
+    ) as run:
+        failed = ssh_pool._cached_connection_options("lime", None, None)
+        resolved = ssh_pool._cached_connection_options("lime", None, None)
+        cached = ssh_pool._cached_connection_options("lime", None, None)
+    ssh_pool.close_ssh_pool()
+
+    assert failed.hostname == "lime"
+    assert resolved.hostname == cached.hostname == "lime.local"
+    assert run.call_count == 2
@@ -127,6 +127,7 @@ def test_load_current_diffs_does_not_reinitialize_on_version_mismatch(tmp_path)
     assert len(rows) == 1
     assert rows[0]["relpath"] == "x.txt"
     assert rows[0]["left_size"] == 3
+    assert rows[0]["left_mode"] is None
 
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
@@ -138,3 +139,24 @@ def test_load_current_diffs_does_not_reinitialize_on_version_mismatch(tmp_path)
         assert str(version["value"]) == "0.0.0-test"
     finally:
         conn.close()
+
+
+def test_schema_is_set_up_once_per_db_file(tmp_path, monkeypatch) -> None:
+    from limsync import state_db
+
+    db_path = tmp_path / "state.sqlite3"
+    save_current_state(db_path, _summary(), _diffs())
+    migrations: list[str | None] = []
+    monkeypatch.setattr(
+        state_db,
+        "_migrate_db",
+        lambda _conn, current, _target: migrations.append(current),
+    )
+
+    state_db.upsert_action_overrides(db_path, {"a.txt": "suggested"})
+    assert state_db.load_action_overrides(db_path) == {"a.txt": "suggested"}
+    assert migrations == []
+
+    db_path.unlink()
+    assert load_current_diffs(db_path) == []
+    assert migrations == [None]
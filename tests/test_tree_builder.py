@@ -3,6 +3,8 @@ from limsync.tree_builder import (
     DirEntry,
     FileEntry,
     FolderCounts,
+    _ancestor_dir_keys,
+    _build_model,
     _file_label,
     _folder_action_counts_by_relpath,
     _folder_counts_by_relpath,
@@ -181,3 +183,25 @@ def test_file_label_prioritizes_size_for_content_conflicts() -> None:
     )
 
     assert _file_label(entry).plain == "a.txt  [Conflict] size"
+
+
+def test_ancestor_dir_keys_lists_every_containing_folder() -> None:
+    assert _ancestor_dir_keys("top.txt") == ["."]
+    assert _ancestor_dir_keys("a/b/c.txt") == [".", "a", "a/b"]
+
+
+def test_build_model_stores_children_in_display_order() -> None:
+    rows = [
+        {
+            "relpath": relpath,
+            "content_state": "only_left",
+            "metadata_state": "identical",
+        }
+        for relpath in ("z/b.txt", "b.txt", "a/x.txt", "a.txt", "z/a.txt")
+    ]
+
+    root, dirs_by_relpath, *_ = _build_model(rows, "root")
+
+    assert list(root.dirs) == ["a", "z"]
+    assert [entry.name for entry in root.files] == ["a.txt", "b.txt"]
+    assert [entry.name for entry in dirs_by_relpath["z"].files] == ["a.txt", "b.txt"]